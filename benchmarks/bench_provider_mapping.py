@@ -0,0 +1,157 @@
+"""
+Benchmark: vectorized to_canonical_events vs the previous row-wise implementation.
+
+Usage:
+  python -m benchmarks.bench_provider_mapping --rows 500000 --repeat 3
+
+The legacy implementation below is a verbatim copy of the row-wise parse_ts /
+norm_out / per-column to_numeric path, kept only as the reference for timing
+and for an output-equality check.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from engine.provider.sportsbase import _pick, to_canonical_events
+
+
+def legacy_to_canonical_events(df: pd.DataFrame) -> pd.DataFrame:
+    mapping_used: Dict[str, str] = {}
+    cols = {
+        "match_id": ["match_id","MatchId","match","matchId"],
+        "team_id": ["team_id","TeamId","team","teamId","team_name","Team"],
+        "player_id": ["player_id","PlayerId","player","playerId","player_name","Player"],
+        "event_type": ["event_type","type","EventType","action","Action","event","tag"],
+        "timestamp_s": ["timestamp_s","timestamp","time_s","sec","seconds","start_s","StartSecond","start"],
+        "period": ["period","half","Period","Half"],
+        "x": ["x","pos_x","PosX","start_x","StartX","X","location_x"],
+        "y": ["y","pos_y","PosY","start_y","StartY","Y","location_y"],
+        "x_end": ["x_end","end_x","EndX","to_x","dest_x","location_x_end"],
+        "y_end": ["y_end","end_y","EndY","to_y","dest_y","location_y_end"],
+        "outcome": ["outcome","result","Outcome","success","is_success","successful"],
+    }
+    for tgt, cands in cols.items():
+        src = _pick(df, cands)
+        if src is not None:
+            mapping_used[tgt] = src
+
+    out_df = pd.DataFrame()
+    for tgt, src in mapping_used.items():
+        out_df[tgt] = df[src]
+    for c in cols:
+        if c not in out_df.columns:
+            out_df[c] = np.nan
+
+    def parse_ts(v):
+        if pd.isna(v):
+            return np.nan
+        if isinstance(v, (int,float,np.integer,np.floating)):
+            return float(v)
+        s = str(v).strip()
+        if s.isdigit():
+            return float(s)
+        parts = s.split(":")
+        try:
+            if len(parts)==2:
+                m, sec = int(parts[0]), float(parts[1])
+                return 60*m + sec
+            if len(parts)==3:
+                h, m, sec = int(parts[0]), int(parts[1]), float(parts[2])
+                return 3600*h + 60*m + sec
+        except:
+            return np.nan
+        return np.nan
+
+    out_df["timestamp_s"] = out_df["timestamp_s"].apply(parse_ts)
+
+    x_max = pd.to_numeric(out_df["x"], errors="coerce").dropna().max()
+    y_max = pd.to_numeric(out_df["y"], errors="coerce").dropna().max()
+    if pd.notna(x_max) and pd.notna(y_max) and x_max <= 100.5 and y_max <= 100.5:
+        out_df["x"] = pd.to_numeric(out_df["x"], errors="coerce") * 105.0 / 100.0
+        out_df["y"] = pd.to_numeric(out_df["y"], errors="coerce") * 68.0 / 100.0
+        if out_df["x_end"].notna().any():
+            out_df["x_end"] = pd.to_numeric(out_df["x_end"], errors="coerce") * 105.0 / 100.0
+        if out_df["y_end"].notna().any():
+            out_df["y_end"] = pd.to_numeric(out_df["y_end"], errors="coerce") * 68.0 / 100.0
+
+    def norm_out(v):
+        if pd.isna(v):
+            return np.nan
+        if isinstance(v, (int,float,np.integer,np.floating)):
+            if v in (0,1):
+                return bool(int(v))
+            return np.nan
+        s = str(v).strip().lower()
+        if s in ("success","successful","true","1","yes","y","won"):
+            return True
+        if s in ("fail","failed","false","0","no","n","lost"):
+            return False
+        return np.nan
+
+    out_df["outcome"] = out_df["outcome"].apply(norm_out)
+    out_df["event_type"] = out_df["event_type"].astype(str).str.strip().str.lower()
+    return out_df
+
+
+def synthetic_export(rows: int, seed: int = 7) -> pd.DataFrame:
+    """SportsBase-like export: mm:ss clock strings, 0-100 coords, mixed outcome labels."""
+    rng = np.random.default_rng(seed)
+    secs = np.sort(rng.integers(0, 95 * 60, rows))
+    clock = pd.Series([f"{m:02d}:{s:02d}" for m in range(96) for s in range(60)], dtype=object)
+    return pd.DataFrame({
+        "MatchId": rng.integers(1, 11, rows),
+        "TeamId": rng.choice([101, 202], rows),
+        "PlayerId": rng.integers(1, 30, rows),
+        "Action": rng.choice(["Pass", "Tackle", "Interception", "Shot", "Pressure", "Carry"], rows),
+        "timestamp": clock.to_numpy()[secs],
+        "PosX": np.round(rng.random(rows) * 100, 1),
+        "PosY": np.round(rng.random(rows) * 100, 1),
+        "EndX": np.round(rng.random(rows) * 100, 1),
+        "EndY": np.round(rng.random(rows) * 100, 1),
+        "Outcome": rng.choice(np.array(["success", "fail", "Won", "lost", 1, 0, None], dtype=object), rows),
+    })
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark provider mapping (vectorized vs row-wise)")
+    ap.add_argument("--rows", type=int, default=500_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    df = synthetic_export(args.rows)
+
+    pd.testing.assert_frame_equal(
+        legacy_to_canonical_events(df.copy()),
+        to_canonical_events(df.copy()).canonical_df,
+    )
+
+    t_legacy = _best_of(lambda: legacy_to_canonical_events(df), args.repeat)
+    t_vec = _best_of(lambda: to_canonical_events(df), args.repeat)
+
+    print(json.dumps({
+        "rows": args.rows,
+        "legacy_s": round(t_legacy, 4),
+        "vectorized_s": round(t_vec, 4),
+        "speedup": round(t_legacy / t_vec, 2) if t_vec > 0 else None,
+        "outputs_equal": True,
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,462 @@
+from __future__ import annotations
+
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from .event_store import EventStore
+from .master_orchestrator import EngineResult, MasterOrchestrator
+from .result_cache import ResultCache
+from .provider.sportsbase import MATCH_ID_COLUMNS, _pick
+
+
+@dataclass
+class MatchFailure:
+    match_key: str
+    sources: List[str]
+    error: str
+    traceback: str
+
+
+@dataclass
+class BatchResult:
+    results: Dict[str, EngineResult] = field(default_factory=dict)
+    failures: Dict[str, MatchFailure] = field(default_factory=dict)
+    report: Dict[str, Any] = field(default_factory=dict)
+
+
+# -------------------------
+# Input discovery + split
+# -------------------------
+
+def iter_match_files(inputs: Iterable[str | Path]) -> Iterator[Path]:
+    """Yield CSV files from a mix of files and directories (directories are searched recursively)."""
+    for inp in inputs:
+        p = Path(inp)
+        if p.is_dir():
+            yield from sorted(q for q in p.rglob("*.csv") if q.is_file())
+        elif p.is_file():
+            yield p
+        else:
+            raise FileNotFoundError(f"Batch input not found: {p}")
+
+
+def split_matches(
+    files: Iterable[Path],
+    only: Optional[Iterable[str]] = None,
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, List[str]], Dict[str, MatchFailure]]:
+    """
+    Read raw provider files and split them by match_id.
+
+    - Files without a match id column count as one match keyed by the file stem.
+    - Rows of the same match_id spread over several files are concatenated.
+    - A file that cannot be read becomes a failure of its own; other files continue.
+    - only: keep just these match keys (a worker's share of a multi-match file).
+    """
+    keep = set(only) if only is not None else None
+    parts: Dict[str, List[pd.DataFrame]] = {}
+    sources: Dict[str, List[str]] = {}
+    failures: Dict[str, MatchFailure] = {}
+
+    for fp in files:
+        try:
+            df = pd.read_csv(fp)
+        except Exception as e:
+            key = fp.stem
+            failures[key] = MatchFailure(key, [fp.as_posix()], f"READ_ERROR: {e}", traceback.format_exc())
+            continue
+
+        col = _pick(df, MATCH_ID_COLUMNS)
+        if col is None:
+            groups: List[Tuple[str, pd.DataFrame]] = [(fp.stem, df)]
+        else:
+            groups = [(str(mid), g) for mid, g in df.groupby(col, sort=False, dropna=False)]
+
+        for key, g in groups:
+            if keep is not None and key not in keep:
+                continue
+            parts.setdefault(key, []).append(g)
+            sources.setdefault(key, []).append(fp.as_posix())
+
+    matches = {
+        k: (v[0] if len(v) == 1 else pd.concat(v, ignore_index=True)).reset_index(drop=True)
+        for k, v in parts.items()
+    }
+    return matches, sources, failures
+
+
+def scan_match_keys(fp: Path) -> List[str]:
+    """
+    Match keys of one file (same keys as split_matches), reading only the match id column.
+    Files without a match id column are one match keyed by the file stem.
+    """
+    col = _pick(pd.read_csv(fp, nrows=0), MATCH_ID_COLUMNS)
+    if col is None:
+        return [fp.stem]
+    return [str(mid) for mid in pd.unique(pd.read_csv(fp, usecols=[col])[col])]
+
+
+def _scan_task(fp: Path) -> Tuple[Path, Optional[List[str]], Optional[Tuple[str, str]]]:
+    try:
+        return fp, scan_match_keys(fp), None
+    except Exception as e:
+        return fp, None, (f"READ_ERROR: {e}", traceback.format_exc())
+
+
+def plan_file_groups(
+    files: List[Path],
+    workers: int = 1,
+) -> Tuple[List[Tuple[List[Path], List[str]]], Dict[str, List[str]], Dict[str, MatchFailure]]:
+    """
+    Group files so that every match's files stay together: files sharing a match id are
+    one group (connected components). Returns ([(files, match keys)], sources, failures),
+    keys in split_matches order. The id scan runs on the pool when there are several files.
+    """
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            scanned = list(pool.map(_scan_task, files))
+    else:
+        scanned = [_scan_task(fp) for fp in files]
+
+    failures: Dict[str, MatchFailure] = {}
+    sources: Dict[str, List[str]] = {}
+    group_of: Dict[str, int] = {}
+    groups: Dict[int, Tuple[List[Path], List[str]]] = {}
+    for gid, (fp, keys, err) in enumerate(scanned):
+        if err is not None:
+            failures[fp.stem] = MatchFailure(fp.stem, [fp.as_posix()], err[0], err[1])
+            continue
+        merged: Tuple[List[Path], List[str]] = ([], [])
+        for old in sorted({group_of[k] for k in keys if k in group_of}):
+            g_files, g_keys = groups.pop(old)
+            merged[0].extend(g_files)
+            merged[1].extend(g_keys)
+        merged[0].append(fp)
+        for k in keys:
+            sources.setdefault(k, []).append(fp.as_posix())
+            if k not in merged[1]:
+                merged[1].append(k)
+        for k in merged[1]:
+            group_of[k] = gid
+        groups[gid] = merged
+
+    # Keep input file order inside each group (split_matches concatenates in that order)
+    # and list keys by first appearance over those files, as split_matches yields them.
+    order = {fp: i for i, fp in enumerate(files)}
+    file_keys = {fp: keys for fp, keys, _ in scanned}
+    out = []
+    for g in sorted(groups):
+        g_files = sorted(groups[g][0], key=order.__getitem__)
+        out.append((g_files, list(dict.fromkeys(k for fp in g_files for k in file_keys[fp]))))
+    return out, sources, failures
+
+
+def split_tasks(keys: List[str], parts: int) -> List[List[str]]:
+    """Match keys in at most `parts` contiguous, near-equal subsets (one worker task each)."""
+    if not keys:
+        return []
+    parts = max(1, min(parts, len(keys)))
+    step, extra = divmod(len(keys), parts)
+    out, i = [], 0
+    for p in range(parts):
+        n = step + (1 if p < extra else 0)
+        out.append(keys[i : i + n])
+        i += n
+    return out
+
+
+# -------------------------
+# Worker side
+# -------------------------
+
+_WORKER_ORCH: Optional[MasterOrchestrator] = None
+
+
+def _init_worker(
+    registry_root: str,
+    provider: str,
+    phase: str,
+    fused: bool,
+    cache_dir: Optional[str],
+    store_dir: Optional[str] = None,
+) -> None:
+    # One orchestrator (and one registry load) per worker process.
+    global _WORKER_ORCH
+    cache = ResultCache(cache_dir) if cache_dir else None
+    store = EventStore(store_dir) if store_dir else None
+    _WORKER_ORCH = MasterOrchestrator(
+        registry_root=registry_root, provider=provider, fused=fused, cache=cache, event_store=store
+    )
+    _WORKER_ORCH.pin_registry(phase)
+
+
+def _run_match(
+    match_key: str,
+    df: pd.DataFrame,
+    phase: str,
+    context: Dict[str, Any],
+) -> Tuple[str, Optional[EngineResult], Optional[Tuple[str, str]], float]:
+    t0 = time.perf_counter()
+    try:
+        assert _WORKER_ORCH is not None, "worker not initialised"
+        res = _WORKER_ORCH.run(df, phase=phase, context={**context, "match_id": match_key})
+        return match_key, res, None, time.perf_counter() - t0
+    except Exception as e:
+        return match_key, None, (f"{type(e).__name__}: {e}", traceback.format_exc()), time.perf_counter() - t0
+
+
+def _run_files(
+    task_key: str,
+    payload: Tuple[List[str], List[str], bool],
+    phase: str,
+    context: Dict[str, Any],
+) -> List[Tuple[str, Optional[EngineResult], Optional[Tuple[str, str]], float]]:
+    # Workers read their files and keep only their own matches (only paths and keys
+    # cross the process boundary). Read errors are reported by one task per file group.
+    paths, keys, report_read_errors = payload
+    t0 = time.perf_counter()
+    matches, _, failures = split_matches((Path(p) for p in paths), only=keys)
+    read_s = (time.perf_counter() - t0) / max(1, len(matches))
+    out = [(key, None, (f.error, f.traceback), 0.0) for key, f in failures.items() if report_read_errors]
+    for key in keys:
+        if key not in matches:
+            out.append((key, None, (f"MISSING: match {key} not found when re-reading {paths}", ""), 0.0))
+    for key, df in matches.items():
+        k, res, err, elapsed = _run_match(key, df, phase, context)
+        out.append((k, res, err, elapsed + read_s))
+    return out
+
+
+def _run_stored(
+    match_key: str,
+    ref: Tuple[str, str, str],
+    phase: str,
+    context: Dict[str, Any],
+) -> Tuple[str, Optional[EngineResult], Optional[Tuple[str, str]], float]:
+    # Workers read their own partition (no DataFrame pickling between processes).
+    t0 = time.perf_counter()
+    try:
+        assert _WORKER_ORCH is not None, "worker not initialised"
+        season, competition, match_id = ref
+        res = _WORKER_ORCH.run_stored(match_id, season, competition, phase=phase, context={**context, "match_id": match_id})
+        return match_key, res, None, time.perf_counter() - t0
+    except Exception as e:
+        return match_key, None, (f"{type(e).__name__}: {e}", traceback.format_exc()), time.perf_counter() - t0
+
+
+# -------------------------
+# Public API
+# -------------------------
+
+def run_batch(
+    inputs: Iterable[str | Path],
+    phase: str = "tactical",
+    registry_root: str | Path = "canon/registry",
+    provider: str = "sportsbase",
+    workers: Optional[int] = None,
+    context: Optional[Dict[str, Any]] = None,
+    fused: bool = True,
+    cache_dir: Optional[str | Path] = None,
+    store_dir: Optional[str | Path] = None,
+) -> BatchResult:
+    """
+    Run the full MasterOrchestrator pipeline for every match found in `inputs`.
+
+    inputs:  match files and/or directories of CSV exports
+    workers: process pool size (None -> os.cpu_count(); 1 -> in-process, no pool)
+    cache_dir: optional ResultCache root shared by all workers (reruns only recompute changed stages)
+    store_dir: optional EventStore root; validated canonical events are written there once
+               (partitioned by context season / competition and match_id)
+
+    Files are read and split inside the workers (only paths and match keys are sent): the
+    parent only scans match id columns to group files that share a match (plan_file_groups),
+    then each group's matches are split into up to `workers` tasks (split_tasks), so a
+    single season export with many match ids still runs in parallel. Only a run with one
+    match (or workers=1) stays in-process.
+
+    Failures stay isolated per match: they are reported in BatchResult.failures
+    and never abort the other matches.
+    """
+    t0 = time.perf_counter()
+    context = context or {}
+    files = list(iter_match_files(inputs))
+    workers = max(1, int(workers or os.cpu_count() or 1))
+    groups, sources, failures = plan_file_groups(files, workers)
+    init_args = (
+        str(registry_root),
+        provider,
+        phase,
+        fused,
+        str(cache_dir) if cache_dir else None,
+        str(store_dir) if store_dir else None,
+    )
+    tasks: Dict[str, Tuple[Any, ...]] = {}
+    task_keys: Dict[str, List[str]] = {}
+    for g_files, keys in groups:
+        paths = [fp.as_posix() for fp in g_files]
+        for i, subset in enumerate(split_tasks(keys, workers)):
+            tasks[subset[0]] = (_run_files, subset[0], (paths, subset, i == 0))
+            task_keys[subset[0]] = subset
+
+    out, timings = _execute(tasks, sources, failures, phase, context, workers, init_args, task_keys)
+    out.report = aggregate_report(out, phase=phase, workers=workers, files=files, timings=timings)
+    out.report["elapsed_s"] = round(time.perf_counter() - t0, 4)
+    return out
+
+
+def run_store_batch(
+    store_dir: str | Path,
+    season: Any = None,
+    competition: Any = None,
+    match_ids: Optional[Iterable[Any]] = None,
+    phase: str = "tactical",
+    registry_root: str | Path = "canon/registry",
+    provider: str = "sportsbase",
+    workers: Optional[int] = None,
+    context: Optional[Dict[str, Any]] = None,
+    fused: bool = True,
+    cache_dir: Optional[str | Path] = None,
+) -> BatchResult:
+    """
+    run_batch() over matches already in an EventStore (no CSV parsing / mapping / SOT):
+    each worker reads only its match partition and only the metric columns.
+    """
+    t0 = time.perf_counter()
+    context = context or {}
+    store = EventStore(store_dir)
+    metas = store.matches(season, competition, match_ids)
+
+    workers = max(1, int(workers or os.cpu_count() or 1))
+    init_args = (str(registry_root), provider, phase, fused, str(cache_dir) if cache_dir else None, str(store_dir))
+    tasks: Dict[str, Tuple[Any, ...]] = {}
+    sources: Dict[str, List[str]] = {}
+    for m in metas:
+        key = f"{m['season']}/{m['competition']}/{m['match_id']}"
+        tasks[key] = (_run_stored, key, (m["season"], m["competition"], m["match_id"]))
+        sources[key] = [m["_dir"]]
+
+    out, timings = _execute(tasks, sources, {}, phase, context, workers, init_args)
+    files = [Path(m["_dir"]) for m in metas]
+    out.report = aggregate_report(out, phase=phase, workers=workers, files=files, timings=timings)
+    out.report["elapsed_s"] = round(time.perf_counter() - t0, 4)
+    return out
+
+
+def _execute(
+    tasks: Dict[str, Tuple[Any, ...]],
+    sources: Dict[str, List[str]],
+    failures: Dict[str, MatchFailure],
+    phase: str,
+    context: Dict[str, Any],
+    workers: int,
+    init_args: Tuple[Any, ...],
+    task_keys: Optional[Dict[str, List[str]]] = None,
+) -> Tuple[BatchResult, Dict[str, float]]:
+    """
+    Run (fn, key, payload) tasks in-process or on a pool. A task returns one result item
+    or a list of them (one per match it covers); results keep task order, then the
+    order within the task. task_keys: matches covered by each task (for crash reports).
+    """
+    out = BatchResult(failures=dict(failures))
+    timings: Dict[str, float] = {}
+    per_task: Dict[str, List[str]] = {}
+
+    def collect(tkey: str, items: Any) -> None:
+        for key, res, err, elapsed in items if isinstance(items, list) else [items]:
+            timings[key] = round(elapsed, 4)
+            per_task.setdefault(tkey, []).append(key)
+            if res is not None:
+                out.results[key] = res
+            else:
+                error, tb = err or ("UNKNOWN", "")
+                out.failures[key] = MatchFailure(key, sources.get(key, sources.get(tkey, [])), error, tb)
+
+    if workers == 1 or len(tasks) <= 1:
+        _init_worker(*init_args)
+        for fn, key, payload in tasks.values():
+            collect(key, fn(key, payload, phase, context))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+            futures = {pool.submit(fn, key, payload, phase, context): key for fn, key, payload in tasks.values()}
+            for fut in as_completed(futures):
+                tkey = futures[fut]
+                try:
+                    collect(tkey, fut.result())
+                except Exception as e:
+                    # Worker crash / pickling failure: still isolated to this task's matches.
+                    for key in (task_keys or {}).get(tkey, [tkey]):
+                        out.failures[key] = MatchFailure(key, sources.get(key, []), f"WORKER_ERROR: {e}", traceback.format_exc())
+
+    out.results = {k: out.results[k] for t in tasks for k in per_task.get(t, []) if k in out.results}
+    return out, timings
+
+
+def aggregate_report(
+    batch: BatchResult,
+    phase: str,
+    workers: int,
+    files: List[Path],
+    timings: Dict[str, float],
+) -> Dict[str, Any]:
+    """Season/round level summary: status counts and numeric feature stats per metric."""
+    status_counts: Dict[str, Dict[str, int]] = {}
+    cache_stages: Dict[str, Dict[str, int]] = {}
+    values: Dict[str, List[float]] = {}
+    sot_status: Dict[str, int] = {}
+
+    for res in batch.results.values():
+        st = res.validation_report.get("status", "UNKNOWN")
+        sot_status[st] = sot_status.get(st, 0) + 1
+        for c in res.claims:
+            m = c.get("metric")
+            counts = status_counts.setdefault(m, {})
+            counts[c.get("status")] = counts.get(c.get("status"), 0) + 1
+        for stage, hm in res.cache_report.get("stages", {}).items():
+            counts = cache_stages.setdefault(stage, {})
+            counts[hm] = counts.get(hm, 0) + 1
+        for k, v in res.features.items():
+            if isinstance(v, (int, float)) and not isinstance(v, bool):
+                values.setdefault(k, []).append(float(v))
+
+    feature_stats = {}
+    for k, vs in values.items():
+        s = pd.Series(vs, dtype=float)
+        feature_stats[k] = {
+            "n": int(s.count()),
+            "mean": round(float(s.mean()), 4),
+            "min": round(float(s.min()), 4),
+            "max": round(float(s.max()), 4),
+        }
+
+    return {
+        "phase": phase,
+        "workers": workers,
+        "input_files": [p.as_posix() for p in files],
+        "matches_total": len(batch.results) + len(batch.failures),
+        "matches_ok": len(batch.results),
+        "matches_failed": len(batch.failures),
+        "failed": {k: f.error for k, f in batch.failures.items()},
+        "sot_status_counts": sot_status,
+        "claim_status_counts": status_counts,
+        "feature_stats": feature_stats,
+        "cache_stage_counts": cache_stages,
+        "match_elapsed_s": timings,
+    }
+
+
+def result_to_dict(res: EngineResult) -> Dict[str, Any]:
+    """JSON-friendly view of an EngineResult (drops the DataFrame preview)."""
+    return {
+        "validation_status": res.validation_report.get("status"),
+        "registry_status": res.registry_report.get("status"),
+        "features": res.features,
+        "claims": res.claims,
+        "plotspecs": res.plotspecs,
+        "narrative": res.narrative,
+    }
@@ -0,0 +1,77 @@
+import argparse
+import json
+import sys
+
+from engine.ingest.clip_index import ClipIndex
+
+
+def _add_filters(ap, prefix="", label="clip"):
+    ap.add_argument(f"--{prefix}team", type=int, nargs="+", default=None, help=f"{label} team_id")
+    ap.add_argument(f"--{prefix}player", type=int, nargs="+", default=None, help=f"{label} player_id")
+    ap.add_argument(f"--{prefix}action", nargs="+", default=None, help=f"{label} action_canonical")
+    ap.add_argument(f"--{prefix}category", nargs="+", default=None, help=f"{label} action_category")
+
+
+def _filters(args, prefix=""):
+    p = prefix.replace("-", "_")
+    return {
+        "team_id": getattr(args, f"{p}team"),
+        "player_id": getattr(args, f"{p}player"),
+        "action_canonical": getattr(args, f"{p}action"),
+        "action_category": getattr(args, f"{p}category"),
+    }
+
+
+def _time(args, name):
+    # --from-min / --to-min win over --from-s / --to-s (minutes * 60 on the registry clock)
+    minutes = getattr(args, f"{name}_min")
+    if minutes is not None:
+        return minutes * 60.0
+    return getattr(args, f"{name}_s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Query the clip registry by time range (video segment lookup)")
+    ap.add_argument("--out-dir", default="engine/ingest/out", help="Clip ingest output (clips_columns/ or clips.jsonl)")
+    ap.add_argument("--match", default=None, help="match_id (e.g. week01/match03); default: all matches")
+    ap.add_argument("--half", type=int, default=None)
+    ap.add_argument("--limit", type=int, default=None, help="Print at most this many clips")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    ov = sub.add_parser("overlap", help="Clips overlapping a time range")
+    ov.add_argument("--from-s", type=float, default=float("-inf"))
+    ov.add_argument("--to-s", type=float, default=float("inf"))
+    ov.add_argument("--from-min", type=float, default=None)
+    ov.add_argument("--to-min", type=float, default=None)
+    _add_filters(ov)
+
+    ar = sub.add_parser("around", help="Clips within ±window of anchor clips (e.g. pressing around turnovers)")
+    ar.add_argument("--window", type=float, default=10.0, help="Seconds before / after each anchor clip")
+    _add_filters(ar, "anchor-", "anchor")
+    _add_filters(ar)
+
+    sub.add_parser("stats", help="Index size")
+    args = ap.parse_args()
+
+    index = ClipIndex.open(args.out_dir)
+
+    if args.cmd == "stats":
+        print(json.dumps(index.stats(), ensure_ascii=False))
+        return
+
+    if args.cmd == "overlap":
+        rows = index.overlapping(_time(args, "from"), _time(args, "to"), match_id=args.match, half=args.half, **_filters(args))
+        anchors = None
+    else:
+        anchors, rows = index.around(args.window, anchor=_filters(args, "anchor-"), match_id=args.match, half=args.half, **_filters(args))
+
+    if args.limit is not None:
+        rows = rows[: args.limit]
+    for i, rec in enumerate(index.records(rows)):
+        if anchors is not None:
+            rec["anchor_clip"] = int(anchors[i])
+        sys.stdout.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
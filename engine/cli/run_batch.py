@@ -0,0 +1,65 @@
+import argparse
+import json
+from pathlib import Path
+
+from engine.batch_runner import result_to_dict, run_batch, run_store_batch
+
+def main():
+    ap = argparse.ArgumentParser(description="Run the HP-Engine pipeline over many matches (process pool)")
+    ap.add_argument("--input", nargs="+", default=None, help="Match CSV files and/or directories")
+    ap.add_argument("--phase", default="tactical", help="Registry phase")
+    ap.add_argument("--registry-root", default="canon/registry")
+    ap.add_argument("--provider", default="sportsbase")
+    ap.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count; 1 = serial)")
+    ap.add_argument("--cache-dir", default=None, help="Stage result cache directory (reruns skip unchanged stages)")
+    ap.add_argument("--store-dir", default=None, help="Canonical event store root (written from --input, or read with --from-store)")
+    ap.add_argument("--from-store", action="store_true", help="Analyse matches already in --store-dir instead of CSV input")
+    ap.add_argument("--season", default=None, help="Store partition: season")
+    ap.add_argument("--competition", default=None, help="Store partition: competition")
+    ap.add_argument("--match-id", nargs="+", default=None, help="Store read: only these match ids")
+    ap.add_argument("--out", default=None, help="Write full JSON output here (default: print report only)")
+    args = ap.parse_args()
+
+    if args.from_store:
+        if not args.store_dir:
+            ap.error("--from-store needs --store-dir")
+        batch = run_store_batch(
+            args.store_dir,
+            season=args.season,
+            competition=args.competition,
+            match_ids=args.match_id,
+            phase=args.phase,
+            registry_root=args.registry_root,
+            provider=args.provider,
+            workers=args.workers,
+            cache_dir=args.cache_dir,
+        )
+    else:
+        if not args.input:
+            ap.error("--input is required unless --from-store is given")
+        batch = run_batch(
+            args.input,
+            phase=args.phase,
+            registry_root=args.registry_root,
+            provider=args.provider,
+            workers=args.workers,
+            context={"season": args.season, "competition": args.competition},
+            cache_dir=args.cache_dir,
+            store_dir=args.store_dir,
+        )
+
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "report": batch.report,
+            "matches": {k: result_to_dict(r) for k, r in batch.results.items()},
+            "failures": {k: f.__dict__ for k, f in batch.failures.items()},
+        }
+        out.write_text(json.dumps(payload, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+
+    print(json.dumps(batch.report, ensure_ascii=False, indent=2, default=str))
+    return 0 if batch.results else 2
+
+if __name__ == "__main__":
+    raise SystemExit(main())
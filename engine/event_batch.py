@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _norm_label(v: Any) -> Optional[str]:
+    if v is None:
+        return None
+    return str(v).strip().lower()
+
+
+def _to_float(v: Any) -> float:
+    if v is None:
+        return np.nan
+    try:
+        return float(v)
+    except Exception:
+        return np.nan
+
+
+def _encode_labels(values: Sequence[Any] | pd.Series) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """
+    Dictionary-encode labels after str().strip().lower() normalisation.
+
+    Normalisation runs once per distinct raw value, not once per row.
+    Missing values (None/NaN) get code -1 and never match any label.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object) if not isinstance(values, pd.Series) else values)
+    vocab: Dict[str, int] = {}
+    remap = np.empty(len(uniques) + 1, dtype=np.int32)
+    remap[-1] = -1  # factorize sentinel (-1) indexes the last slot
+    for i, u in enumerate(uniques):
+        label = _norm_label(u)
+        remap[i] = vocab.setdefault(label, len(vocab))
+    return remap[codes].astype(np.int32, copy=False), tuple(vocab.keys())
+
+
+@dataclass(frozen=True)
+class EventBatch:
+    """
+    Columnar event handoff between MasterOrchestrator and MetricEngine.
+
+    Columns (all length n):
+      - team_codes / team_vocab : dictionary-encoded team role ("team" | "opponent" | raw label)
+      - type_codes / type_vocab : dictionary-encoded, normalised event_type
+      - x, y, timestamp_s       : float64 (NaN when missing)
+      - t                       : optional legacy match clock (dict key "t"); None when absent
+
+    Labels are normalised (strip + lower) once per distinct value, so metric
+    code can work with integer masks instead of per-event string handling.
+    """
+
+    team_codes: np.ndarray
+    team_vocab: Tuple[str, ...]
+    type_codes: np.ndarray
+    type_vocab: Tuple[str, ...]
+    x: np.ndarray
+    y: np.ndarray
+    timestamp_s: np.ndarray
+    t: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return int(self.type_codes.shape[0])
+
+    # -----------------------------
+    # Builders
+    # -----------------------------
+    @classmethod
+    def from_canonical_df(cls, canonical_df: pd.DataFrame) -> "EventBatch":
+        """
+        Build straight from the canonical DataFrame (no per-row Python objects).
+
+        Team role: the most frequent team_id is "team", everything else "opponent"
+        (same rule as the legacy dict conversion).
+        """
+        n = len(canonical_df)
+        if n == 0:
+            return cls.empty()
+
+        if "team_id" in canonical_df.columns:
+            team_id = canonical_df["team_id"]
+            mode = team_id.mode()
+            if mode.empty:
+                is_team = np.ones(n, dtype=bool)
+            else:
+                is_team = (team_id == mode.iloc[0]).to_numpy(dtype=bool)
+        else:
+            is_team = np.ones(n, dtype=bool)
+        team_codes = np.where(is_team, 0, 1).astype(np.int32)
+
+        if "event_type" in canonical_df.columns:
+            type_codes, type_vocab = _encode_labels(canonical_df["event_type"])
+        else:
+            type_codes, type_vocab = np.full(n, -1, dtype=np.int32), ()
+
+        def num(col: str) -> np.ndarray:
+            if col not in canonical_df.columns:
+                return np.full(n, np.nan, dtype=np.float64)
+            return pd.to_numeric(canonical_df[col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+        return cls(
+            team_codes=team_codes,
+            team_vocab=("team", "opponent"),
+            type_codes=type_codes,
+            type_vocab=type_vocab,
+            x=num("x"),
+            y=num("y"),
+            timestamp_s=num("timestamp_s"),
+        )
+
+    @classmethod
+    def from_events(cls, events: Iterable[Dict[str, Any]]) -> "EventBatch":
+        """
+        Compatibility shim for the list-of-dicts event format:
+          {team, type, x, y, timestamp_s[, t]}
+        """
+        teams: List[Any] = []
+        types: List[Any] = []
+        xs: List[float] = []
+        ys: List[float] = []
+        ts: List[float] = []
+        clock: List[float] = []
+        has_clock = False
+
+        for e in events:
+            teams.append(e.get("team"))
+            types.append(e.get("type"))
+            xs.append(_to_float(e.get("x")))
+            ys.append(_to_float(e.get("y")))
+            ts.append(_to_float(e.get("timestamp_s")))
+            t = e.get("t")
+            if t is not None:
+                has_clock = True
+            clock.append(_to_float(t))
+
+        if not types:
+            return cls.empty()
+
+        team_codes, team_vocab = _encode_labels(teams)
+        type_codes, type_vocab = _encode_labels(types)
+        return cls(
+            team_codes=team_codes,
+            team_vocab=team_vocab,
+            type_codes=type_codes,
+            type_vocab=type_vocab,
+            x=np.asarray(xs, dtype=np.float64),
+            y=np.asarray(ys, dtype=np.float64),
+            timestamp_s=np.asarray(ts, dtype=np.float64),
+            t=np.asarray(clock, dtype=np.float64) if has_clock else None,
+        )
+
+    @classmethod
+    def empty(cls) -> "EventBatch":
+        i = np.empty(0, dtype=np.int32)
+        f = np.empty(0, dtype=np.float64)
+        return cls(team_codes=i, team_vocab=(), type_codes=i, type_vocab=(), x=f, y=f, timestamp_s=f)
+
+    # -----------------------------
+    # Masks
+    # -----------------------------
+    def team_mask(self, team: str) -> np.ndarray:
+        label = _norm_label(team)
+        if label not in self.team_vocab:
+            return np.zeros(len(self), dtype=bool)
+        return self.team_codes == self.team_vocab.index(label)
+
+    def type_mask(self, types: Iterable[str]) -> np.ndarray:
+        labels = {_norm_label(t) for t in types}
+        wanted = [i for i, v in enumerate(self.type_vocab) if v in labels]
+        if not wanted:
+            return np.zeros(len(self), dtype=bool)
+        if len(wanted) == 1:
+            return self.type_codes == wanted[0]
+        return np.isin(self.type_codes, wanted)
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from .fsutil import mkstemp
+from .result_cache import hash_frame
+
+# Bump when the on-disk layout or column typing changes.
+STORE_SCHEMA = "hp-events-v1"
+
+# Canonical columns and their stored types (anything else is kept as-is).
+CATEGORICAL_COLUMNS = ("match_id", "team_id", "player_id", "event_type", "period")
+FLOAT_COLUMNS = ("timestamp_s", "x", "y", "x_end", "y_end")
+
+# Columns MetricEngine needs (EventBatch.from_canonical_df); enough for run_stored().
+METRIC_COLUMNS = ("team_id", "event_type", "timestamp_s", "x", "y")
+
+UNKNOWN = "unknown"
+_UNSAFE = re.compile(r"[^0-9A-Za-z._-]+")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet as pq
+    except ImportError as e:  # pragma: no cover - depends on environment
+        raise ImportError("EventStore needs pyarrow (pip install pyarrow)") from e
+    return pq
+
+
+def _part(value: Any) -> str:
+    """Partition directory value: stable, filesystem-safe, 'unknown' when missing."""
+    if value is None or (isinstance(value, float) and pd.isna(value)) or str(value).strip() == "":
+        return UNKNOWN
+    return _UNSAFE.sub("_", str(value).strip())
+
+
+def _text(s: pd.Series) -> pd.Series:
+    """Mixed-type object column -> strings (nulls stay null), so Arrow can type it."""
+    return s.map(lambda v: v if pd.isna(v) else str(v)).astype(object)
+
+
+def typed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Storage typing for a canonical frame:
+      - categorical: match_id, team_id, player_id, event_type, period
+      - float64:     timestamp_s, x, y, x_end, y_end (only when already numeric; never coerced)
+    Columns with mixed Python types are stored as strings instead of being dropped.
+    """
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if s.dtype == object:
+            kinds = {type(v) for v in s.dropna().head(10_000)}
+            if len(kinds) > 1:
+                s = _text(s)
+        if col in CATEGORICAL_COLUMNS:
+            s = s.astype("category")
+        elif col in FLOAT_COLUMNS and pd.api.types.is_numeric_dtype(s.dtype):
+            s = s.astype("float64")
+        out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+class EventStore:
+    """
+    Persistent columnar store of SOT-validated canonical events.
+
+    Layout (hive-style partitions, one Parquet file per match):
+      <root>/season=<s>/competition=<c>/match_id=<m>/events.parquet
+      <root>/season=<s>/competition=<c>/match_id=<m>/meta.json
+
+    meta.json keeps the SOT report, provider mapping and content hash from write time,
+    so readers skip parsing, mapping and validation entirely.
+
+    Rules:
+      - Written once per source: a partition with the same source_hash is not rewritten.
+      - Rows without match_id go to match_id=unknown (no silent drops).
+      - Reads can select columns and matches; other files are never opened.
+    """
+
+    EVENTS_FILE = "events.parquet"
+    META_FILE = "meta.json"
+
+    def __init__(self, root: str | Path = "hp_store") -> None:
+        self.root = Path(root)
+
+    # -------------------------
+    # Paths / listing
+    # -------------------------
+
+    def partition_dir(self, match_id: Any, season: Any = None, competition: Any = None) -> Path:
+        return self.root / f"season={_part(season)}" / f"competition={_part(competition)}" / f"match_id={_part(match_id)}"
+
+    def has(self, match_id: Any, season: Any = None, competition: Any = None) -> bool:
+        d = self.partition_dir(match_id, season, competition)
+        return (d / self.EVENTS_FILE).exists() and (d / self.META_FILE).exists()
+
+    def matches(
+        self,
+        season: Any = None,
+        competition: Any = None,
+        match_ids: Optional[Iterable[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """meta.json of every stored match, optionally filtered (season/competition/match_id)."""
+        s_glob = f"season={_part(season)}" if season is not None else "season=*"
+        c_glob = f"competition={_part(competition)}" if competition is not None else "competition=*"
+        wanted = {_part(m) for m in match_ids} if match_ids is not None else None
+
+        out: List[Dict[str, Any]] = []
+        for meta_path in sorted(self.root.glob(f"{s_glob}/{c_glob}/match_id=*/{self.META_FILE}")):
+            if wanted is not None and meta_path.parent.name.split("=", 1)[1] not in wanted:
+                continue
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            if meta.get("schema") != STORE_SCHEMA:
+                continue
+            meta["_dir"] = meta_path.parent.as_posix()
+            out.append(meta)
+        return out
+
+    # -------------------------
+    # Write
+    # -------------------------
+
+    def write(
+        self,
+        canonical_df: pd.DataFrame,
+        validation_report: Dict[str, Any],
+        mapping_used: Optional[Dict[str, Any]] = None,
+        season: Any = None,
+        competition: Any = None,
+        source_hash: str = "",
+        overwrite: bool = False,
+        validate_fn: Optional[Callable[[pd.DataFrame], Dict[str, Any]]] = None,
+    ) -> Dict[str, str]:
+        """
+        Store a validated canonical frame, one partition per match_id.
+
+        validate_fn: re-validates each match slice when the frame holds several matches
+        (otherwise every partition keeps the file-level validation_report).
+        Returns {match partition value: "WRITTEN" | "SKIPPED"}.
+        """
+        pq = _require_pyarrow()
+        import pyarrow as pa
+
+        if "match_id" in canonical_df.columns:
+            groups = [(mid, g) for mid, g in canonical_df.groupby("match_id", sort=False, dropna=False)]
+        else:
+            groups = [(None, canonical_df)]
+
+        status: Dict[str, str] = {}
+        for mid, g in groups:
+            key = _part(mid)
+            d = self.partition_dir(mid, season, competition)
+            meta_path = d / self.META_FILE
+            if not overwrite and source_hash and meta_path.exists():
+                try:
+                    if json.loads(meta_path.read_text(encoding="utf-8")).get("source_hash") == source_hash:
+                        status[key] = "SKIPPED"
+                        continue
+                except Exception:
+                    pass
+
+            g = g.reset_index(drop=True)
+            report = validation_report
+            if validate_fn is not None and len(groups) > 1:
+                report = {**validate_fn(g), "provider_mapping_used": mapping_used or {}}
+            table = pa.Table.from_pandas(typed_frame(g), preserve_index=False)
+            d.mkdir(parents=True, exist_ok=True)
+            self._atomic(d / self.EVENTS_FILE, lambda p: pq.write_table(table, p))
+
+            meta = {
+                "schema": STORE_SCHEMA,
+                "season": _part(season),
+                "competition": _part(competition),
+                "match_id": key,
+                "rows": int(len(g)),
+                "columns": [str(c) for c in g.columns],
+                "content_hash": hash_frame(g),
+                "source_hash": source_hash,
+                "validation_report": report,
+                "mapping_used": mapping_used or {},
+                "written_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            payload = json.dumps(meta, ensure_ascii=False, indent=2, default=str)
+            self._atomic(meta_path, lambda p: Path(p).write_text(payload, encoding="utf-8"))
+            status[key] = "WRITTEN"
+        return status
+
+    @staticmethod
+    def _atomic(path: Path, write_fn) -> None:
+        fd, tmp = mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            write_fn(tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+    # -------------------------
+    # Read
+    # -------------------------
+
+    def read_match(
+        self,
+        match_id: Any,
+        season: Any = None,
+        competition: Any = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """One match's events; columns=None reads every stored column."""
+        pq = _require_pyarrow()
+        d = self.partition_dir(match_id, season, competition)
+        path = d / self.EVENTS_FILE
+        if not path.exists():
+            raise FileNotFoundError(f"Match not in event store: {d}")
+        if columns is not None:
+            present = set(pq.read_schema(path).names)
+            columns = [c for c in columns if c in present]
+        return pq.read_table(path, columns=list(columns) if columns is not None else None).to_pandas()
+
+    def read_meta(self, match_id: Any, season: Any = None, competition: Any = None) -> Dict[str, Any]:
+        d = self.partition_dir(match_id, season, competition)
+        return json.loads((d / self.META_FILE).read_text(encoding="utf-8"))
+
+    def read(
+        self,
+        season: Any = None,
+        competition: Any = None,
+        match_ids: Optional[Iterable[Any]] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Events of all matching partitions, concatenated (categorical columns stay categorical)."""
+        frames = [
+            self.read_match(m["match_id"], m["season"], m["competition"], columns=columns)
+            for m in self.matches(season, competition, match_ids)
+        ]
+        if not frames:
+            return pd.DataFrame(columns=list(columns or []))
+        if len(frames) == 1:
+            return frames[0]
+        out = pd.concat(frames, ignore_index=True)
+        for col in CATEGORICAL_COLUMNS:
+            # concat falls back to object when category sets differ between matches
+            if col in out.columns and not isinstance(out[col].dtype, pd.CategoricalDtype):
+                out[col] = out[col].astype("category")
+        return out
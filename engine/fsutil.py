@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import os
+import secrets
+from pathlib import Path
+from typing import Tuple
+
+# stdlib only: shared by the ingest CLIs, which must run without numpy / pandas.
+
+
+def mkstemp(dir: str | Path, suffix: str = ".tmp", prefix: str = "tmp") -> Tuple[int, str]:
+    """
+    tempfile.mkstemp for atomic writes (temp file + os.replace onto the final name).
+
+    Rules:
+      - created with O_CREAT | O_EXCL and mode 0o666, so the kernel applies the umask and
+        the final file gets what open() would give (mkstemp's 0600 would stick after replace)
+      - no process-wide umask reads / writes (safe with other threads creating files)
+      - returns (fd opened for writing, path), like tempfile.mkstemp
+    """
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+    for _ in range(100):
+        path = os.path.join(os.fspath(dir), f"{prefix}{secrets.token_hex(8)}{suffix}")
+        try:
+            return os.open(path, flags, 0o666), path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No usable temporary file name in {dir}")
@@ -1,20 +1,52 @@
 import numpy as np
 
+from engine.nas_detector import NAS_THRESHOLD, NAS_WINDOW_S, detect_nas, nas_by_player
+from engine.xt_model import XTCache
+
+
 class HPAnalytics:
-    def calculate_xt(self, events_df):
-        """16x12 Izgara üzerinde Expected Threat (xT) hesaplar."""
-        events_df['cell_x'] = (events_df['x'] / 6.25).astype(int).clip(0, 15)
-        events_df['cell_y'] = (events_df['y'] / 8.33).astype(int).clip(0, 11)
-        # xT Grid Değerlemesi burada gerçekleşir
+    def __init__(self, xt_cache_dir=".hp_cache/xt"):
+        self.xt_cache = XTCache(xt_cache_dir)
+
+    def fit_xt(self, season_events_df, competition, season, **fit_kwargs):
+        """Sezonluk xT ızgarası (yarışma/sezon başına diskte önbelleklenir; veri değişmedikçe yeniden fit edilmez)."""
+        return self.xt_cache.get_or_fit(season_events_df, competition, season, **fit_kwargs)
+
+    def calculate_xt(self, events_df, model=None, competition=None, season=None):
+        """
+        16x12 Izgara üzerinde Expected Threat (xT) hesaplar.
+
+        model: hazır XTModel; yoksa competition/season için fit_xt ile önbelleğe yazılmış sezon ızgarası.
+        Skorlama asla fit etmez (tek maçtan ızgara öğrenilmez): ikisi de yoksa ValueError.
+        Eklenen kolonlar: cell_x, cell_y, xt_start, xt_end, xt_added (yalnızca başarılı pas/taşımalar;
+        event_type yoksa NaN).
+        """
+        if model is None:
+            if competition is not None and season is not None:
+                model = self.xt_cache.load(competition, season)
+            if model is None:
+                raise ValueError(
+                    f"No xT grid for competition={competition!r} season={season!r}: pass model=, "
+                    "or call fit_xt(season_events_df, competition, season) first"
+                )
+
+        cells = model.cells(events_df['x'].to_numpy(dtype=float), events_df['y'].to_numpy(dtype=float))
+        events_df['cell_x'] = np.where(cells >= 0, cells % model.l, -1)
+        events_df['cell_y'] = np.where(cells >= 0, cells // model.l, -1)
+        events_df['xt_start'] = model.value(events_df['x'].to_numpy(dtype=float), events_df['y'].to_numpy(dtype=float))
+        if 'x_end' in events_df.columns and 'y_end' in events_df.columns:
+            events_df['xt_end'] = model.value(events_df['x_end'].to_numpy(dtype=float), events_df['y_end'].to_numpy(dtype=float))
+        else:
+            events_df['xt_end'] = np.nan
+        events_df['xt_added'] = model.score(events_df).to_numpy()
         return events_df
 
-    def analyze_nas(self, player_events):
-        """Negative Action Spiral: Hata sonrası 180s kognitif çöküş filtresi."""
-        errors = player_events[player_events['is_error'] == True]
-        nas_instances = []
-        for _, err in errors.iterrows():
-            window = player_events[(player_events['time'] > err['time']) & 
-                                 (player_events['time'] <= err['time'] + 180)]
-            if not window.empty and window['success'].mean() < 0.5:
-                nas_instances.append(err['time'])
-        return nas_instances
+    def analyze_nas(self, player_events, window_s=NAS_WINDOW_S, threshold=NAS_THRESHOLD):
+        """Negative Action Spiral: Hata sonrası 180s (window_s) kognitif çöküş filtresi."""
+        res = detect_nas(player_events, window_s, threshold)
+        return res.loc[res['nas'], 'time'].tolist()
+
+    def analyze_nas_batch(self, events_df, window_s=NAS_WINDOW_S, threshold=NAS_THRESHOLD,
+                          player_col='player_id', match_col='match_id'):
+        """Sezon boyu tüm oyuncular için NAS: {oyuncu: [NAS başlatan hata zamanları]} (pencereler maç içinde kalır)."""
+        return nas_by_player(events_df, window_s, threshold, player_col=player_col, match_col=match_col)
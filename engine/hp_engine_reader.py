@@ -1,39 +1,157 @@
 from __future__ import annotations
 
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from io import BytesIO, StringIO
 import json
 import csv
+import math
+import re
+import sys
+import time
 import traceback
+import tracemalloc
 import xml.etree.ElementTree as ET
 
+from .ingest.feed_stream import ColumnBuffer, flatten_record, iter_json_records, iter_xml_records
+
+_PENDING, _PARSING, _PARSED = "pending", "parsing", "parsed"
+_JSON_FIRST = re.compile(rb"(?:\xef\xbb\xbf)?\s*(.)", re.S)
+
+
+@contextmanager
+def _peak_tracker() -> Iterator[Dict[str, Optional[int]]]:
+    """Peak traced allocation (bytes) inside the block; nests with an outer tracemalloc session."""
+    out: Dict[str, Optional[int]] = {"peak_bytes": None}
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    try:
+        yield out
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        out["peak_bytes"] = max(0, peak - base)
+        if started:
+            tracemalloc.stop()
+
 
 @dataclass
 class IngestedFile:
+    """
+    One uploaded file. Payloads are parsed lazily.
+
+    Rules:
+      - text / tables / json_obj / xml_obj / ok parse the file on first access (or load())
+      - raw bytes are released after parsing, unless they are the only payload
+        (unsupported type, missing optional parser library)
+      - tables: list of {"sheet", "rows", "cols", "data": pandas.DataFrame}; streamed
+        XML / JSON event feeds land here as one record table (see HPReader.full_tree)
+      - memory: {"raw_bytes", "peak_bytes" (when tracked), "retained_bytes" (estimate)}
+      - timing: {"parse_s" (summed over parse tasks), "tasks"[, "finished_s"]}
+    """
+
     name: str
     mime: Optional[str] = None
     ext: str = ""
     size: int = 0
 
-    # Parsed payloads (one or more may be filled)
-    text: Optional[str] = None
-    tables: List[Dict[str, Any]] = field(default_factory=list)  # list of {"sheet":..., "rows":..., "cols":..., "data":...}
-    json_obj: Optional[Any] = None
-    xml_obj: Optional[Dict[str, Any]] = None
-
-    # Raw fallback
-    raw_bytes: Optional[bytes] = None
-
-    # Diagnostics
-    ok: bool = False
+    # Diagnostics (filled by the parse)
     warnings: List[str] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
+    memory: Dict[str, Any] = field(default_factory=dict)
+    timing: Dict[str, Any] = field(default_factory=dict)
+
+    # Lazy state
+    _raw: Optional[bytes] = field(default=None, repr=False)
+    _parser: Optional[Callable[["IngestedFile", bytes], None]] = field(default=None, repr=False, compare=False)
+    _state: str = field(default=_PARSED, repr=False)
+    _track_memory: bool = field(default=False, repr=False)
+    _keep_raw: bool = field(default=False, repr=False)
+
+    # Parsed payloads (one or more may be filled)
+    _text: Optional[str] = field(default=None, repr=False)
+    _tables: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+    _json_obj: Optional[Any] = field(default=None, repr=False)
+    _xml_obj: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    _ok: bool = field(default=False, repr=False)
+
+    @property
+    def parsed(self) -> bool:
+        return self._state == _PARSED
+
+    def load(self) -> "IngestedFile":
+        """Parse now (no-op when already parsed)."""
+        if self._state != _PENDING:
+            return self
+        self._state = _PARSING
+        raw = self._raw
+        t0 = time.perf_counter()
+        try:
+            if self._track_memory:
+                with _peak_tracker() as peak:
+                    self._run_parser(raw)
+                self.memory["peak_bytes"] = peak["peak_bytes"]
+            else:
+                self._run_parser(raw)
+        finally:
+            self._state = _PARSED
+            if not self._keep_raw:
+                self._raw = None
+            self._parser = None
+            self.memory["retained_bytes"] = self.retained_bytes()
+            self.timing.update(parse_s=round(time.perf_counter() - t0, 6), tasks=1)
+        return self
+
+    def _run_parser(self, raw: Optional[bytes]) -> None:
+        try:
+            if self._parser is not None and raw is not None:
+                self._parser(self, raw)
+        except Exception as e:
+            self._ok = False
+            self.errors.append(f"Ingest crash: {e}")
+            self.errors.append(traceback.format_exc())
+
+    def keep_raw(self) -> None:
+        """Called by the parser when raw bytes are the payload (never released)."""
+        self._keep_raw = True
+
+    def retained_bytes(self) -> int:
+        """Rough size of what this file keeps in memory (raw + text + tables)."""
+        n = len(self._raw) if self._raw is not None else 0
+        if self._text is not None:
+            n += sys.getsizeof(self._text)
+        for t in self._tables:
+            data = t.get("data")
+            if hasattr(data, "memory_usage"):
+                n += int(data.memory_usage(index=True, deep=True).sum())
+        return n
+
+    # Lazy payload accessors (assignment is used by the parser itself)
+    def _payload(self, attr: str) -> Any:
+        if self._state == _PENDING:
+            self.load()
+        return getattr(self, attr)
+
+    text = property(lambda self: self._payload("_text"), lambda self, v: setattr(self, "_text", v))
+    tables = property(lambda self: self._payload("_tables"), lambda self, v: setattr(self, "_tables", v))
+    json_obj = property(lambda self: self._payload("_json_obj"), lambda self, v: setattr(self, "_json_obj", v))
+    xml_obj = property(lambda self: self._payload("_xml_obj"), lambda self, v: setattr(self, "_xml_obj", v))
+    ok = property(lambda self: self._payload("_ok"), lambda self, v: setattr(self, "_ok", v))
+
+    @property
+    def raw_bytes(self) -> Optional[bytes]:
+        """Raw upload while pending; afterwards only kept when it is the payload."""
+        return self._raw
 
 
 @dataclass
 class IngestStore:
     files: List[IngestedFile] = field(default_factory=list)
+    timing: Dict[str, Any] = field(default_factory=dict)
 
     def summary(self) -> Dict[str, Any]:
         return {
@@ -43,27 +161,173 @@ class IngestStore:
             "names": [f.name for f in self.files],
         }
 
+    def load_all(self) -> "IngestStore":
+        for f in self.files:
+            f.load()
+        return self
+
+    def memory_report(self) -> List[Dict[str, Any]]:
+        """Per-file memory (bytes); pending files report only their raw size."""
+        return [
+            {
+                "name": f.name,
+                "state": f._state,
+                "raw_bytes": f.size,
+                "peak_bytes": f.memory.get("peak_bytes"),
+                "retained_bytes": f.memory.get("retained_bytes", f.retained_bytes()),
+                "raw_released": f.parsed and f.raw_bytes is None,
+            }
+            for f in self.files
+        ]
+
+    def timing_report(self) -> Dict[str, Any]:
+        """Ingest wall time plus per-file parse timing, in input order."""
+        return {
+            **self.timing,
+            "files": [{"name": f.name, "size": f.size, **f.timing} for f in self.files],
+        }
+
+
+# -------------------------
+# Parse tasks (module level: picklable for the process pool)
+# -------------------------
+
+def _open_excel(b: bytes, ext: str):
+    import pandas as pd  # type: ignore
+
+    # xls needs xlrd; xlsx needs openpyxl. We'll attempt and warn on missing.
+    if ext == "xlsx":
+        return pd.ExcelFile(BytesIO(b), engine="openpyxl")
+    return pd.ExcelFile(BytesIO(b))
+
+
+def _read_sheet(xls: Any, sheet: str) -> Dict[str, Any]:
+    df = xls.parse(sheet)
+    return {"sheet": sheet, "rows": int(df.shape[0]), "cols": int(df.shape[1]), "data": df.fillna("")}
+
+
+def _pdf_page_texts(reader: Any, start: int, stop: int, warnings: List[str]) -> List[str]:
+    pages_text = []
+    for i in range(start, stop):
+        try:
+            t = reader.pages[i].extract_text() or ""
+            if t.strip():
+                pages_text.append(t)
+        except Exception as e:
+            warnings.append(f"PDF page {i} extract failed: {e}")
+    return pages_text
+
+
+def _file_task(cfg: Dict[str, Any], name: str, mime: Optional[str], b: bytes) -> IngestedFile:
+    """Whole-file parse (same code path as a lazy load)."""
+    return HPReader(lazy=False, **cfg).ingest([_Upload(name, mime, b)]).files[0]
+
+
+def _pdf_pages_task(b: bytes, start: int, stop: int, track_memory: bool) -> Dict[str, Any]:
+    from pypdf import PdfReader  # type: ignore
+
+    t0 = time.perf_counter()
+    warnings: List[str] = []
+    with _maybe_peak(track_memory) as peak:
+        texts = _pdf_page_texts(PdfReader(BytesIO(b)), start, stop, warnings)
+    return {"texts": texts, "warnings": warnings, "seconds": time.perf_counter() - t0, **peak}
+
+
+def _excel_sheet_task(b: bytes, ext: str, sheet: str, track_memory: bool) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    out: Dict[str, Any] = {"table": None, "warning": None}
+    with _maybe_peak(track_memory) as peak:
+        try:
+            out["table"] = _read_sheet(_open_excel(b, ext), sheet)
+        except Exception as e:
+            out["warning"] = f"Sheet '{sheet}' read failed: {e}"
+    return {**out, "seconds": time.perf_counter() - t0, **peak}
+
+
+@contextmanager
+def _maybe_peak(enabled: bool) -> Iterator[Dict[str, Optional[int]]]:
+    if not enabled:
+        yield {"peak_bytes": None}
+        return
+    with _peak_tracker() as peak:
+        yield peak
+
+
+class _Upload:
+    """Minimal UploadedFile stand-in (name / type / getvalue)."""
+
+    def __init__(self, name: str, mime: Optional[str], b: bytes) -> None:
+        self.name, self.type, self._b = name, mime, b
+
+    def getvalue(self) -> bytes:
+        return self._b
+
 
 class HPReader:
     """
     Streamlit UploadedFile aware ingestion.
     Accepts list[UploadedFile] from st.file_uploader(accept_multiple_files=True).
+
+    lazy:         parse each file on first payload access instead of inside ingest()
+    keep_text:    keep decoded text of csv / json / xml next to the parsed payload
+    track_memory: record per-file peak parse memory (tracemalloc; slows parsing)
+    workers:      > 1 parses every file inside ingest() on a pool (lazy is ignored);
+                  multi-page PDFs are split into page ranges and workbooks into sheets
+    executor:     "process" (default; pypdf / openpyxl are pure Python) or "thread"
+    full_tree:    XML -> nested xml_obj, JSON -> json_obj (whole document in memory).
+                  Default streams instead: XML <xml_record_tag> elements (iterparse) and
+                  JSON array elements (top level, JSON Lines, or at json_record_path) go
+                  straight into a column table; a document with no records (plain XML,
+                  a single JSON object) still falls back to the full tree.
+
+    Parallel results are identical to a serial parse and come back in input order.
     """
 
+    PDF_MIN_PAGES_PER_TASK = 4
+
+    def __init__(
+        self,
+        lazy: bool = True,
+        keep_text: bool = False,
+        track_memory: bool = False,
+        workers: int = 1,
+        executor: str = "process",
+        full_tree: bool = False,
+        xml_record_tag: str = "Event",
+        json_record_path: Optional[str] = None,
+    ) -> None:
+        if executor not in ("process", "thread"):
+            raise ValueError(f"executor must be 'process' or 'thread', got {executor!r}")
+        self.lazy = lazy
+        self.keep_text = keep_text
+        self.track_memory = track_memory
+        self.workers = max(1, int(workers or 1))
+        self.executor = executor
+        self.full_tree = full_tree
+        self.xml_record_tag = xml_record_tag
+        self.json_record_path = json_record_path
+
     def ingest(self, files: List[Any]) -> IngestStore:
         store = IngestStore()
+        t0 = time.perf_counter()
+        parallel = self.workers > 1
 
         for uf in files or []:
             ing = IngestedFile(
                 name=getattr(uf, "name", "unknown"),
                 mime=getattr(uf, "type", None),
+                _track_memory=self.track_memory,
             )
             ing.ext = self._ext(ing.name)
             try:
                 b = uf.getvalue() if hasattr(uf, "getvalue") else bytes(uf)
-                ing.raw_bytes = b
+                ing._raw = b
                 ing.size = len(b)
-                self._parse_into(ing, b)
+                ing.memory["raw_bytes"] = ing.size
+                ing._parser = self._parse_into
+                ing._state = _PENDING
+                if not self.lazy and not parallel:
+                    ing.load()
             except Exception as e:
                 ing.ok = False
                 ing.errors.append(f"Ingest crash: {e}")
@@ -71,8 +335,120 @@ class HPReader:
 
             store.files.append(ing)
 
+        if parallel:
+            self._parse_parallel(store.files, t0)
+        store.timing = {
+            "workers": self.workers,
+            "executor": self.executor if parallel else "serial",
+            "wall_s": round(time.perf_counter() - t0, 6),
+        }
         return store
 
+    # -------------------------
+    # Parallel parse
+    # -------------------------
+
+    def _parse_parallel(self, files: List[IngestedFile], t0: float) -> None:
+        cfg = {
+            "keep_text": self.keep_text,
+            "track_memory": self.track_memory,
+            "full_tree": self.full_tree,
+            "xml_record_tag": self.xml_record_tag,
+            "json_record_path": self.json_record_path,
+        }
+        pool_cls = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        with pool_cls(max_workers=self.workers) as pool:
+            plans: List[Optional[Tuple[str, List[Future]]]] = []
+            for ing in files:
+                if ing._state != _PENDING:
+                    plans.append(None)
+                    continue
+                plans.append(self._submit(pool, ing, cfg))
+
+            # Input order; each file is finished as soon as its own tasks are.
+            for i, (ing, plan) in enumerate(zip(files, plans)):
+                if plan is None:
+                    continue
+                kind, futures = plan
+                files[i] = self._assemble(ing, kind, futures)
+                files[i].timing["finished_s"] = round(time.perf_counter() - t0, 6)
+
+    def _submit(self, pool: Any, ing: IngestedFile, cfg: Dict[str, Any]) -> Tuple[str, List[Future]]:
+        b = ing._raw
+        track = self.track_memory
+        if ing.ext == "pdf":
+            pages = self._pdf_page_count(b)
+            per_task = max(self.PDF_MIN_PAGES_PER_TASK, math.ceil(pages / self.workers))
+            if pages > per_task:
+                return "pdf", [
+                    pool.submit(_pdf_pages_task, b, a, min(a + per_task, pages), track)
+                    for a in range(0, pages, per_task)
+                ]
+        elif ing.ext in {"xlsx", "xls"}:
+            sheets = self._excel_sheets(b, ing.ext)
+            if len(sheets) > 1:
+                return "excel", [pool.submit(_excel_sheet_task, b, ing.ext, sh, track) for sh in sheets]
+        return "file", [pool.submit(_file_task, cfg, ing.name, ing.mime, b)]
+
+    def _assemble(self, ing: IngestedFile, kind: str, futures: List[Future]) -> IngestedFile:
+        if kind == "file":
+            try:
+                done = futures[0].result()
+            except Exception as e:
+                done = ing
+                done._state = _PARSED
+                done._raw = None
+                done.ok = False
+                done.errors.append(f"Ingest crash: {e}")
+            done.memory["raw_bytes"] = ing.size
+            return done
+
+        ing._state = _PARSING  # payload setters below must not trigger a lazy load
+        results: List[Dict[str, Any]] = []
+        try:
+            results = [f.result() for f in futures]
+            if kind == "pdf":
+                texts: List[str] = []
+                for r in results:
+                    texts.extend(r["texts"])
+                    ing.warnings.extend(r["warnings"])
+                ing.text = "\n\n".join(texts)
+            else:
+                for r in results:
+                    if r["table"] is not None:
+                        ing.tables.append(r["table"])
+                    else:
+                        ing.warnings.append(r["warning"])
+            ing.ok = True
+        except Exception as e:
+            ing.ok = False
+            ing.errors.append(f"{'PDF' if kind == 'pdf' else 'Excel'} read error: {e}")
+        ing._state = _PARSED
+        ing._raw = None
+        ing._parser = None
+        peaks = [r["peak_bytes"] for r in results if r.get("peak_bytes") is not None]
+        if peaks:
+            ing.memory["peak_bytes"] = max(peaks)  # largest single task
+        ing.memory["retained_bytes"] = ing.retained_bytes()
+        ing.timing.update(parse_s=round(sum(r["seconds"] for r in results), 6), tasks=len(futures))
+        return ing
+
+    @staticmethod
+    def _pdf_page_count(b: bytes) -> int:
+        try:
+            from pypdf import PdfReader  # type: ignore
+
+            return len(PdfReader(BytesIO(b)).pages)
+        except Exception:
+            return 0  # whole-file task reports the problem
+
+    @staticmethod
+    def _excel_sheets(b: bytes, ext: str) -> List[str]:
+        try:
+            return list(_open_excel(b, ext).sheet_names)
+        except Exception:
+            return []  # whole-file task reports the problem
+
     # -------------------------
     # Internals
     # -------------------------
@@ -97,17 +473,22 @@ class HPReader:
             if text is None:
                 ing.ok = False
                 return
-            ing.text = text
+            if self.keep_text:
+                ing.text = text
             ing.tables.append(self._parse_csv_table(text, ing))
             ing.ok = True
             return
 
+        if ext in {"json"} and not self.full_tree and self._stream_json(ing, b):
+            return
+
         if ext in {"json"}:
             text = self._decode_text(b, ing)
             if text is None:
                 ing.ok = False
                 return
-            ing.text = text
+            if self.keep_text:
+                ing.text = text
             try:
                 ing.json_obj = json.loads(text)
                 ing.ok = True
@@ -116,12 +497,16 @@ class HPReader:
                 ing.errors.append(f"JSON parse error: {e}")
             return
 
+        if ext in {"xml"} and not self.full_tree and self._stream_xml(ing, b):
+            return
+
         if ext in {"xml"}:
             text = self._decode_text(b, ing)
             if text is None:
                 ing.ok = False
                 return
-            ing.text = text
+            if self.keep_text:
+                ing.text = text
             try:
                 ing.xml_obj = self._parse_xml(text)
                 ing.ok = True
@@ -136,32 +521,21 @@ class HPReader:
                 import pandas as pd  # type: ignore
             except Exception:
                 ing.warnings.append("pandas not available; keeping raw bytes only.")
+                ing.keep_raw()
                 ing.ok = True  # store raw
                 return
 
-            # xls needs xlrd; xlsx needs openpyxl. We'll attempt and warn on missing.
-            bio = BytesIO(b)
             try:
-                if ext == "xlsx":
-                    # openpyxl required under the hood
-                    xls = pd.ExcelFile(bio, engine="openpyxl")
-                else:
-                    # xlrd required for old xls
-                    xls = pd.ExcelFile(bio)
+                xls = _open_excel(b, ext)
             except Exception as e:
                 ing.warnings.append(f"Excel engine missing or file unreadable: {e}. Keeping raw bytes.")
+                ing.keep_raw()
                 ing.ok = True
                 return
 
             for sheet in xls.sheet_names:
                 try:
-                    df = xls.parse(sheet)
-                    ing.tables.append({
-                        "sheet": sheet,
-                        "rows": int(df.shape[0]),
-                        "cols": int(df.shape[1]),
-                        "data": df.fillna("").to_dict(orient="records"),
-                    })
+                    ing.tables.append(_read_sheet(xls, sheet))
                 except Exception as e:
                     ing.warnings.append(f"Sheet '{sheet}' read failed: {e}")
 
@@ -174,6 +548,7 @@ class HPReader:
                 import docx  # python-docx
             except Exception:
                 ing.warnings.append("python-docx not available; keeping raw bytes only.")
+                ing.keep_raw()
                 ing.ok = True
                 return
 
@@ -194,19 +569,13 @@ class HPReader:
                 from pypdf import PdfReader  # type: ignore
             except Exception:
                 ing.warnings.append("pypdf not available; keeping raw bytes only.")
+                ing.keep_raw()
                 ing.ok = True
                 return
 
             try:
                 reader = PdfReader(BytesIO(b))
-                pages_text = []
-                for i, page in enumerate(reader.pages):
-                    try:
-                        t = page.extract_text() or ""
-                        if t.strip():
-                            pages_text.append(t)
-                    except Exception as e:
-                        ing.warnings.append(f"PDF page {i} extract failed: {e}")
+                pages_text = _pdf_page_texts(reader, 0, len(reader.pages), ing.warnings)
                 ing.text = "\n\n".join(pages_text)
                 ing.ok = True
             except Exception as e:
@@ -216,6 +585,62 @@ class HPReader:
 
         # --- FALLBACK ---
         ing.warnings.append(f"Unsupported extension '{ext}'. Keeping raw bytes only.")
+        ing.keep_raw()
+        ing.ok = True
+
+    def _stream_xml(self, ing: IngestedFile, b: bytes) -> bool:
+        """<xml_record_tag> elements -> record table. False when there are none (caller builds the tree)."""
+        tag = self.xml_record_tag
+        try:
+            buf = ColumnBuffer().extend(iter_xml_records(BytesIO(b), tag=tag))
+        except Exception as e:
+            ing.ok = False
+            ing.errors.append(f"XML parse error: {e}")
+            return True
+        if not buf.rows:
+            return False
+        self._add_records(ing, tag, buf, b)
+        return True
+
+    def _stream_json(self, ing: IngestedFile, b: bytes) -> bool:
+        """Array elements -> record table. False for a single top-level object (caller uses json_obj)."""
+        path = self.json_record_path
+        m = _JSON_FIRST.match(b)
+        top_object = m is not None and m.group(1) == b"{"
+        last_error: Optional[Exception] = None
+        for enc in ("utf-8-sig", "cp1254", "latin-1"):
+            try:
+                if path is None and top_object:
+                    # JSON Lines / concatenated objects, unless it is one document.
+                    it = iter_json_records(BytesIO(b), encoding=enc)
+                    first = next(it, None)
+                    second = next(it, None)
+                    if second is None:
+                        return False
+                    buf = ColumnBuffer()
+                    buf.add(flatten_record(first))
+                    buf.add(flatten_record(second))
+                    buf.extend(flatten_record(r) for r in it)
+                else:
+                    buf = ColumnBuffer().extend(flatten_record(r) for r in iter_json_records(BytesIO(b), path=path, encoding=enc))
+                self._add_records(ing, path or "records", buf, b)
+                return True
+            except UnicodeDecodeError as e:
+                last_error = e
+                continue
+            except Exception as e:
+                ing.ok = False
+                ing.errors.append(f"JSON parse error: {e}")
+                return True
+        ing.ok = False
+        ing.errors.append(f"Text decode failed for utf-8/cp1254/latin-1: {last_error}")
+        return True
+
+    def _add_records(self, ing: IngestedFile, sheet: str, buf: ColumnBuffer, b: bytes) -> None:
+        df = buf.to_frame()
+        ing.tables.append({"sheet": sheet, "rows": int(buf.rows), "cols": int(df.shape[1]), "data": df})
+        if self.keep_text:
+            ing.text = self._decode_text(b, ing)
         ing.ok = True
 
     def _decode_text(self, b: bytes, ing: IngestedFile) -> Optional[str]:
@@ -229,26 +654,30 @@ class HPReader:
         return None
 
     def _parse_csv_table(self, text: str, ing: IngestedFile) -> Dict[str, Any]:
-        # Very tolerant CSV parser
+        # Very tolerant CSV parser, straight into column lists (no per-row dicts):
+        # short rows are padded with "", extra cells dropped, a repeated header keeps its last column.
+        import pandas as pd
+
         sio = StringIO(text)
         try:
             reader = csv.reader(sio)
-            rows = list(reader)
-            if not rows:
-                return {"sheet": "csv", "rows": 0, "cols": 0, "data": []}
-            header = rows[0]
-            data_rows = rows[1:]
-            # Map to dict records
-            records = []
-            for r in data_rows:
-                rec = {}
-                for i, h in enumerate(header):
-                    rec[h] = r[i] if i < len(r) else ""
-                records.append(rec)
-            return {"sheet": "csv", "rows": len(records), "cols": len(header), "data": records}
+            header = next(reader, None)
+            if not header:
+                return {"sheet": "csv", "rows": 0, "cols": 0, "data": pd.DataFrame()}
+            last = {h: i for i, h in enumerate(header)}
+            cols: Dict[str, List[str]] = {h: [] for h in last}
+            picks = list(last.items())
+            n = 0
+            for r in reader:
+                w = len(r)
+                for h, i in picks:
+                    cols[h].append(r[i] if i < w else "")
+                n += 1
+            df = pd.DataFrame(cols, dtype=object) if n else pd.DataFrame(columns=list(cols), dtype=object)
+            return {"sheet": "csv", "rows": n, "cols": len(header), "data": df}
         except Exception as e:
             ing.warnings.append(f"CSV parse warning: {e}")
-            return {"sheet": "csv", "rows": 0, "cols": 0, "data": []}
+            return {"sheet": "csv", "rows": 0, "cols": 0, "data": pd.DataFrame()}
 
     def _parse_xml(self, text: str) -> Dict[str, Any]:
         root = ET.fromstring(text)
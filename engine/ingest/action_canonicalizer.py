@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+_WS_RE = re.compile(r"\s+")
+
+# Category keywords in priority order (first category with any substring hit wins).
+CATEGORY_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("SHOT", ("şut", "shot", "gol", "goal", "psxg")),
+    ("PASS", ("pas", "pass", "cross", "orta")),
+    ("DEFENSE", ("mücadele", "challenge", "tackle", "interception", "kapma")),
+    ("BUILDUP", ("kale vuruş", "goal kick", "build", "set hücum", "positional")),
+    ("MISTAKE", ("hata", "mistake", "top kayb", "loss")),
+    ("SET_PIECE", ("korner", "corner", "serbest vuruş", "free kick")),
+)
+
+
+def _compile_category_matcher() -> Tuple["re.Pattern[str]", Dict[str, str]]:
+    """
+    One regex for every keyword. The alternation sits inside a lookahead, so a match is
+    attempted at every position (overlapping hits are not skipped); alternatives are
+    listed by category priority, so at each position the best category wins.
+    """
+    owner: Dict[str, str] = {}
+    alts = []
+    for cat, words in CATEGORY_KEYWORDS:
+        for w in words:
+            if w not in owner:
+                owner[w] = cat
+                alts.append(re.escape(w))
+    return re.compile("(?=(" + "|".join(alts) + "))"), owner
+
+
+_CATEGORY_RE, _KEYWORD_CATEGORY = _compile_category_matcher()
+_CATEGORY_RANK = {cat: i for i, (cat, _) in enumerate(CATEGORY_KEYWORDS)}
+
+
+def category_of(text: str) -> str:
+    """Same result as the chained substring checks over CATEGORY_KEYWORDS, in one scan."""
+    best = len(CATEGORY_KEYWORDS)
+    for m in _CATEGORY_RE.finditer(text.lower()):
+        rank = _CATEGORY_RANK[_KEYWORD_CATEGORY[m.group(1)]]
+        if rank < best:
+            best = rank
+            if best == 0:
+                break
+    return CATEGORY_KEYWORDS[best][0] if best < len(CATEGORY_KEYWORDS) else "OTHER"
+
+
+def norm_text(s: Any) -> str:
+    if s is None:
+        return ""
+    return _WS_RE.sub(" ", str(s).strip())
+
+
+class ActionCanonicalizer:
+    """
+    Compiled raw action -> (action_raw, action_canonical, action_category).
+
+    - alias + signal mappings are folded into one dict at build time
+      (alias -> signal name resolved once, not per row)
+    - resolve() is memoized per raw cell value with a bounded LRU (max_entries);
+      a season has a few hundred distinct actions, so almost every row is a hit
+    - stats() reports lookups / hits / misses / hit_rate for the run summary
+    """
+
+    def __init__(self, signal_map: Dict[str, str], alias_map: Dict[str, str], max_entries: int = 65536) -> None:
+        # Same precedence as sportsbase_csv.canonicalize_action: alias first, then signal map.
+        lookup: Dict[str, str] = dict(signal_map)
+        for alias, target in alias_map.items():
+            t = norm_text(target)
+            lookup[alias] = signal_map.get(t, t)
+        self._lookup = lookup
+        self.max_entries = max_entries
+        self.resolve = lru_cache(maxsize=max_entries)(self._resolve)
+
+    def canonical(self, action_norm: str) -> str:
+        return self._lookup.get(action_norm, "unmapped")
+
+    def _resolve(self, raw: Any) -> Tuple[str, str, str]:
+        action_raw = norm_text(raw)
+        canonical = self.canonical(action_raw)
+        category = category_of(action_raw if canonical == "unmapped" else canonical)
+        return action_raw, canonical, category
+
+    def stats(self) -> Dict[str, Any]:
+        info = self.resolve.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "lookups": lookups,
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": round(info.hits / lookups, 6) if lookups else None,
+            "entries": info.currsize,
+            "max_entries": self.max_entries,
+        }
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Bump when the on-disk column layout changes.
+COLUMNS_SCHEMA = "clips-columns-v1"
+
+# Dictionary-encoded (int32 codes into a per-column string table).
+STRING_COLUMNS = ("source_file", "match_id", "code_raw", "action_raw", "action_canonical", "action_category")
+# int64, missing = INT_NULL.
+INT_COLUMNS = ("row_id", "half", "team_id", "player_id")
+# float64, missing = NaN.
+FLOAT_COLUMNS = ("start_s", "end_s", "pos_x", "pos_y")
+
+INT_NULL = np.iinfo(np.int64).min
+_INT_MAX = np.iinfo(np.int64).max
+NULL_CODE = -1  # string column value was None
+
+_DTYPES: Dict[str, np.dtype] = {
+    **{c: np.dtype("<i4") for c in STRING_COLUMNS},
+    **{c: np.dtype("<i8") for c in INT_COLUMNS},
+    **{c: np.dtype("<f8") for c in FLOAT_COLUMNS},
+}
+COLUMNS = tuple(_DTYPES)
+
+
+class ClipColumnBuilder:
+    """
+    Columnar buffer for one file's ClipRows (the unit a worker sends back / the manifest
+    keeps as parts/<id>.npz). String columns are dictionary-encoded locally; codes are
+    remapped to the global dictionaries when chunks are appended to a ClipColumnsWriter.
+    Int values outside int64 (e.g. a 20-digit team id) are stored as INT_NULL (missing);
+    clips.jsonl keeps the exact value.
+    """
+
+    __slots__ = ("_values", "_dicts")
+
+    def __init__(self) -> None:
+        self._values: Dict[str, List[Any]] = {c: [] for c in COLUMNS}
+        self._dicts: Dict[str, Dict[str, int]] = {c: {} for c in STRING_COLUMNS}
+
+    def add(self, row: Any) -> None:
+        for c in STRING_COLUMNS:
+            v = getattr(row, c)
+            if v is None:
+                self._values[c].append(NULL_CODE)
+            else:
+                d = self._dicts[c]
+                code = d.get(v)
+                if code is None:
+                    code = d[v] = len(d)
+                self._values[c].append(code)
+        for c in INT_COLUMNS:
+            v = getattr(row, c)
+            if v is not None and not INT_NULL < v <= _INT_MAX:
+                v = None
+            self._values[c].append(INT_NULL if v is None else v)
+        for c in FLOAT_COLUMNS:
+            v = getattr(row, c)
+            self._values[c].append(np.nan if v is None else v)
+
+    def to_chunk(self) -> Dict[str, Any]:
+        """{"columns": {name: ndarray}, "dictionaries": {name: [str, ...]}} (picklable)."""
+        return {
+            "columns": {c: np.asarray(self._values[c], dtype=_DTYPES[c]) for c in COLUMNS},
+            "dictionaries": {c: list(self._dicts[c]) for c in STRING_COLUMNS},
+        }
+
+
+def save_chunk(path: Path, chunk: Dict[str, Any]) -> None:
+    arrays = {f"col_{c}": a for c, a in chunk["columns"].items()}
+    arrays["dictionaries"] = np.frombuffer(json.dumps(chunk["dictionaries"], ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+    with path.open("wb") as f:
+        np.savez(f, **arrays)
+
+
+def load_chunk(path: Path) -> Dict[str, Any]:
+    with np.load(path) as z:
+        return {
+            "columns": {c: z[f"col_{c}"] for c in COLUMNS},
+            "dictionaries": json.loads(z["dictionaries"].tobytes().decode("utf-8")),
+        }
+
+
+class ClipColumnsWriter:
+    """
+    Streams column chunks (in input file order) into out_dir/clips_columns/:
+
+      <column>.bin       raw little-endian array, one value per clip (np.memmap-able)
+      dictionaries.json  string table per dictionary-encoded column
+      meta.json          schema, rows, dtypes, null conventions
+
+    Global dictionaries grow append-only, so codes already written never change.
+    Files are written to a temp dir and swapped in on close() (readers never see a
+    half-written set).
+    """
+
+    DIR_NAME = "clips_columns"
+
+    def __init__(self, out_dir: Path) -> None:
+        self.final_dir = Path(out_dir) / self.DIR_NAME
+        self.tmp_dir = Path(out_dir) / (self.DIR_NAME + ".tmp")
+        if self.tmp_dir.exists():
+            _remove_dir(self.tmp_dir)
+        self.tmp_dir.mkdir(parents=True)
+        self.rows = 0
+        self._dicts: Dict[str, Dict[str, int]] = {c: {} for c in STRING_COLUMNS}
+        self._files = {c: (self.tmp_dir / f"{c}.bin").open("wb") for c in COLUMNS}
+
+    def append(self, chunk: Dict[str, Any]) -> None:
+        cols = chunk["columns"]
+        for c in STRING_COLUMNS:
+            g = self._dicts[c]
+            local = chunk["dictionaries"][c]
+            # local code -> global code; slot 0 of the lookup handles NULL_CODE (-1).
+            lookup = np.empty(len(local) + 1, dtype=np.int32)
+            lookup[0] = NULL_CODE
+            for i, s in enumerate(local):
+                code = g.get(s)
+                if code is None:
+                    code = g[s] = len(g)
+                lookup[i + 1] = code
+            self._files[c].write(lookup[cols[c] + 1].astype("<i4", copy=False).tobytes())
+        for c in INT_COLUMNS + FLOAT_COLUMNS:
+            self._files[c].write(cols[c].astype(_DTYPES[c], copy=False).tobytes())
+        self.rows += len(cols[COLUMNS[0]])
+
+    def close(self, extra_meta: Optional[Dict[str, Any]] = None) -> Path:
+        for f in self._files.values():
+            f.close()
+        (self.tmp_dir / "dictionaries.json").write_text(
+            json.dumps({c: list(d) for c, d in self._dicts.items()}, ensure_ascii=False), encoding="utf-8"
+        )
+        meta = {
+            "schema": COLUMNS_SCHEMA,
+            "rows": self.rows,
+            "dtypes": {c: _DTYPES[c].str for c in COLUMNS},
+            "string_columns": list(STRING_COLUMNS),
+            "int_null": int(INT_NULL),
+            "null_code": NULL_CODE,
+            **(extra_meta or {}),
+        }
+        (self.tmp_dir / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        old = self.final_dir.with_name(self.DIR_NAME + ".old")
+        if self.final_dir.exists():
+            os.replace(self.final_dir, old)
+        os.replace(self.tmp_dir, self.final_dir)
+        if old.exists():
+            _remove_dir(old)
+        return self.final_dir
+
+    def abort(self) -> None:
+        for f in self._files.values():
+            f.close()
+        _remove_dir(self.tmp_dir)
+
+
+def write_columns(out_dir: Path, chunks: Iterable[Dict[str, Any]], extra_meta: Optional[Dict[str, Any]] = None) -> Path:
+    writer = ClipColumnsWriter(out_dir)
+    try:
+        for chunk in chunks:
+            writer.append(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.close(extra_meta)
+
+
+def remove_columns(out_dir: Path) -> bool:
+    """Drop out_dir/clips_columns (a non-columnar run must not leave a stale copy behind)."""
+    d = Path(out_dir) / ClipColumnsWriter.DIR_NAME
+    if d.exists():
+        _remove_dir(d)
+        return True
+    return False
+
+
+def _remove_dir(d: Path) -> None:
+    for p in d.iterdir():
+        p.unlink()
+    d.rmdir()
+
+
+class ClipColumns:
+    """
+    Memory-mapped reader of clips_columns/ (no JSON parsing of clip rows).
+
+      cols = ClipColumns.open("engine/ingest/out")
+      idx = cols.select(match_id="week01/match_0003", action_canonical=["PASS", "SHOT"])
+      df = cols.to_frame(idx, columns=["start_s", "end_s", "action_canonical"])
+
+    Filters compare int32 codes, so a filter on a string column is one vectorized
+    comparison over the mapped array.
+    """
+
+    def __init__(self, root: Path, meta: Dict[str, Any], dictionaries: Dict[str, List[str]]) -> None:
+        self.root = Path(root)
+        self.meta = meta
+        self.rows = int(meta["rows"])
+        self.dictionaries = dictionaries
+        self._index: Dict[str, Dict[str, int]] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def open(cls, out_dir: str | Path) -> "ClipColumns":
+        root = Path(out_dir)
+        if root.name != ClipColumnsWriter.DIR_NAME:
+            root = root / ClipColumnsWriter.DIR_NAME
+        meta = json.loads((root / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("schema") != COLUMNS_SCHEMA:
+            raise ValueError(f"Unsupported clip columns schema: {meta.get('schema')!r} (expected {COLUMNS_SCHEMA})")
+        dictionaries = json.loads((root / "dictionaries.json").read_text(encoding="utf-8"))
+        return cls(root, meta, dictionaries)
+
+    @classmethod
+    def from_chunk(cls, chunk: Dict[str, Any]) -> "ClipColumns":
+        """In-memory columns (e.g. ClipColumnBuilder.to_chunk() of rows read from clips.jsonl)."""
+        rows = len(chunk["columns"][COLUMNS[0]])
+        out = cls(Path("."), {"schema": COLUMNS_SCHEMA, "rows": rows}, chunk["dictionaries"])
+        out._arrays = dict(chunk["columns"])
+        return out
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def array(self, column: str) -> np.ndarray:
+        """Raw mapped array (codes for string columns)."""
+        if column not in _DTYPES:
+            raise KeyError(f"Unknown clip column: {column}")
+        a = self._arrays.get(column)
+        if a is None:
+            if self.rows == 0:
+                a = np.empty(0, dtype=_DTYPES[column])
+            else:
+                a = np.memmap(self.root / f"{column}.bin", dtype=_DTYPES[column], mode="r", shape=(self.rows,))
+            self._arrays[column] = a
+        return a
+
+    def codes(self, column: str, values: Iterable[str]) -> List[int]:
+        """Dictionary codes of values (unknown values are dropped)."""
+        idx = self._index.get(column)
+        if idx is None:
+            idx = self._index[column] = {s: i for i, s in enumerate(self.dictionaries[column])}
+        return [idx[v] for v in values if v in idx]
+
+    def mask(self, **filters: Any) -> np.ndarray:
+        """
+        Boolean row mask; filters are column=value or column=[values] on string columns
+        (AND across columns, OR within a list).
+        """
+        m = np.ones(self.rows, dtype=bool)
+        for column, wanted in filters.items():
+            if column not in STRING_COLUMNS:
+                raise KeyError(f"Filtering is supported on string columns only: {column}")
+            values = [wanted] if isinstance(wanted, str) else list(wanted)
+            m &= np.isin(self.array(column), np.asarray(self.codes(column, values), dtype=np.int32))
+        return m
+
+    def select(self, **filters: Any) -> np.ndarray:
+        """Row indices matching filters (see mask())."""
+        return np.flatnonzero(self.mask(**filters))
+
+    def decode(self, column: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Column values as Python objects (strings / None for string columns)."""
+        a = self.array(column)
+        a = a if rows is None else a[rows]
+        if column in STRING_COLUMNS:
+            table = np.asarray(self.dictionaries[column] + [None], dtype=object)
+            return table[np.where(a == NULL_CODE, len(table) - 1, a)]
+        if column in INT_COLUMNS:
+            out = a.astype(object)
+            out[a == INT_NULL] = None
+            return out
+        return np.asarray(a)
+
+    def to_frame(self, rows: Optional[np.ndarray] = None, columns: Optional[Sequence[str]] = None):
+        """Selected rows as a DataFrame; string columns become pandas Categoricals."""
+        import pandas as pd
+
+        out: Dict[str, Any] = {}
+        for c in columns or COLUMNS:
+            a = self.array(c)
+            a = np.asarray(a if rows is None else a[rows])
+            if c in STRING_COLUMNS:
+                out[c] = pd.Categorical.from_codes(a, categories=pd.Index(self.dictionaries[c], dtype=object))
+            elif c in INT_COLUMNS:
+                out[c] = pd.array(np.where(a == INT_NULL, 0, a), dtype="Int64")
+                out[c][a == INT_NULL] = pd.NA
+            else:
+                out[c] = a
+        return pd.DataFrame(out)
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .clip_columns import INT_COLUMNS, INT_NULL, NULL_CODE, STRING_COLUMNS, ClipColumnBuilder, ClipColumns, ClipColumnsWriter
+
+# Group key: (match_id, half); half None when missing.
+GroupKey = Tuple[Optional[str], Optional[int]]
+
+
+def _filter_values(wanted: Any) -> List[Any]:
+    if isinstance(wanted, (list, tuple, set, frozenset, np.ndarray)):
+        return list(wanted)
+    return [wanted]
+
+
+class ClipIndex:
+    """
+    Interval index over the clip registry, one sorted run per (match_id, half).
+
+    Per group, clips are sorted by interval start with a running max of interval end,
+    so an overlap query [t0, t1] is two binary searches:
+      hi = first clip starting after t1
+      lo = first clip whose running-max end reaches t0 (nothing before it can overlap)
+    and only clips in [lo, hi) are checked (end >= t0) and filtered.
+
+    Rules:
+      - interval = [min(start_s, end_s), max(start_s, end_s)]; a clip with only one of
+        them is a point; clips with neither are not indexed (reported in stats)
+      - times are in the registry clock (seconds, as stored in start_s / end_s)
+      - filters: match_id / code / action_* (strings), team_id / player_id / row_id (ints)
+      - results are registry row numbers (positions in clips.jsonl / clips_columns)
+    """
+
+    def __init__(self, columns: ClipColumns) -> None:
+        self.columns = columns
+        start = np.asarray(columns.array("start_s"), dtype=np.float64)
+        end = np.asarray(columns.array("end_s"), dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            t0 = np.fmin(start, end)
+            t1 = np.fmax(start, end)
+        valid = ~np.isnan(t0)
+        self.unindexed = int((~valid).sum())
+
+        match = np.asarray(columns.array("match_id"))
+        half = np.asarray(columns.array("half"))
+        rows = np.flatnonzero(valid)
+        order = rows[np.lexsort((t0[rows], half[rows], match[rows]))]
+
+        self.rows = order
+        self.starts = t0[order]
+        self.ends = t1[order]
+        self.max_ends = np.empty_like(self.ends)
+
+        m_sorted, h_sorted = match[order], half[order]
+        cut = np.flatnonzero((np.diff(m_sorted) != 0) | (np.diff(h_sorted) != 0)) + 1
+        bounds = np.concatenate(([0], cut, [len(order)])) if len(order) else np.zeros(1, dtype=np.int64)
+
+        names = columns.dictionaries["match_id"]
+        self.groups: Dict[GroupKey, Tuple[int, int]] = {}
+        self._by_match: Dict[Optional[str], List[GroupKey]] = {}
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            a, b = int(a), int(b)
+            code, h = int(m_sorted[a]), int(h_sorted[a])
+            key = (None if code == NULL_CODE else names[code], None if h == INT_NULL else h)
+            self.groups[key] = (a, b)
+            self._by_match.setdefault(key[0], []).append(key)
+            np.maximum.accumulate(self.ends[a:b], out=self.max_ends[a:b])
+
+    # -------------------------
+    # Construction
+    # -------------------------
+
+    @classmethod
+    def open(cls, out_dir: str | Path) -> "ClipIndex":
+        """Index of an ingest out_dir: clips_columns/ when present, else clips.jsonl."""
+        out_dir = Path(out_dir)
+        if (out_dir / ClipColumnsWriter.DIR_NAME / "meta.json").exists():
+            return cls(ClipColumns.open(out_dir))
+        return cls.from_jsonl(out_dir / "clips.jsonl")
+
+    @classmethod
+    def from_jsonl(cls, path: str | Path) -> "ClipIndex":
+        builder = ClipColumnBuilder()
+        with Path(path).open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    builder.add(SimpleNamespace(**json.loads(line)))
+        return cls(ClipColumns.from_chunk(builder.to_chunk()))
+
+    # -------------------------
+    # Queries
+    # -------------------------
+
+    def group_keys(self, match_id: Optional[str] = None, half: Optional[int] = None) -> List[GroupKey]:
+        keys = list(self.groups) if match_id is None else self._by_match.get(match_id, [])
+        return keys if half is None else [k for k in keys if k[1] == half]
+
+    def overlapping(
+        self,
+        t_from: float = float("-inf"),
+        t_to: float = float("inf"),
+        match_id: Optional[str] = None,
+        half: Optional[int] = None,
+        **filters: Any,
+    ) -> np.ndarray:
+        """
+        Row numbers of clips overlapping [t_from, t_to] (inclusive), ordered by
+        (match, half, start). match_id / half restrict the groups searched.
+        """
+        out = [self._overlap(a, b, t_from, t_to) for a, b in (self.groups[k] for k in self.group_keys(match_id, half))]
+        hits = np.concatenate(out) if out else np.empty(0, dtype=np.int64)
+        return self._apply_filters(hits, filters)
+
+    def around(
+        self,
+        window_s: float,
+        anchor: Optional[Dict[str, Any]] = None,
+        match_id: Optional[str] = None,
+        half: Optional[int] = None,
+        include_anchor: bool = False,
+        **filters: Any,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Clips within ±window_s of each anchor clip (same match and half).
+
+        anchor: filters selecting the anchor clips (e.g. {"action_category": "MISTAKE"});
+        filters select the target clips. Returns aligned arrays (anchor_rows, rows).
+        """
+        anchor = anchor or {}
+        anchors_out: List[np.ndarray] = []
+        rows_out: List[np.ndarray] = []
+        for key in self.group_keys(match_id, half):
+            a, b = self.groups[key]
+            for p in a + np.flatnonzero(self._filter_mask(self.rows[a:b], anchor)):
+                hits = self._apply_filters(self._overlap(a, b, self.starts[p] - window_s, self.ends[p] + window_s), filters)
+                if not include_anchor:
+                    hits = hits[hits != self.rows[p]]
+                if len(hits):
+                    anchors_out.append(np.full(len(hits), self.rows[p], dtype=np.int64))
+                    rows_out.append(hits)
+        if not rows_out:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(anchors_out), np.concatenate(rows_out)
+
+    def records(self, rows: np.ndarray, fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Decoded clips for row numbers (for JSON / CSV export)."""
+        fields = fields or ["match_id", "half", "start_s", "end_s", "team_id", "player_id", "action_canonical", "action_category", "source_file", "row_id"]
+        cols = {f: self.columns.decode(f, rows) for f in fields}
+        for i, r in enumerate(rows):
+            rec: Dict[str, Any] = {"clip": int(r)}
+            for f in fields:
+                v = cols[f][i]
+                if isinstance(v, (np.floating, float)):
+                    v = None if np.isnan(v) else float(v)
+                elif isinstance(v, np.integer):
+                    v = int(v)
+                rec[f] = v
+            yield rec
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clips": len(self.columns),
+            "indexed": int(len(self.rows)),
+            "unindexed": self.unindexed,
+            "groups": len(self.groups),
+        }
+
+    # -------------------------
+    # Internals
+    # -------------------------
+
+    def _overlap(self, a: int, b: int, t_from: float, t_to: float) -> np.ndarray:
+        hi = a + int(np.searchsorted(self.starts[a:b], t_to, side="right"))
+        lo = a + int(np.searchsorted(self.max_ends[a:b], t_from, side="left"))
+        if lo >= hi:
+            return np.empty(0, dtype=np.int64)
+        keep = self.ends[lo:hi] >= t_from
+        return self.rows[lo:hi][keep]
+
+    def _apply_filters(self, rows: np.ndarray, filters: Dict[str, Any]) -> np.ndarray:
+        if not filters or not len(rows):
+            return rows
+        return rows[self._filter_mask(rows, filters)]
+
+    def _filter_mask(self, rows: np.ndarray, filters: Dict[str, Any]) -> np.ndarray:
+        keep = np.ones(len(rows), dtype=bool)
+        for column, wanted in filters.items():
+            if wanted is None:
+                continue
+            values = _filter_values(wanted)
+            a = self.columns.array(column)[rows]
+            if column in STRING_COLUMNS:
+                keep &= np.isin(a, np.asarray(self.columns.codes(column, values), dtype=np.int32))
+            elif column in INT_COLUMNS:
+                keep &= np.isin(a, np.asarray([int(v) for v in values], dtype=np.int64))
+            else:
+                raise KeyError(f"Unsupported clip filter: {column}")
+        return keep
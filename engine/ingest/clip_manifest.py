@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ..fsutil import mkstemp
+
+# Bump when parsing / canonicalisation output changes (invalidates every cached part).
+MANIFEST_SCHEMA = "clips-manifest-v1"
+
+# = clip_columns.ClipColumnsWriter.DIR_NAME. clip_columns needs numpy, so it is only
+# imported when column chunks are actually written or read (plain jsonl ingest is stdlib-only).
+COLUMNS_DIR = "clips_columns"
+
+
+def file_sha256(path: Path, block: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(block), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def manifest_key(path: Path) -> str:
+    return path.as_posix()
+
+
+def mapping_versions(mapping_dir: Path, names: Iterable[str]) -> Dict[str, str]:
+    """Content hash per mapping file ("missing" when absent, so adding one also invalidates)."""
+    out: Dict[str, str] = {}
+    for name in names:
+        p = mapping_dir / name
+        out[name] = file_sha256(p) if p.exists() else "missing"
+    return out
+
+
+class ClipManifest:
+    """
+    Per-source-file state of the clip registry (out_dir/clips_manifest.json).
+
+    files[key] = {size, mtime_ns, sha256, rows, part, part_bytes, counters[, columns]}
+      - part:     jsonl rows of that file (out_dir/parts/<id>.jsonl)
+      - counters: partial summary counters (sportsbase_csv.summary_counters)
+      - columns:  column chunk of that file (out_dir/parts/<id>.npz), columnar runs only
+
+    A file is current when size + mtime_ns match, or (touched but unchanged) when its
+    sha256 still matches. Mapping file hashes are part of the manifest identity.
+    """
+
+    FILE_NAME = "clips_manifest.json"
+    PARTS_DIR = "parts"
+
+    def __init__(self, out_dir: Path, data: Dict[str, Any]) -> None:
+        self.out_dir = Path(out_dir)
+        self.data = data
+
+    @classmethod
+    def load(cls, out_dir: Path) -> "ClipManifest":
+        p = Path(out_dir) / cls.FILE_NAME
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+            if data.get("schema") != MANIFEST_SCHEMA:
+                data = {}
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("schema", MANIFEST_SCHEMA)
+        data.setdefault("mappings", {})
+        data.setdefault("files", {})
+        return cls(out_dir, data)
+
+    @property
+    def files(self) -> Dict[str, Dict[str, Any]]:
+        return self.data["files"]
+
+    def compatible(self, versions: Dict[str, str]) -> bool:
+        return self.data.get("mappings") == versions
+
+    def reset(self, versions: Dict[str, str]) -> None:
+        for entry in self.files.values():
+            self._remove_parts(entry)
+        self.data = {"schema": MANIFEST_SCHEMA, "mappings": dict(versions), "files": {}}
+
+    # -------------------------
+    # Per-file state
+    # -------------------------
+
+    def is_current(self, key: str, path: Path) -> bool:
+        entry = self.files.get(key)
+        if entry is None or not self._part_path(entry).exists():
+            return False
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        if st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        if st.st_size != entry["size"]:
+            return False
+        # Touched (mtime changed) but maybe identical: compare content.
+        if file_sha256(path) == entry["sha256"]:
+            entry["mtime_ns"] = st.st_mtime_ns
+            return True
+        return False
+
+    def has_columns(self, key: str) -> bool:
+        entry = self.files.get(key)
+        return entry is not None and "columns" in entry and (self.out_dir / self.PARTS_DIR / entry["columns"]).exists()
+
+    def store(
+        self,
+        key: str,
+        path: Path,
+        text: str,
+        counters: Dict[str, Any],
+        digest: str,
+        columns: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        part_id = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+        part_name = part_id + ".jsonl"
+        part = self.out_dir / self.PARTS_DIR / part_name
+        part.parent.mkdir(parents=True, exist_ok=True)
+        payload = text.encode("utf-8")
+        _atomic_write(part, payload)
+
+        columns_name = None
+        if columns is not None:
+            from .clip_columns import save_chunk
+
+            columns_name = part_id + ".npz"
+            _atomic_write_with(self.out_dir / self.PARTS_DIR / columns_name, lambda p: save_chunk(p, columns))
+        else:
+            old = self.files.get(key, {}).get("columns")
+            if old:
+                (self.out_dir / self.PARTS_DIR / old).unlink(missing_ok=True)
+
+        try:
+            st = path.stat()
+            size, mtime_ns = st.st_size, st.st_mtime_ns
+        except OSError:
+            size, mtime_ns = -1, -1  # unreadable: always re-parsed next run
+
+        self.files[key] = {
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "sha256": digest,
+            "rows": int(counters.get("total", 0)),
+            "part": part_name,
+            "part_bytes": len(payload),
+            "counters": counters,
+        }
+        if columns_name is not None:
+            self.files[key]["columns"] = columns_name
+
+    def prune(self, keep: Set[str]) -> List[str]:
+        """Drop entries (and parts) of files no longer in the input set."""
+        gone = [k for k in self.files if k not in keep]
+        for k in gone:
+            self._remove_parts(self.files.pop(k))
+        return gone
+
+    # -------------------------
+    # Output
+    # -------------------------
+
+    def concat_parts(self, keys: Iterable[str], out_path: Path) -> None:
+        """clips.jsonl = parts in input order (byte copy, no JSON parsing)."""
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = mkstemp(dir=out_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for k in keys:
+                    with self._part_path(self.files[k]).open("rb") as f:
+                        shutil.copyfileobj(f, out)
+            os.replace(tmp, out_path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+    def load_columns(self, key: str) -> Dict[str, Any]:
+        from .clip_columns import load_chunk
+
+        return load_chunk(self.out_dir / self.PARTS_DIR / self.files[key]["columns"])
+
+    def columns_current(self, rows: int) -> bool:
+        """out_dir/clips_columns exists, has the current schema and the expected row count."""
+        meta_path = self.out_dir / COLUMNS_DIR / "meta.json"
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        from .clip_columns import COLUMNS_SCHEMA
+
+        return meta.get("schema") == COLUMNS_SCHEMA and meta.get("rows") == rows
+
+    def save(self) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(self.data, ensure_ascii=False).encode("utf-8")
+        _atomic_write(self.out_dir / self.FILE_NAME, payload)
+
+    def _part_path(self, entry: Dict[str, Any]) -> Path:
+        return self.out_dir / self.PARTS_DIR / entry["part"]
+
+    def _remove_parts(self, entry: Dict[str, Any]) -> None:
+        self._part_path(entry).unlink(missing_ok=True)
+        if entry.get("columns"):
+            (self.out_dir / self.PARTS_DIR / entry["columns"]).unlink(missing_ok=True)
+
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    def write(tmp: Path) -> None:
+        tmp.write_bytes(payload)
+
+    _atomic_write_with(path, write)
+
+
+def _atomic_write_with(path: Path, write_fn) -> None:
+    fd, tmp = mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        write_fn(Path(tmp))
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
@@ -1,5 +1,6 @@
 import csv
-from engine.map.canonical_mapper import load_mapping, map_columns, capability_report
+from engine.map.canonical_mapper import load_mapping, map_columns, capability_report, mapping_plan
+from engine.map.mapping_plan import plan_stats
 
 def inspect_csv(path, mapping_path):
     with open(path, newline="", encoding="utf-8") as f:
@@ -13,5 +14,7 @@ def inspect_csv(path, mapping_path):
     return {
         "headers": headers,
         "column_map": col_map,
-        "capability": report
+        "capability": report,
+        "mapping_plan": mapping_plan(headers, mapping).describe(),
+        "plan_cache": plan_stats(),
     }
\ No newline at end of file
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import codecs
+import io
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+
+Source = Union[str, Path, bytes, IO[bytes]]
+
+DEFAULT_CHUNK_CHARS = 1 << 20
+
+
+def _open_binary(source: Source) -> IO[bytes]:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if isinstance(source, (str, Path)):
+        return open(source, "rb")
+    return source
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1] if "}" in tag else tag
+
+
+# -------------------------
+# XML (iterparse)
+# -------------------------
+
+def iter_xml_records(
+    source: Source,
+    tag: str = "Event",
+    qualifier_tag: str = "Q",
+    qualifier_key: str = "qualifier_id",
+    qualifier_value: str = "value",
+    ancestor_attrs: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream <tag> elements as flat records (Opta F24 style: <Event ...><Q qualifier_id= value=/></Event>).
+
+    Rules:
+      - record = element attributes; <Q> children become q_<qualifier_id> = value,
+        other children with text become <child tag> = text
+      - tags match on local name (namespaces ignored)
+      - every finished element is detached from its parent, so memory stays flat
+        regardless of file size (only the open ancestor chain is kept)
+      - ancestor_attrs=True adds open ancestors' attributes as "<Tag>.<attr>" (e.g. Game.id)
+    """
+    f = _open_binary(source)
+    close = f is not source
+    try:
+        stack: List[ET.Element] = []
+        inside = 0  # > 0 while within a matched element (its children are kept until it ends)
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                if _local(elem.tag) == tag:
+                    inside += 1
+                continue
+
+            stack.pop()
+            is_record = _local(elem.tag) == tag
+            if is_record:
+                inside -= 1
+            if is_record and inside == 0:
+                rec: Dict[str, Any] = {}
+                if ancestor_attrs:
+                    for anc in stack:
+                        for k, v in anc.attrib.items():
+                            rec[f"{_local(anc.tag)}.{k}"] = v
+                rec.update(elem.attrib)
+                for child in elem:
+                    ctag = _local(child.tag)
+                    if ctag == qualifier_tag and qualifier_key in child.attrib:
+                        rec[f"q_{child.attrib[qualifier_key]}"] = child.attrib.get(qualifier_value, "")
+                    elif child.text and child.text.strip():
+                        rec[ctag] = child.text.strip()
+                yield rec
+            if inside == 0 and stack:
+                stack[-1].remove(elem)
+    finally:
+        if close:
+            f.close()
+
+
+# -------------------------
+# JSON (incremental)
+# -------------------------
+
+class _JsonStream:
+    """Chunked text buffer + json.JSONDecoder.raw_decode for one value at a time."""
+
+    _WS = " \t\n\r"
+    _END = _WS + ",:]}"
+
+    def __init__(self, f: IO[bytes], encoding: str, chunk_chars: int) -> None:
+        self.f = f
+        self.dec = codecs.getincrementaldecoder(encoding)()
+        self.chunk = chunk_chars
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.json = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        raw = self.f.read(self.chunk)
+        if not raw:
+            self.buf += self.dec.decode(b"", final=True)
+            self.eof = True
+            return False
+        if self.pos > self.chunk:
+            self.buf, self.pos = self.buf[self.pos:], 0
+        self.buf += self.dec.decode(raw)
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace char ("" at end of input)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in self._WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"JSON stream: expected {ch!r} at offset {self.pos}, got {got!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete value (reads more input until it is complete)."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.json.raw_decode(self.buf, self.pos)
+                # A number / literal cut by the chunk boundary decodes as a shorter value:
+                # only accept it when a delimiter follows (or the input is exhausted).
+                if self.eof or (end < len(self.buf) and self.buf[end] in self._END):
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def iter_json_records(
+    source: Source,
+    path: Optional[str] = None,
+    encoding: str = "utf-8-sig",
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+) -> Iterator[Any]:
+    """
+    Stream the elements of a JSON array without loading the document.
+
+    path=None: top-level array (e.g. StatsBomb events), or a sequence of top-level
+    values (JSON Lines / concatenated objects). path="a.b": array under those object
+    keys; sibling values on the way are decoded one at a time and discarded.
+    Only the current element (plus one read chunk) is held in memory.
+    """
+    f = _open_binary(source)
+    close = f is not source
+    try:
+        s = _JsonStream(f, encoding, chunk_chars)
+        for key in (path.split(".") if path else []):
+            s.expect("{")
+            while True:
+                if s.peek() == "}":
+                    raise KeyError(f"JSON stream: key {key!r} not found")
+                k = s.value()
+                s.expect(":")
+                if k == key:
+                    break
+                s.value()  # skip sibling
+                if s.peek() == ",":
+                    s.pos += 1
+
+        first = s.peek()
+        if first == "[":
+            s.pos += 1
+            if s.peek() == "]":
+                return
+            while True:
+                yield s.value()
+                nxt = s.peek()
+                s.pos += 1
+                if nxt == "]":
+                    return
+                if nxt != ",":
+                    raise ValueError(f"JSON stream: expected ',' or ']' at offset {s.pos - 1}, got {nxt!r}")
+        if path:
+            raise ValueError(f"JSON stream: {path!r} is not an array")
+        while s.peek() != "":
+            yield s.value()
+    finally:
+        if close:
+            f.close()
+
+
+# -------------------------
+# Column buffers
+# -------------------------
+
+def flatten_record(obj: Any, prefix: str = "") -> Dict[str, Any]:
+    """Nested dicts -> dotted keys (type.name); lists and scalars are kept as values."""
+    if not isinstance(obj, dict):
+        return {prefix or "value": obj}
+    out: Dict[str, Any] = {}
+    for k, v in obj.items():
+        key = f"{prefix}.{k}" if prefix else str(k)
+        if isinstance(v, dict) and v:
+            out.update(flatten_record(v, key))
+        else:
+            out[key] = v
+    return out
+
+
+class ColumnBuffer:
+    """
+    Records -> per-column lists (no list of dicts is kept). Columns appear in first-seen
+    order; a row missing a column gets None.
+    """
+
+    __slots__ = ("cols", "rows")
+
+    def __init__(self) -> None:
+        self.cols: Dict[str, List[Any]] = {}
+        self.rows = 0
+
+    def add(self, rec: Dict[str, Any]) -> None:
+        n = self.rows
+        cols = self.cols
+        for k, v in rec.items():
+            col = cols.get(k)
+            if col is None:
+                col = cols[k] = [None] * n
+            col.append(v)
+        self.rows = n = n + 1
+        if len(rec) != len(cols):
+            for col in cols.values():
+                if len(col) < n:
+                    col.append(None)
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> "ColumnBuffer":
+        for r in records:
+            self.add(r)
+        return self
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.cols) if self.cols else pd.DataFrame(index=range(self.rows))
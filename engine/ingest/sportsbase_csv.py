@@ -3,13 +3,20 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import os
 import re
-from collections import Counter, defaultdict
-from dataclasses import dataclass, asdict
+import shutil
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from .action_canonicalizer import ActionCanonicalizer, category_of
+from .clip_manifest import COLUMNS_DIR, ClipManifest, file_sha256, manifest_key, mapping_versions
+
 
 _NUM_RE = re.compile(r"\d+")
 _WS_RE = re.compile(r"\s+")
@@ -55,24 +62,18 @@ def _read_json(path: Path) -> Dict:
 
 
 def _guess_category(action_raw: str) -> str:
-    a = action_raw.lower()
-    if "şut" in a or "shot" in a or "gol" in a or "goal" in a or "psxg" in a:
-        return "SHOT"
-    if "pas" in a or "pass" in a or "cross" in a or "orta" in a:
-        return "PASS"
-    if "mücadele" in a or "challenge" in a or "tackle" in a or "interception" in a or "kapma" in a:
-        return "DEFENSE"
-    if "kale vuruş" in a or "goal kick" in a or "build" in a or "set hücum" in a or "positional" in a:
-        return "BUILDUP"
-    if "hata" in a or "mistake" in a or "top kayb" in a or "loss" in a:
-        return "MISTAKE"
-    if "korner" in a or "corner" in a or "serbest vuruş" in a or "free kick" in a:
-        return "SET_PIECE"
-    return "OTHER"
-
-
-@dataclass
+    # Single compiled multi-keyword scan (see action_canonicalizer.CATEGORY_KEYWORDS).
+    return category_of(action_raw)
+
+
+@dataclass(slots=True)
 class ClipRow:
+    """
+    One clip. Slotted (no per-row __dict__); repeated strings (source_file, match_id,
+    code / action names) are interned or shared via the canonicalizer memo, so a row
+    holds references, not copies.
+    """
+
     source_file: str
     row_id: Optional[int]
     match_id: Optional[str]
@@ -89,12 +90,18 @@ class ClipRow:
     pos_y: Optional[float]
 
 
+_CLIP_FIELDS = tuple(f.name for f in fields(ClipRow))
+
+
 def iter_csv_files(sample_dir: Path) -> Iterator[Path]:
     for p in sample_dir.rglob("*.csv"):
         if p.is_file():
             yield p
 
 
+MAPPING_FILES = ("signal_mappings.json", "tr_action_aliases.json")
+
+
 def load_action_mappings(repo_root: Path) -> Tuple[Dict[str, str], Dict[str, str]]:
     signal_map = _read_json(repo_root / "canon" / "mappings" / "signal_mappings.json")
     alias_map = _read_json(repo_root / "canon" / "mappings" / "tr_action_aliases.json")
@@ -116,14 +123,27 @@ def canonicalize_action(action_raw: str, signal_map: Dict[str, str], alias_map:
     return "unmapped"
 
 
-def parse_row(file_path: Path, row: Dict[str, str], signal_map: Dict[str, str], alias_map: Dict[str, str], match_id: str) -> ClipRow:
+def parse_row(
+    file_path: Path,
+    row: Dict[str, str],
+    signal_map: Dict[str, str],
+    alias_map: Dict[str, str],
+    match_id: str,
+    canon: Optional[ActionCanonicalizer] = None,
+    source_file: Optional[str] = None,
+) -> ClipRow:
     row_id = _safe_int(row.get("ID") or row.get("id"))
     start_s = _safe_float(row.get("start"))
     end_s = _safe_float(row.get("end"))
     half = _safe_int(row.get("half"))
 
-    code_raw = _norm_text(row.get("code", ""))
-    action_raw = _norm_text(row.get("action", ""))
+    code_raw = sys.intern(_norm_text(row.get("code", "")))
+    if canon is not None:
+        action_raw, action_canonical, action_category = canon.resolve(row.get("action", ""))
+    else:
+        action_raw = sys.intern(_norm_text(row.get("action", "")))
+        action_canonical = sys.intern(canonicalize_action(action_raw, signal_map, alias_map))
+        action_category = _guess_category(action_raw) if action_canonical == "unmapped" else _guess_category(action_canonical)
 
     nums = [int(x) for x in _NUM_RE.findall(code_raw)] if code_raw else []
     team_id = nums[0] if len(nums) >= 1 else None
@@ -132,11 +152,8 @@ def parse_row(file_path: Path, row: Dict[str, str], signal_map: Dict[str, str],
     pos_x = _safe_float(row.get("pos_x"))
     pos_y = _safe_float(row.get("pos_y"))
 
-    action_canonical = canonicalize_action(action_raw, signal_map, alias_map)
-    action_category = _guess_category(action_raw) if action_canonical == "unmapped" else _guess_category(action_canonical)
-
     return ClipRow(
-        source_file=str(file_path.as_posix()),
+        source_file=source_file if source_file is not None else sys.intern(file_path.as_posix()),
         row_id=row_id,
         match_id=match_id,
         start_s=start_s,
@@ -153,14 +170,53 @@ def parse_row(file_path: Path, row: Dict[str, str], signal_map: Dict[str, str],
     )
 
 
-def parse_csv_file(file_path: Path, signal_map: Dict[str, str], alias_map: Dict[str, str]) -> List[ClipRow]:
-    match_id = f"{file_path.parent.name}/{file_path.stem}"
-    rows: List[ClipRow] = []
+def iter_csv_rows(
+    file_path: Path,
+    signal_map: Dict[str, str],
+    alias_map: Dict[str, str],
+    canon: Optional[ActionCanonicalizer] = None,
+) -> Iterator[ClipRow]:
+    # One string object per file for source_file / match_id, shared by all its rows.
+    source_file = sys.intern(file_path.as_posix())
+    match_id = sys.intern(f"{file_path.parent.name}/{file_path.stem}")
     with file_path.open("r", encoding="utf-8", errors="replace", newline="") as f:
         reader = csv.DictReader(f, delimiter=";")
         for r in reader:
-            rows.append(parse_row(file_path, r, signal_map, alias_map, match_id))
-    return rows
+            yield parse_row(file_path, r, signal_map, alias_map, match_id, canon, source_file)
+
+
+def parse_csv_file(
+    file_path: Path,
+    signal_map: Dict[str, str],
+    alias_map: Dict[str, str],
+    canon: Optional[ActionCanonicalizer] = None,
+) -> List[ClipRow]:
+    return list(iter_csv_rows(file_path, signal_map, alias_map, canon))
+
+
+def error_row(file_path: Path, exc: BaseException) -> ClipRow:
+    """Placeholder row for a file that could not be parsed (the file is never silently skipped)."""
+    return ClipRow(
+        source_file=str(file_path.as_posix()),
+        row_id=None,
+        match_id=f"{file_path.parent.name}/{file_path.stem}",
+        start_s=None,
+        end_s=None,
+        half=None,
+        team_id=None,
+        player_id=None,
+        code_raw="",
+        action_raw=f"__INGEST_ERROR__:{type(exc).__name__}",
+        action_canonical="unmapped",
+        action_category="OTHER",
+        pos_x=None,
+        pos_y=None,
+    )
+
+
+def _jsonl_line(row: ClipRow) -> str:
+    # Flat fields only, so no asdict() deep copy; key order = field order (same bytes).
+    return json.dumps({k: getattr(row, k) for k in _CLIP_FIELDS}, ensure_ascii=False) + "\n"
 
 
 def write_jsonl(out_path: Path, rows: Iterable[ClipRow]) -> int:
@@ -168,39 +224,353 @@ def write_jsonl(out_path: Path, rows: Iterable[ClipRow]) -> int:
     n = 0
     with out_path.open("w", encoding="utf-8") as f:
         for row in rows:
-            f.write(json.dumps(asdict(row), ensure_ascii=False) + "\n")
+            f.write(_jsonl_line(row))
             n += 1
     return n
 
 
-def build_summary(all_rows: List[ClipRow]) -> Dict:
-    total = len(all_rows)
-    actions_raw = Counter(r.action_raw for r in all_rows if r.action_raw)
-    actions_canon = Counter(r.action_canonical for r in all_rows if r.action_canonical)
-    categories = Counter(r.action_category for r in all_rows if r.action_category)
-
-    mapped = sum(1 for r in all_rows if r.action_canonical and r.action_canonical != "unmapped")
-    unmapped = total - mapped
-
-    unmapped_actions = Counter(r.action_raw for r in all_rows if r.action_canonical == "unmapped" and r.action_raw)
-
-    by_match = defaultdict(int)
-    for r in all_rows:
-        by_match[r.match_id or "unknown_match"] += 1
-
-    return {
-        "generated_at_utc": datetime.utcnow().isoformat(timespec="seconds") + "Z",
-        "total_rows": total,
-        "mapped_rows": mapped,
-        "unmapped_rows": unmapped,
-        "unique_action_raw": len(actions_raw),
-        "unique_action_canonical": len(actions_canon),
-        "top_action_raw": actions_raw.most_common(25),
-        "top_action_canonical": actions_canon.most_common(25),
-        "category_counts": categories.most_common(),
-        "top_unmapped_action_raw": unmapped_actions.most_common(50),
-        "rows_per_match_top": Counter(by_match).most_common(20),
+# -------------------------
+# Summary accumulator (streaming, mergeable across files / workers)
+# -------------------------
+
+_COUNTER_KEYS = ("actions_raw", "actions_canon", "categories", "unmapped_actions", "by_match")
+
+
+class ClipSummaryAccumulator:
+    """
+    Streaming state behind clips_summary.json: O(distinct actions + matches) memory.
+
+    add() consumes one ClipRow; merge() appends another accumulator's rows (as if they
+    came after this one's). Counter keys keep first-occurrence order, so merging per-file
+    accumulators in input file order reproduces the single-pass most_common() tie order
+    and therefore the exact same summary.
+    """
+
+    __slots__ = ("total", "mapped") + _COUNTER_KEYS
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.mapped = 0
+        self.actions_raw: Dict[str, int] = {}
+        self.actions_canon: Dict[str, int] = {}
+        self.categories: Dict[str, int] = {}
+        self.unmapped_actions: Dict[str, int] = {}
+        self.by_match: Dict[str, int] = {}
+
+    def add(self, r: ClipRow) -> None:
+        self.total += 1
+        if r.action_raw:
+            self.actions_raw[r.action_raw] = self.actions_raw.get(r.action_raw, 0) + 1
+        if r.action_canonical:
+            self.actions_canon[r.action_canonical] = self.actions_canon.get(r.action_canonical, 0) + 1
+            if r.action_canonical != "unmapped":
+                self.mapped += 1
+        if r.action_category:
+            self.categories[r.action_category] = self.categories.get(r.action_category, 0) + 1
+        if r.action_canonical == "unmapped" and r.action_raw:
+            self.unmapped_actions[r.action_raw] = self.unmapped_actions.get(r.action_raw, 0) + 1
+        m = r.match_id or "unknown_match"
+        self.by_match[m] = self.by_match.get(m, 0) + 1
+
+    def add_rows(self, rows: Iterable[ClipRow]) -> "ClipSummaryAccumulator":
+        for r in rows:
+            self.add(r)
+        return self
+
+    def merge(self, other: "ClipSummaryAccumulator") -> "ClipSummaryAccumulator":
+        self.total += other.total
+        self.mapped += other.mapped
+        for k in _COUNTER_KEYS:
+            mine: Dict[str, int] = getattr(self, k)
+            for key, n in getattr(other, k).items():
+                mine[key] = mine.get(key, 0) + n
+        return self
+
+    # JSON-friendly partial counters (manifest / worker transport)
+    def to_counters(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"total": self.total, "mapped": self.mapped}
+        for k in _COUNTER_KEYS:
+            out[k] = dict(getattr(self, k))
+        return out
+
+    @classmethod
+    def from_counters(cls, c: Dict[str, Any]) -> "ClipSummaryAccumulator":
+        acc = cls()
+        acc.total = int(c["total"])
+        acc.mapped = int(c["mapped"])
+        for k in _COUNTER_KEYS:
+            setattr(acc, k, dict(c[k]))
+        return acc
+
+    def summary(self) -> Dict:
+        actions_raw = Counter(self.actions_raw)
+        actions_canon = Counter(self.actions_canon)
+        categories = Counter(self.categories)
+        unmapped_actions = Counter(self.unmapped_actions)
+        total = self.total
+        mapped = self.mapped
+        unmapped = total - mapped
+
+        return {
+            "generated_at_utc": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "total_rows": total,
+            "mapped_rows": mapped,
+            "unmapped_rows": unmapped,
+            "unique_action_raw": len(actions_raw),
+            "unique_action_canonical": len(actions_canon),
+            "top_action_raw": actions_raw.most_common(25),
+            "top_action_canonical": actions_canon.most_common(25),
+            "category_counts": categories.most_common(),
+            "top_unmapped_action_raw": unmapped_actions.most_common(50),
+            "rows_per_match_top": Counter(self.by_match).most_common(20),
+        }
+
+
+def summary_counters(rows: Iterable[ClipRow]) -> Dict[str, Any]:
+    """JSON-friendly partial counters for a set of rows (see ClipSummaryAccumulator)."""
+    return ClipSummaryAccumulator().add_rows(rows).to_counters()
+
+
+def build_summary(all_rows: Iterable[ClipRow]) -> Dict:
+    """Single streaming pass; all_rows may be any iterable (e.g. a generator over files)."""
+    return ClipSummaryAccumulator().add_rows(all_rows).summary()
+
+
+# -------------------------
+# File ingestion (serial or process pool), streamed to clips.jsonl
+# -------------------------
+
+_WORKER_MAPS: Optional[Tuple[Dict[str, str], Dict[str, str]]] = None
+_WORKER_CANON: Optional[ActionCanonicalizer] = None
+_WORKER_COLUMNAR = False
+_WORKER_DIGEST = True
+
+
+def _init_ingest_worker(
+    signal_map: Dict[str, str], alias_map: Dict[str, str], columnar: bool = False, digest: bool = True
+) -> None:
+    # One compiled canonicalizer per process; its memo is shared by every file it parses.
+    global _WORKER_MAPS, _WORKER_CANON, _WORKER_COLUMNAR, _WORKER_DIGEST
+    _WORKER_MAPS = (signal_map, alias_map)
+    _WORKER_CANON = ActionCanonicalizer(signal_map, alias_map)
+    _WORKER_COLUMNAR = columnar
+    _WORKER_DIGEST = digest
+
+
+def _canon_counts() -> Tuple[int, int]:
+    info = _WORKER_CANON.resolve.cache_info() if _WORKER_CANON is not None else None
+    return (info.hits, info.misses) if info else (0, 0)
+
+
+def _ingest_file(file_path: str) -> Tuple[str, Dict[str, Any], str, Optional[Dict[str, Any]], Tuple[int, int]]:
+    """
+    Worker task: parse one file -> (jsonl text, partial summary counters, content sha256
+    ("" unless digests are on), column chunk or None, canonicalizer (hits, misses) for this file).
+    """
+    assert _WORKER_MAPS is not None, "worker not initialised"
+    fp = Path(file_path)
+    lines: List[str] = []
+    acc = ClipSummaryAccumulator()
+    cols = None
+    if _WORKER_COLUMNAR:
+        from .clip_columns import ClipColumnBuilder
+
+        cols = ClipColumnBuilder()
+    hits0, misses0 = _canon_counts()
+    try:
+        for row in iter_csv_rows(fp, *_WORKER_MAPS, canon=_WORKER_CANON):
+            lines.append(_jsonl_line(row))
+            acc.add(row)
+            if cols is not None:
+                cols.add(row)
+        text, counters = "".join(lines), acc.to_counters()
+        chunk = cols.to_chunk() if cols is not None else None
+    except Exception as e:
+        # Whole file (rows and column chunk) replaced by its error row (never silently skipped).
+        text, counters, _, chunk = _error_result(fp, e, _WORKER_COLUMNAR)
+    digest = ""
+    if _WORKER_DIGEST:
+        try:
+            digest = file_sha256(fp)
+        except OSError:
+            pass
+    hits1, misses1 = _canon_counts()
+    return text, counters, digest, chunk, (hits1 - hits0, misses1 - misses0)
+
+
+def _error_result(fp: Path, exc: BaseException, columnar: bool) -> Tuple[str, Dict[str, Any], str, Optional[Dict[str, Any]]]:
+    row = error_row(fp, exc)
+    chunk = None
+    if columnar:
+        from .clip_columns import ClipColumnBuilder
+
+        cols = ClipColumnBuilder()
+        cols.add(row)
+        chunk = cols.to_chunk()
+    return _jsonl_line(row), summary_counters([row]), "", chunk
+
+
+def parse_files(
+    csv_files: List[Path],
+    signal_map: Dict[str, str],
+    alias_map: Dict[str, str],
+    workers: int = 1,
+    canon_stats: Optional[Dict[str, int]] = None,
+    columnar: bool = False,
+    digest: bool = True,
+) -> Iterator[Tuple[Path, str, Dict[str, Any], str, Optional[Dict[str, Any]]]]:
+    """
+    Yield (file, jsonl text, partial counters, sha256, column chunk) per file, in input
+    order (column chunk is None unless columnar=True; sha256 is "" unless digest=True,
+    only the manifest needs it).
+
+    workers > 1 parses in a process pool; a file is yielded as soon as it and all
+    earlier files are done. A corrupt file yields its __INGEST_ERROR__ row; a crashed
+    worker is treated the same. canon_stats (if given) collects canonicalizer
+    memo hits / misses over all workers.
+    """
+    stats = canon_stats if canon_stats is not None else {}
+    stats.setdefault("hits", 0)
+    stats.setdefault("misses", 0)
+
+    if workers <= 1 or len(csv_files) <= 1:
+        _init_ingest_worker(signal_map, alias_map, columnar, digest)
+        for fp in csv_files:
+            text, part, digest, chunk, (hits, misses) = _ingest_file(str(fp))
+            stats["hits"] += hits
+            stats["misses"] += misses
+            yield fp, text, part, digest, chunk
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_ingest_worker, initargs=(signal_map, alias_map, columnar, digest)
+    ) as pool:
+        futures = [pool.submit(_ingest_file, str(fp)) for fp in csv_files]
+        for fp, fut in zip(csv_files, futures):
+            try:
+                text, part, digest, chunk, (hits, misses) = fut.result()
+                stats["hits"] += hits
+                stats["misses"] += misses
+            except Exception as e:
+                text, part, digest, chunk = _error_result(fp, e, columnar)
+            yield fp, text, part, digest, chunk
+
+
+def _remove_columns(out_dir: Path) -> None:
+    # Same as clip_columns.remove_columns, without importing numpy for a plain jsonl run.
+    d = Path(out_dir) / COLUMNS_DIR
+    if d.exists():
+        shutil.rmtree(d)
+
+
+def ingest_files(
+    csv_files: List[Path],
+    signal_map: Dict[str, str],
+    alias_map: Dict[str, str],
+    clips_path: Path,
+    workers: int = 1,
+    canon_stats: Optional[Dict[str, int]] = None,
+    columnar: bool = False,
+) -> ClipSummaryAccumulator:
+    """
+    Parse csv_files and stream their rows to clips_path; returns the merged summary state.
+    Output is identical for any worker count (rows and counters merged in input order).
+    columnar=True also writes clips_columns/ next to clips_path (see clip_columns).
+    """
+    clips_path.parent.mkdir(parents=True, exist_ok=True)
+    acc = ClipSummaryAccumulator()
+    writer = None
+    if columnar:
+        from .clip_columns import ClipColumnsWriter
+
+        writer = ClipColumnsWriter(clips_path.parent)
+
+    try:
+        with clips_path.open("w", encoding="utf-8") as out:
+            for _, text, part, _, chunk in parse_files(
+                csv_files, signal_map, alias_map, workers, canon_stats, columnar, digest=False
+            ):
+                out.write(text)
+                acc.merge(ClipSummaryAccumulator.from_counters(part))
+                if writer is not None:
+                    writer.append(chunk)
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    if writer is not None:
+        writer.close()
+    else:
+        _remove_columns(clips_path.parent)
+
+    return acc
+
+
+def ingest_incremental(
+    csv_files: List[Path],
+    signal_map: Dict[str, str],
+    alias_map: Dict[str, str],
+    out_dir: Path,
+    mapping_versions: Dict[str, str],
+    workers: int = 1,
+    full: bool = False,
+    canon_stats: Optional[Dict[str, int]] = None,
+    columnar: bool = False,
+) -> Tuple[ClipSummaryAccumulator, Dict[str, Any]]:
+    """
+    Manifest-driven ingest: only new / changed files are parsed.
+
+    Each file's rows are kept as a jsonl part (out_dir/parts) and its partial counters
+    in the manifest; clips.jsonl and the summary are rebuilt from those in input order,
+    so the output equals a full run. Deleted files lose their rows. A change in the
+    mapping files (or full=True) invalidates everything.
+    columnar=True also keeps a column chunk per file and rebuilds clips_columns/.
+    Returns (merged summary state, run stats).
+    """
+    clips_path = out_dir / "clips.jsonl"
+    manifest = ClipManifest.load(out_dir)
+    reset = full or not manifest.compatible(mapping_versions)
+    if reset:
+        manifest.reset(mapping_versions)
+
+    keys = [manifest_key(fp) for fp in csv_files]
+    stale: List[Path] = []
+    reused = 0
+    for fp, key in zip(csv_files, keys):
+        if manifest.is_current(key, fp) and (not columnar or manifest.has_columns(key)):
+            reused += 1
+        else:
+            stale.append(fp)
+
+    deleted = manifest.prune(set(keys))
+
+    for fp, text, part, digest, chunk in parse_files(stale, signal_map, alias_map, workers, canon_stats, columnar):
+        manifest.store(manifest_key(fp), fp, text, part, digest, chunk)
+
+    changed = bool(stale or deleted or reset)
+    expected_size = sum(manifest.files[k]["part_bytes"] for k in keys)
+    if changed or not clips_path.exists() or clips_path.stat().st_size != expected_size:
+        manifest.concat_parts(keys, clips_path)
+    if columnar and (changed or not manifest.columns_current(sum(manifest.files[k]["rows"] for k in keys))):
+        from .clip_columns import write_columns
+
+        write_columns(out_dir, (manifest.load_columns(k) for k in keys))
+    elif not columnar and changed:
+        _remove_columns(out_dir)
+
+    acc = ClipSummaryAccumulator()
+    for k in keys:
+        acc.merge(ClipSummaryAccumulator.from_counters(manifest.files[k]["counters"]))
+    manifest.save()
+
+    stats = {
+        "files_total": len(csv_files),
+        "files_parsed": len(stale),
+        "files_reused": reused,
+        "files_deleted": len(deleted),
+        "full_rebuild": reset,
     }
+    return acc, stats
 
 
 def main() -> int:
@@ -208,6 +578,10 @@ def main() -> int:
     ap.add_argument("--sample-dir", required=True)
     ap.add_argument("--out-dir", default="engine/ingest/out")
     ap.add_argument("--repo-root", default=".")
+    ap.add_argument("--workers", type=int, default=1, help="Parse files in a process pool (0 = CPU count)")
+    ap.add_argument("--full", action="store_true", help="Ignore the manifest and re-parse every file")
+    ap.add_argument("--no-manifest", action="store_true", help="Plain one-shot ingest (no manifest / parts cache)")
+    ap.add_argument("--columnar", action="store_true", help="Also write memory-mappable clips_columns/ next to clips.jsonl")
     args = ap.parse_args()
 
     sample_dir = Path(args.sample_dir)
@@ -219,37 +593,33 @@ def main() -> int:
 
     signal_map, alias_map = load_action_mappings(repo_root)
 
-    all_rows: List[ClipRow] = []
     csv_files = list(iter_csv_files(sample_dir))
 
-    for fp in csv_files:
-        try:
-            all_rows.extend(parse_csv_file(fp, signal_map, alias_map))
-        except Exception as e:
-            all_rows.append(
-                ClipRow(
-                    source_file=str(fp.as_posix()),
-                    row_id=None,
-                    match_id=f"{fp.parent.name}/{fp.stem}",
-                    start_s=None,
-                    end_s=None,
-                    half=None,
-                    team_id=None,
-                    player_id=None,
-                    code_raw="",
-                    action_raw=f"__INGEST_ERROR__:{type(e).__name__}",
-                    action_canonical="unmapped",
-                    action_category="OTHER",
-                    pos_x=None,
-                    pos_y=None,
-                )
-            )
-
     clips_path = out_dir / "clips.jsonl"
     summary_path = out_dir / "clips_summary.json"
 
-    write_jsonl(clips_path, all_rows)
-    summary = build_summary(all_rows)
+    workers = max(1, int(args.workers or os.cpu_count() or 1))
+    canon_stats: Dict[str, int] = {}
+    if args.no_manifest:
+        acc = ingest_files(
+            csv_files, signal_map, alias_map, clips_path, workers=workers, canon_stats=canon_stats, columnar=args.columnar
+        )
+        run_stats: Dict[str, Any] = {}
+    else:
+        versions = mapping_versions(repo_root / "canon" / "mappings", MAPPING_FILES)
+        acc, run_stats = ingest_incremental(
+            csv_files, signal_map, alias_map, out_dir, versions, workers=workers, full=args.full,
+            canon_stats=canon_stats, columnar=args.columnar,
+        )
+    summary = acc.summary()
+    # Memo effectiveness of the compiled canonicalizer for the files parsed in this run.
+    lookups = canon_stats.get("hits", 0) + canon_stats.get("misses", 0)
+    summary["canonicalizer"] = {
+        "lookups": lookups,
+        "hits": canon_stats.get("hits", 0),
+        "misses": canon_stats.get("misses", 0),
+        "hit_rate": round(canon_stats.get("hits", 0) / lookups, 6) if lookups else None,
+    }
     summary["input_csv_files"] = [str(p.as_posix()) for p in csv_files]
     summary["mapping_signal_mappings_size"] = len(signal_map)
     summary["mapping_tr_action_aliases_size"] = len(alias_map)
@@ -257,8 +627,12 @@ def main() -> int:
     summary_path.parent.mkdir(parents=True, exist_ok=True)
     summary_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
 
-    print(json.dumps({"clips_jsonl": str(clips_path), "summary_json": str(summary_path), "total_rows": len(all_rows)}, ensure_ascii=False))
-    return 0 if len(all_rows) > 0 else 2
+    total = acc.total
+    out = {"clips_jsonl": str(clips_path), "summary_json": str(summary_path), "total_rows": total}
+    if args.columnar:
+        out["clips_columns"] = str(out_dir / COLUMNS_DIR)
+    print(json.dumps({**out, **run_stats}, ensure_ascii=False))
+    return 0 if total > 0 else 2
 
 
 if __name__ == "__main__":
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .event_batch import EventBatch
+from .metric_engine import TIMESERIES_STRIDE_S, TIMESERIES_WINDOWS_S
+from .master_orchestrator import EngineResult, MasterOrchestrator
+from .provider.sportsbase import to_canonical_events
+
+
+@dataclass
+class LiveUpdate:
+    """Result of one appended chunk (the running match state after it)."""
+
+    features: Dict[str, Any]
+    changed: List[str]
+    claims: List[Dict[str, Any]]
+    plotspecs: List[Dict[str, Any]]
+    validation: Dict[str, Any]
+    events_total: int
+    chunk_rows: int
+    match_clock_s: Optional[float]
+    latency_ms: float
+    registry_report: Dict[str, Any] = field(default_factory=dict)
+
+
+class LiveMatchSession:
+    """
+    Incremental (live) match mode on top of MasterOrchestrator.
+
+    Each append(chunk):
+      - maps + SOT-validates only the chunk
+      - adds the chunk's counters into per-team_id accumulators (MetricEngine.counter_table)
+      - re-derives features from the accumulators (O(teams x metrics), not O(match))
+      - re-verifies only the claims affected by changed feature values (PopperGate.affected)
+        and merges them, with their PlotSpecs, into the previous state by metric key
+
+    Team role follows MasterOrchestrator: the team_id with most events so far is "team",
+    everything else is "opponent". Results after the last chunk equal orchestrator.run()
+    on the concatenated chunks for the metrics listed in MetricEngine.FUSED_METRICS.
+    Other registry metrics need the full event history and are reported as BLOCKED.
+    timeseries() gives the sliding-window series (MetricEngine.compute_timeseries) from
+    compact per-event codes kept for every chunk.
+    """
+
+    def __init__(
+        self,
+        orchestrator: Optional[MasterOrchestrator] = None,
+        phase: str = "tactical",
+        context: Optional[Dict[str, Any]] = None,
+        scale_0_100: Optional[bool] = None,
+    ) -> None:
+        self.orch = orchestrator or MasterOrchestrator()
+        self.phase = phase
+        self.context = context or {}
+
+        self.registry, self.registry_report = self.orch.registry_gate.load_registry_dir(self.orch.registry_root / phase)
+
+        # Accumulators
+        self._team_index: Dict[Any, int] = {}            # raw team_id -> row in _table
+        self._table = np.zeros((1, 4, 2), dtype=np.int64)  # last row = missing team_id
+        self._clock_s: Optional[float] = None      # max timestamp_s so far
+        self._clock_min_s: Optional[float] = None  # min timestamp_s (pressing intensity time base)
+        self._events_total = 0
+        # Per chunk (timestamp_s, team row, type class, final third) for timeseries()
+        self._series_chunks: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+        # None -> decided by the first chunk with coordinates; True/False pins it up front
+        self._scale_0_100: Optional[bool] = scale_0_100
+        self._mapping_used: Dict[str, Any] = {}
+
+        # SOT aggregate (mergeable counters; report equals validate() on all rows)
+        self._sot_counts: Optional[Dict[str, Any]] = None
+        self._sot_issue_counts: Dict[str, int] = {}
+
+        # Last emitted state
+        self.features: Dict[str, Any] = {}
+        self.claims: List[Dict[str, Any]] = []
+        self.plotspecs: List[Dict[str, Any]] = []
+        # Per-metric claim / plotspecs, merged into claims / plotspecs in registry order
+        self._claims_by_key: Dict[str, Dict[str, Any]] = {}
+        self._specs_by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._stale: set = set()  # changed since the last verify (append(verify=False))
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    def append(self, chunk_df: pd.DataFrame, verify: bool = True) -> LiveUpdate:
+        """
+        verify=False skips PopperGate / PlotSpecFactory for this chunk (bulk streaming
+        ingest only needs them once, after the last chunk; see result()).
+        """
+        t0 = time.perf_counter()
+
+        canonical = self.map_chunk(chunk_df)
+        self._merge_sot(self.orch.sot_gate.count(canonical))
+
+        if len(canonical):
+            self._accumulate(canonical)
+
+        features = self._features()
+        changed = [k for k, v in features.items() if k not in self.features or self.features[k] != v]
+        self._stale.update(changed)
+        if verify:
+            self._refresh_claims(features)
+        self.features = features
+
+        return LiveUpdate(
+            features=dict(features),
+            changed=changed,
+            claims=self.claims,
+            plotspecs=self.plotspecs,
+            validation=self.validation_report(),
+            events_total=self._events_total,
+            chunk_rows=int(len(canonical)),
+            match_clock_s=self._clock_s,
+            latency_ms=round((time.perf_counter() - t0) * 1000.0, 3),
+            registry_report=self.registry_report,
+        )
+
+    def map_chunk(self, chunk_df: pd.DataFrame) -> pd.DataFrame:
+        """Provider-map one chunk with the session's pinned coordinate scale."""
+        mapped = to_canonical_events(chunk_df, scale_0_100=self._scale_0_100)
+        if self._scale_0_100 is None and mapped.canonical_df["x"].notna().any():
+            self._scale_0_100 = mapped.scaled_0_100
+        if not self._mapping_used:
+            self._mapping_used = mapped.mapping_used
+        return mapped.canonical_df
+
+    def validation_report(self) -> Dict[str, Any]:
+        """
+        SOT report over every row appended so far (same as SOTValidator.validate on the
+        concatenated chunks), plus issue_chunk_counts: chunks that raised each issue code.
+        """
+        sot = self.orch.sot_gate
+        report = sot.report_from_counts(self._sot_counts or sot.count(pd.DataFrame()))
+        report["issue_chunk_counts"] = dict(self._sot_issue_counts)
+        return report
+
+    def timeseries(
+        self,
+        windows_s: Sequence[float] = TIMESERIES_WINDOWS_S,
+        stride_s: float = TIMESERIES_STRIDE_S,
+        start_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Sliding-window series over every event appended so far; equals
+        MetricEngine.compute_timeseries on the concatenated chunks (team role as decided now).
+        """
+        engine = self.orch.metric_engine
+        if not self._series_chunks:
+            return {"status": "BLOCKED", "reason": "NO_TIMESTAMPS"}
+        clock, group, cls, final_third = (np.concatenate(a) for a in zip(*self._series_chunks))
+        row = self._team_row()
+        role = np.zeros(len(group), dtype=np.int64) if row is None else np.where(group == row, 0, 1)
+        return engine.timeseries_from_codes(
+            clock, role, cls.astype(np.int64), final_third.astype(np.int64), windows_s, stride_s, start_s
+        )
+
+    def result(self, preview: Optional[pd.DataFrame] = None) -> EngineResult:
+        """Current session state as an EngineResult (claims re-verified once, here)."""
+        features = self._features()
+        claims = self.orch.popper_gate.verify(features=features, registry=self.registry)
+        plotspecs = self.orch.plotspec_factory.generate(claims=claims)
+
+        val_report = self.validation_report()
+        val_report.pop("issue_chunk_counts")
+        val_report["provider_mapping_used"] = self._mapping_used
+
+        fused = self.orch.metric_engine.FUSED_METRICS
+        return EngineResult(
+            validation_report=val_report,
+            registry_report=self.registry_report,
+            registry_used={
+                "phase": self.phase,
+                "dir": str(self.orch.registry_root / self.phase),
+                "metrics": list(self.registry.keys()),
+                "fused_metrics": [k for k in self.registry if k in fused],
+            },
+            features=features,
+            claims=claims,
+            plotspecs=plotspecs,
+            narrative=self.orch._narrative_v1(claims=claims, registry_report=self.registry_report, val_report=val_report),
+            canonical_events_preview=preview if preview is not None else pd.DataFrame(),
+            timeseries=self.timeseries() if self.orch.timeseries else {},
+        )
+
+    # -------------------------
+    # Internals
+    # -------------------------
+
+    def _accumulate(self, canonical: pd.DataFrame) -> None:
+        batch = EventBatch.from_canonical_df(canonical)
+
+        codes, uniques = pd.factorize(canonical["team_id"])
+        remap = np.empty(len(uniques) + 1, dtype=np.int64)
+        remap[-1] = -1
+        for i, u in enumerate(uniques):
+            if u not in self._team_index:
+                self._team_index[u] = len(self._team_index)
+            remap[i] = self._team_index[u]
+        group = remap[codes]
+
+        n = len(self._team_index)
+        if self._table.shape[0] < n + 1:
+            grown = np.zeros((n + 1, 4, 2), dtype=np.int64)
+            grown[: self._table.shape[0] - 1] = self._table[:-1]
+            grown[-1] = self._table[-1]
+            self._table = grown
+
+        engine = self.orch.metric_engine
+        self._table += engine.counter_table(batch, group, n)
+        self._events_total += len(batch)
+        cls, final_third = engine._class_codes(batch)
+        self._series_chunks.append(
+            (batch.timestamp_s.astype(np.float64), group.astype(np.int32), cls.astype(np.int8), final_third.astype(np.int8))
+        )
+
+        if np.isfinite(batch.timestamp_s).any():
+            mx = float(np.nanmax(batch.timestamp_s))
+            mn = float(np.nanmin(batch.timestamp_s))
+            self._clock_s = mx if self._clock_s is None else max(self._clock_s, mx)
+            self._clock_min_s = mn if self._clock_min_s is None else min(self._clock_min_s, mn)
+
+    def _refresh_claims(self, features: Dict[str, Any]) -> None:
+        """
+        Re-verify only claims affected by changed features (PopperGate.affected: the
+        changed metrics plus claims that read them) and merge them by metric key.
+        """
+        gate = self.orch.popper_gate
+        keys = list(self.registry) if not self._claims_by_key else gate.affected(self._stale, self.registry)
+        self._stale.clear()
+        if not keys:
+            return
+        for claim in gate.verify(features=features, registry=self.registry, keys=keys):
+            self._claims_by_key[claim["metric"]] = claim
+            self._specs_by_key[claim["metric"]] = self.orch.plotspec_factory.generate(claims=[claim])
+        self.claims = [self._claims_by_key[k] for k in self.registry if k in self._claims_by_key]
+        self.plotspecs = [spec for k in self.registry for spec in self._specs_by_key.get(k, [])]
+
+    def _team_row(self) -> Optional[int]:
+        """Row of the team_id with most events (ties -> smallest id, as Series.mode)."""
+        if not self._team_index:
+            return None
+        totals = self._table[:-1].sum(axis=(1, 2))
+        best = totals.max()
+        tied = [tid for tid, i in self._team_index.items() if totals[i] == best]
+        try:
+            tid = sorted(tied)[0]
+        except TypeError:
+            tid = sorted(tied, key=str)[0]
+        return self._team_index[tid]
+
+    def _features(self) -> Dict[str, Any]:
+        engine = self.orch.metric_engine
+        row = self._team_row()
+        if row is None:
+            team_row = self._table.sum(axis=0)
+            opp_row = np.zeros((4, 2), dtype=np.int64)
+        else:
+            team_row = self._table[row]
+            opp_row = self._table.sum(axis=0) - team_row
+
+        counters = engine.counters_from_rows(team_row, opp_row, self._clock_min_s, self._clock_s)
+        values = engine.finish(list(self.registry.keys()), counters)
+
+        features: Dict[str, Any] = {}
+        for metric_key, meta in self.registry.items():
+            if metric_key in values:
+                features[metric_key] = values[metric_key]
+                continue
+            implemented = callable(getattr(engine, f"compute_{metric_key}", None))
+            features[metric_key] = {
+                "status": "BLOCKED",
+                "reason": "NOT_INCREMENTAL" if implemented else "NOT_IMPLEMENTED",
+                "metric_name": meta.get("metric_name", metric_key.upper()),
+                "expected_function": f"compute_{metric_key}",
+                "_key": metric_key,
+                "_file": meta.get("_file"),
+            }
+        return features
+
+    def _merge_sot(self, counts: Dict[str, Any]) -> None:
+        sot = self.orch.sot_gate
+        for issue in sot.report_from_counts(counts)["issues"]:
+            self._sot_issue_counts[issue["code"]] = self._sot_issue_counts.get(issue["code"], 0) + 1
+        self._sot_counts = sot.merge_counts(self._sot_counts, counts)
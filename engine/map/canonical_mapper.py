@@ -1,30 +1,24 @@
 import yaml
 from collections import defaultdict
 
+from engine.map.mapping_plan import PLAN_CACHE, columns_from_mapping_yaml
+
 def load_mapping(path):
     with open(path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
 
-def map_columns(headers, mapping):
-    col_map = {}
-    missing_required = []
-
-    for col, spec in mapping["columns"].items():
-        found = None
-        for a in spec.get("aliases", []):
-            if a in headers:
-                found = a
-                break
-        if found:
-            col_map[found] = spec["target"]
-        elif spec.get("required"):
-            missing_required.append(col)
+def mapping_plan(headers, mapping):
+    """Memoized plan for (mapping spec, header tuple); see engine.map.mapping_plan."""
+    provider_id = mapping.get("provider_id", "unknown")
+    return PLAN_CACHE.get(provider_id, columns_from_mapping_yaml(mapping), tuple(headers))
 
-    return col_map, missing_required
+def map_columns(headers, mapping):
+    plan = mapping_plan(headers, mapping)
+    return plan.column_map, list(plan.missing_required)
 
 def capability_report(headers, mapping):
     _, missing = map_columns(headers, mapping)
     return {
         "status": "BLOCKED" if missing else "OK",
         "missing_required": missing
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+# Header -> plan compile and PLAN_CACHE: stdlib + yaml only (the canonical mapping CLI
+# runs without numpy / pandas). Applying a plan to a DataFrame lives in plan_apply.
+
+import hashlib
+import json
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import yaml
+
+# "(x / 100.0) * 105.0" -> provider extent, canonical extent
+_TRANSFORM_RE = re.compile(r"\(\s*\w+\s*/\s*([\d.]+)\s*\)\s*\*\s*([\d.]+)")
+
+# (name, target, aliases in priority order, required)
+ColumnSpec = Tuple[str, str, Tuple[str, ...], bool]
+# ((canonical, provider) x extent, (canonical, provider) y extent)
+Scale = Tuple[Tuple[float, float], Tuple[float, float]]
+
+
+def _repo_root() -> Path:
+    # engine/map/mapping_plan.py -> engine/map -> engine -> repo root
+    return Path(__file__).resolve().parents[2]
+
+
+@dataclass(frozen=True)
+class MappingPlan:
+    """
+    Frozen column-mapping plan for one (provider spec, header tuple).
+
+    renames:          (target, source column) for every target found in the headers
+    targets:          full output column order (targets not found become NaN columns)
+    missing_required: spec names that are required but absent from the headers
+    transforms:       (target, transform name) applied by the provider after renaming
+    scale:            ((canonical, provider) x extent, (canonical, provider) y extent);
+                      x_m = x * canonical / provider when the provider scale applies
+    """
+
+    provider_id: str
+    signature: str
+    headers: Tuple[Any, ...]
+    renames: Tuple[Tuple[str, Any], ...]
+    targets: Tuple[str, ...]
+    missing_required: Tuple[str, ...]
+    transforms: Tuple[Tuple[str, str], ...] = ()
+    scale: Scale = ((1.0, 1.0), (1.0, 1.0))
+
+    @property
+    def mapping_used(self) -> Dict[str, Any]:
+        return {tgt: src for tgt, src in self.renames}
+
+    @property
+    def column_map(self) -> Dict[Any, str]:
+        """source column -> target (canonical_mapper.map_columns format)."""
+        return {src: tgt for tgt, src in self.renames}
+
+    def apply(self, df: Any) -> Any:
+        """Select + rename columns (pandas; see plan_apply.apply_plan)."""
+        from engine.map.plan_apply import apply_plan
+
+        return apply_plan(self, df)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "provider_id": self.provider_id,
+            "signature": self.signature,
+            "renames": [list(r) for r in self.renames],
+            "missing_required": list(self.missing_required),
+            "transforms": [list(t) for t in self.transforms],
+            "scale": [list(a) for a in self.scale],
+        }
+
+
+def compile_plan(
+    provider_id: str,
+    columns: Sequence[ColumnSpec],
+    headers: Sequence[Any],
+    transforms: Iterable[Tuple[str, str]] = (),
+    scale: Scale = ((1.0, 1.0), (1.0, 1.0)),
+    signature: str = "",
+) -> MappingPlan:
+    """First alias present in the headers wins (same rule as _pick / map_columns)."""
+    header_set = set(headers)
+    renames: List[Tuple[str, Any]] = []
+    missing: List[str] = []
+    for name, target, aliases, required in columns:
+        found = next((a for a in aliases if a in header_set), None)
+        if found is not None:
+            renames.append((target, found))
+        elif required:
+            missing.append(name)
+
+    targets: List[str] = []
+    for _, target, _, _ in columns:
+        if target not in targets:
+            targets.append(target)
+
+    return MappingPlan(
+        provider_id=provider_id,
+        signature=signature,
+        headers=tuple(headers),
+        renames=tuple(renames),
+        targets=tuple(targets),
+        missing_required=tuple(missing),
+        transforms=tuple(transforms),
+        scale=(tuple(scale[0]), tuple(scale[1])),
+    )
+
+
+class PlanCache:
+    """
+    Memoizes MappingPlans by (provider spec fingerprint, header signature).
+
+    A season of exports with identical headers compiles exactly one plan;
+    stats() reports compiles and reuse counts per plan for monitoring.
+    """
+
+    def __init__(self, max_plans: int = 256) -> None:
+        self.max_plans = max_plans
+        self._plans: Dict[Tuple[str, str, Tuple[Any, ...]], MappingPlan] = {}
+        self._uses: Counter = Counter()
+        self.compiled = 0
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        provider_id: str,
+        columns: Sequence[ColumnSpec],
+        headers: Sequence[Any],
+        transforms: Iterable[Tuple[str, str]] = (),
+        scale: Scale = ((1.0, 1.0), (1.0, 1.0)),
+    ) -> MappingPlan:
+        transforms = tuple(transforms)
+        spec_fp = spec_fingerprint(columns, transforms, scale)
+        key = (provider_id, spec_fp, tuple(headers))
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                sig = hashlib.sha256(json.dumps([provider_id, spec_fp, [str(h) for h in key[2]]]).encode("utf-8")).hexdigest()[:16]
+                plan = compile_plan(provider_id, columns, headers, transforms, scale, signature=sig)
+                if len(self._plans) >= self.max_plans:
+                    oldest = next(iter(self._plans))
+                    self._plans.pop(oldest)
+                self._plans[key] = plan
+                self.compiled += 1
+            self._uses[plan.signature] += 1
+        return plan
+
+    def uses(self, plan: MappingPlan) -> int:
+        return int(self._uses.get(plan.signature, 0))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            plans = list(self._plans.values())
+            total = sum(self._uses.values())
+            return {
+                "plans": len(plans),
+                "compiled": self.compiled,
+                "lookups": total,
+                "reuse": total - self.compiled,
+                "by_plan": [
+                    {
+                        "provider_id": p.provider_id,
+                        "signature": p.signature,
+                        "n_headers": len(p.headers),
+                        "uses": int(self._uses.get(p.signature, 0)),
+                    }
+                    for p in plans
+                ],
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+            self._uses.clear()
+            self.compiled = 0
+
+
+def spec_fingerprint(columns: Sequence[ColumnSpec], transforms: Tuple[Tuple[str, str], ...], scale: Scale) -> str:
+    payload = json.dumps([[list(map(str, c[:2])), list(map(str, c[2])), bool(c[3])] for c in columns] + [list(transforms), [list(a) for a in scale]])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def columns_from_mapping_yaml(mapping: Dict[str, Any]) -> List[ColumnSpec]:
+    """provider_generic_csv.yaml style: columns: {name: {aliases, target, required}}."""
+    out: List[ColumnSpec] = []
+    for name, spec in (mapping.get("columns") or {}).items():
+        out.append((name, spec["target"], tuple(spec.get("aliases", [])), bool(spec.get("required"))))
+    return out
+
+
+def contract_scale(contract_path: Optional[Path] = None) -> Scale:
+    """
+    Coordinate extents from a provider contract's coordinate_system.transform block
+    (SportsBase.yaml: x: "x_m = (x / 100.0) * 105.0" -> x extent (105.0, 100.0)).
+    Falls back to ((105, 100), (68, 100)) when the contract is missing or unparseable.
+    """
+    p = contract_path or (_repo_root() / "canon" / "provider_contracts" / "SportsBase.yaml")
+    try:
+        doc = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+        tr = (doc.get("coordinate_system") or {}).get("transform") or {}
+        out = []
+        for axis in ("x", "y"):
+            m = _TRANSFORM_RE.search(str(tr[axis]))
+            out.append((float(m.group(2)), float(m.group(1))))
+        return (out[0], out[1])
+    except Exception:
+        return ((105.0, 100.0), (68.0, 100.0))
+
+
+# Process-wide plan cache shared by the provider mapping and canonical_mapper.
+PLAN_CACHE = PlanCache()
+
+
+def plan_stats() -> Dict[str, Any]:
+    return PLAN_CACHE.stats()
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from engine.map.mapping_plan import MappingPlan
+
+
+def apply_plan(plan: MappingPlan, df: pd.DataFrame) -> pd.DataFrame:
+    """Select + rename columns in one frame construction; absent targets become NaN."""
+    cols = {tgt: df[src] for tgt, src in plan.renames}
+    for tgt in plan.targets:
+        if tgt not in cols:
+            cols[tgt] = pd.Series(np.nan, index=df.index)
+    return pd.DataFrame(cols, index=df.index)
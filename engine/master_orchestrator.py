@@ -1,24 +1,31 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import Future
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from .event_batch import EventBatch
 from .metric_engine import MetricEngine
 from .popper_gate import PopperGate
 from .plotspec_factory import PlotSpecFactory
+from .event_store import METRIC_COLUMNS, EventStore
 from .registry_gate import RegistryGate
+from .result_cache import ResultCache, hash_frame, hash_obj
 from .sot_validator import SOTValidator
 from .provider.sportsbase import to_canonical_events
 
 
 def _canonical_df_to_events(canonical_df: pd.DataFrame) -> List[Dict[str, Any]]:
     """
-    Convert canonical event DataFrame to MetricEngine event list format.
+    Convert canonical event DataFrame to the legacy MetricEngine event list format.
 
-    MetricEngine expects:
+    Compatibility shim only: the pipeline hands MetricEngine an EventBatch
+    (EventBatch.from_canonical_df), which avoids building one dict per row.
+
+    Legacy format:
       {team: 'team'|'opponent', type: <event_type>, x: float, y: float, timestamp_s: float}
     """
     if canonical_df.empty:
@@ -46,6 +53,12 @@ def _canonical_df_to_events(canonical_df: pd.DataFrame) -> List[Dict[str, Any]]:
     return events
 
 
+def registry_snapshot_dir(cache: ResultCache) -> Path:
+    """Registry snapshot dir for a stage cache: sibling <root>-registry (outside its namespace)."""
+    root = cache.root.resolve()
+    return root.with_name(root.name + "-registry")
+
+
 @dataclass
 class EngineResult:
     validation_report: Dict[str, Any]
@@ -56,6 +69,14 @@ class EngineResult:
     plotspecs: List[Dict[str, Any]]
     narrative: str
     canonical_events_preview: pd.DataFrame
+    cache_report: Dict[str, Any] = field(default_factory=dict)
+    stream_report: Dict[str, Any] = field(default_factory=dict)
+    store_report: Dict[str, Any] = field(default_factory=dict)
+    # MasterOrchestrator(timeseries=True): MetricEngine.compute_timeseries over the match
+    timeseries: Dict[str, Any] = field(default_factory=dict)
+    # sot_mode="sampled": resolves to the exact SOT report once background validation ends
+    # (validation_report and narrative are replaced with the exact versions at that point)
+    validation_pending: Optional[Future] = None
 
 
 class MasterOrchestrator:
@@ -75,41 +96,312 @@ class MasterOrchestrator:
         self,
         registry_root: str | Path = "canon/registry",
         provider: str = "sportsbase",
+        fused: bool = True,
+        cache: Optional[ResultCache] = None,
+        event_store: Optional[EventStore] = None,
+        timeseries: bool = False,
     ) -> None:
         self.registry_root = Path(registry_root)
         self.provider = provider
+        # Fused mode: all registry metrics with a fused finisher share one counter pass.
+        self.fused = fused
+        # phase -> (registry, registry_report) loaded once via pin_registry (batch workers)
+        self._pinned_registry: Dict[str, Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]] = {}
+        # Optional content-addressed stage cache (canonical df, SOT report, features, claims)
+        self.cache = cache
+        # Optional columnar store: run() writes validated canonical events once per source;
+        # run_stored() analyses them later without parsing / mapping / validation.
+        self.event_store = event_store
+        # Sliding-window PPDA / pressing intensity / field tilt series (momentum plots) on
+        # EngineResult.timeseries; off by default (scalar claims do not need them).
+        self.timeseries = timeseries
 
         self.sot_gate = SOTValidator(provider_contract=provider)
-        self.registry_gate = RegistryGate()
+        # Compiled registry snapshots; persisted next to (not inside) the stage cache when one
+        # is configured, so cache eviction / clear() never drop them.
+        self.registry_gate = RegistryGate(snapshot_dir=registry_snapshot_dir(cache) if cache else None)
         self.metric_engine = MetricEngine()
         self.popper_gate = PopperGate()
         self.plotspec_factory = PlotSpecFactory()
 
+    def pin_registry(self, phase: str = "tactical") -> None:
+        """
+        Load and validate the registry for a phase once; later run() calls reuse it.
+        Used by long-lived processes (e.g. batch workers) where the YAMLs do not change.
+        """
+        self._pinned_registry[phase] = self.registry_gate.load_registry_dir(self.registry_root / phase)
+
+    def start_live(self, phase: str = "tactical", context: Optional[Dict[str, Any]] = None):
+        """Open an incremental LiveMatchSession (append event chunks, get updated claims)."""
+        from .live_session import LiveMatchSession
+
+        return LiveMatchSession(self, phase=phase, context=context)
+
+    def run_csv_stream(
+        self,
+        source: Any,
+        phase: str = "tactical",
+        context: Optional[Dict[str, Any]] = None,
+        chunk_rows: Optional[int] = None,
+    ) -> EngineResult:
+        """run() over a CSV path / file object read in bounded chunks (see stream_ingest)."""
+        from .stream_ingest import DEFAULT_CHUNK_ROWS, run_csv_stream
+
+        return run_csv_stream(source, self, phase=phase, context=context, chunk_rows=chunk_rows or DEFAULT_CHUNK_ROWS)
+
     def run(
         self,
         input_df: pd.DataFrame,
         phase: str = "tactical",
         context: Optional[Dict[str, Any]] = None,
+        sot_mode: str = "full",
     ) -> EngineResult:
+        """
+        sot_mode: "full" (exact SOT report) or "sampled" (stratified-sample report now,
+        exact report later via EngineResult.validation_pending; features always use all rows).
+        """
         context = context or {}
+        stages: Dict[str, str] = {}
 
         # 1) Provider mapping -> canonical schema
-        mapped = to_canonical_events(input_df)
-        canonical_df = mapped.canonical_df
+        canon_key = self._stage_key(hash_frame(input_df), self.provider) if self.cache else ""
 
-        # 2) SOT gate (no silent drops)
-        val_report, canonical_df = self.sot_gate.validate(canonical_df)
-        val_report["provider_mapping_used"] = mapped.mapping_used
+        def _map() -> Tuple[pd.DataFrame, Dict[str, str]]:
+            mapped = to_canonical_events(input_df)
+            return mapped.canonical_df, mapped.mapping_used
 
+        canonical_df, mapping_used = self._stage("canonical", canon_key, _map, stages)
+
+        # 2) SOT gate (no silent drops)
+        sot_key = self._stage_key(canon_key, self.sot_gate.provider_contract) if self.cache else ""
+        sampled = False
+        if sot_mode == "sampled" and not (self.cache and self.cache.get("sot", sot_key)[0]):
+            val_report = self.sot_gate.validate_sampled(canonical_df)[0]
+            sampled = val_report.get("mode") == "SAMPLED"
+            if sampled:
+                stages["sot"] = "SAMPLED"
+            elif self.cache is not None:
+                self.cache.put("sot", sot_key, val_report)
+        else:
+            val_report = self._stage("sot", sot_key, lambda: self.sot_gate.validate(canonical_df)[0], stages)
+        val_report["provider_mapping_used"] = mapping_used
+
+        store_report: Dict[str, Any] = {}
+        if sampled:
+            if self.event_store is not None:
+                store_report = {"status": "DEFERRED", "root": str(self.event_store.root)}
+        elif self.event_store is not None:
+            store_report = self._store_write(canonical_df, val_report, mapping_used, input_df, canon_key, context)
+
+        result = self._analyse(canonical_df, val_report, mapping_used, canon_key, phase, stages)
+        result.store_report = store_report
+        if sampled:
+            # Started last so it does not compete with the foreground stages.
+            result.validation_pending = self._after_full_sot(
+                self.sot_gate.validate_background(canonical_df),
+                result, canonical_df, mapping_used, input_df, sot_key, canon_key, context,
+            )
+        return result
+
+    def _after_full_sot(
+        self,
+        full: Future,
+        result: EngineResult,
+        canonical_df: pd.DataFrame,
+        mapping_used: Dict[str, str],
+        input_df: pd.DataFrame,
+        sot_key: str,
+        canon_key: str,
+        context: Dict[str, Any],
+    ) -> Future:
+        """
+        Chain cache put + event store write (exact report only) behind the background validation,
+        then swap the exact report and its narrative into result.
+        """
+        out: Future = Future()
+
+        def done(f: Future) -> None:
+            try:
+                report = f.result()
+                if self.cache is not None:
+                    self.cache.put("sot", sot_key, report)
+                report = {**report, "provider_mapping_used": mapping_used}
+                if self.event_store is not None:
+                    self._store_write(canonical_df, report, mapping_used, input_df, canon_key, context)
+                result.validation_report = report
+                result.narrative = self._narrative_v1(
+                    claims=result.claims, registry_report=result.registry_report, val_report=report
+                )
+                out.set_result(report)
+            except Exception as e:
+                out.set_exception(e)
+
+        full.add_done_callback(done)
+        return out
+
+    def run_stored(
+        self,
+        match_id: Any,
+        season: Any = None,
+        competition: Any = None,
+        phase: str = "tactical",
+        context: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None,
+    ) -> EngineResult:
+        """
+        Analyse a match from the event store: reads only `columns` (default METRIC_COLUMNS)
+        of that match and reuses the SOT report stored at write time.
+        """
+        if self.event_store is None:
+            raise ValueError("run_stored() needs MasterOrchestrator(event_store=EventStore(...))")
+
+        meta = self.event_store.read_meta(match_id, season, competition)
+        canonical_df = self.event_store.read_match(
+            match_id, season, competition, columns=list(columns or METRIC_COLUMNS)
+        )
+        val_report = dict(meta.get("validation_report") or {})
+        mapping_used = meta.get("mapping_used") or {}
+
+        stages: Dict[str, str] = {}
+        canon_key = self._stage_key(meta.get("content_hash", ""), self.provider) if self.cache else ""
+        result = self._analyse(canonical_df, val_report, mapping_used, canon_key, phase, stages)
+        result.store_report = {
+            "source": "event_store",
+            "dir": str(self.event_store.partition_dir(match_id, season, competition)),
+            "columns": list(canonical_df.columns),
+            "rows": int(len(canonical_df)),
+            "content_hash": meta.get("content_hash"),
+        }
+        return result
+
+    def _store_write(
+        self,
+        canonical_df: pd.DataFrame,
+        val_report: Dict[str, Any],
+        mapping_used: Dict[str, str],
+        input_df: pd.DataFrame,
+        canon_key: str,
+        context: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        season = context.get("season")
+        competition = context.get("competition") or context.get("league")
+        source_hash = canon_key or self._stage_key(hash_frame(input_df), self.provider)
+        try:
+            written = self.event_store.write(
+                canonical_df,
+                val_report,
+                mapping_used,
+                season=season,
+                competition=competition,
+                source_hash=source_hash,
+                validate_fn=lambda g: self.sot_gate.validate(g)[0],
+            )
+            return {"status": "OK", "root": str(self.event_store.root), "matches": written}
+        except Exception as e:
+            # The store is an optimisation: the analysis itself must not fail because of it.
+            return {"status": "ERROR", "root": str(self.event_store.root), "error": f"{type(e).__name__}: {e}"}
+
+    def _analyse(
+        self,
+        canonical_df: pd.DataFrame,
+        val_report: Dict[str, Any],
+        mapping_used: Dict[str, str],
+        canon_key: str,
+        phase: str,
+        stages: Dict[str, str],
+    ) -> EngineResult:
+        """Steps 3-7 of run(): RegistryGate -> metrics -> PopperGate -> PlotSpec -> Narrative."""
         # 3) RegistryGate (contract-first)
         registry_dir = self.registry_root / phase
-        registry, registry_report = self.registry_gate.load_registry_dir(registry_dir)
+        if phase in self._pinned_registry:
+            registry, registry_report = self._pinned_registry[phase]
+        else:
+            registry, registry_report = self.registry_gate.load_registry_dir(registry_dir)
+
+        # 4) Compute metrics implemented in MetricEngine (columnar handoff)
+        registry_hash = registry_report.get("content_hash", "")
+        feat_key = self._stage_key(canon_key, mapping_used, registry_hash, self.fused) if self.cache else ""
+        features, fused_keys = self._stage(
+            "features", feat_key, lambda: self._compute_features(canonical_df, registry), stages
+        )
+
+        # 5) Popper gate (falsifiability & contradictions)
+        claims_key = self._stage_key(feat_key, registry_hash) if self.cache else ""
+        claims = self._stage(
+            "claims", claims_key, lambda: self.popper_gate.verify(features=features, registry=registry), stages
+        )
+
+        # 6) Plot specs (no heavy drawing here)
+        plotspecs = self.plotspec_factory.generate(claims=claims)
+
+        # 7) Narrative (v1: explicit statuses)
+        narrative = self._narrative_v1(claims=claims, registry_report=registry_report, val_report=val_report)
 
-        # 4) Compute metrics implemented in MetricEngine
-        events = _canonical_df_to_events(canonical_df)
+        timeseries: Dict[str, Any] = {}
+        if self.timeseries:
+            timeseries = self.metric_engine.compute_timeseries(EventBatch.from_canonical_df(canonical_df))
+
+        preview = canonical_df.head(25).copy()
+
+        cache_report: Dict[str, Any] = {}
+        if self.cache is not None:
+            cache_report = {"stages": stages, **self.cache.stats()}
+
+        return EngineResult(
+            validation_report=val_report,
+            registry_report=registry_report,
+            registry_used={
+                "phase": phase,
+                "dir": str(registry_dir),
+                "metrics": list(registry.keys()),
+                "fused_metrics": fused_keys,
+            },
+            features=features,
+            claims=claims,
+            plotspecs=plotspecs,
+            narrative=narrative,
+            canonical_events_preview=preview,
+            cache_report=cache_report,
+            timeseries=timeseries,
+        )
+
+    # -------------------------
+    # Stage helpers
+    # -------------------------
+
+    @staticmethod
+    def _stage_key(*parts: Any) -> str:
+        return hash_obj(*parts)
+
+    def _stage(self, stage: str, key: str, fn: Callable[[], Any], stages: Dict[str, str]) -> Any:
+        """Run a pipeline stage through the cache (if configured); records HIT/MISS per stage."""
+        if self.cache is None:
+            return fn()
+        value, hit = self.cache.get_or_compute(stage, key, fn)
+        stages[stage] = "HIT" if hit else "MISS"
+        return value
+
+    def _compute_features(
+        self,
+        canonical_df: pd.DataFrame,
+        registry: Dict[str, Dict[str, Any]],
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        events = EventBatch.from_canonical_df(canonical_df)
+
+        fused_values: Dict[str, Any] = {}
+        if self.fused:
+            try:
+                fused_values = self.metric_engine.compute_fused(events, list(registry.keys()), team="team")
+            except Exception:
+                # Per-metric path below reports the failure explicitly per metric.
+                fused_values = {}
 
         features: Dict[str, Any] = {}
         for metric_key, meta in registry.items():
+            if metric_key in fused_values:
+                features[metric_key] = fused_values[metric_key]
+                continue
+
             compute_fn = getattr(self.metric_engine, f"compute_{metric_key}", None)
 
             if callable(compute_fn):
@@ -133,27 +425,7 @@ class MasterOrchestrator:
                     "_file": meta.get("_file"),
                 }
 
-        # 5) Popper gate (falsifiability & contradictions)
-        claims = self.popper_gate.verify(features=features, registry=registry)
-
-        # 6) Plot specs (no heavy drawing here)
-        plotspecs = self.plotspec_factory.generate(claims=claims)
-
-        # 7) Narrative (v1: explicit statuses)
-        narrative = self._narrative_v1(claims=claims, registry_report=registry_report, val_report=val_report)
-
-        preview = canonical_df.head(25).copy()
-
-        return EngineResult(
-            validation_report=val_report,
-            registry_report=registry_report,
-            registry_used={"phase": phase, "dir": str(registry_dir), "metrics": list(registry.keys())},
-            features=features,
-            claims=claims,
-            plotspecs=plotspecs,
-            narrative=narrative,
-            canonical_events_preview=preview,
-        )
+        return features, list(fused_values.keys())
 
     @staticmethod
     def _narrative_v1(
@@ -165,7 +437,11 @@ class MasterOrchestrator:
         other = [c for c in claims if c.get("status") != "VERIFIED"]
 
         lines: List[str] = []
-        lines.append(f"SOT: {val_report.get('status', 'UNKNOWN')} | REGISTRY: {registry_report.get('status', 'UNKNOWN')}")
+        sot = val_report.get("status", "UNKNOWN")
+        if val_report.get("mode") == "SAMPLED":
+            est = val_report.get("provisional_status")
+            sot = f"{sot} (SAMPLED, est. {est})" if est else f"{sot} (SAMPLED)"
+        lines.append(f"SOT: {sot} | REGISTRY: {registry_report.get('status', 'UNKNOWN')}")
         if registry_report.get("status") != "HEALTHY":
             lines.append(f"REGISTRY_ISSUES: {len(registry_report.get('issues', []))}")
 
@@ -1,6 +1,31 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .event_batch import EventBatch
+from .metrics.temporal_bins import rolling_counts
+
+Events = Union[EventBatch, List[Dict[str, Any]]]
+
+DEF_ACTION_TYPES = ("tackle", "interception", "block", "challenge", "foul")
+PRESS_ACTION_TYPES = DEF_ACTION_TYPES + ("pressure",)
+
+# Default sliding windows for the time-series mode (seconds)
+TIMESERIES_WINDOWS_S = (300.0, 600.0, 900.0)
+TIMESERIES_STRIDE_S = 60.0
+
+_LAG_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)\s*min\s*$")
+
+
+def lag_window_s(lag_window: str) -> Optional[Tuple[float, float]]:
+    """metric_graph.yaml lag_window ("0-10min") -> (0.0, 600.0); None for "match" / unparseable."""
+    m = _LAG_RE.match(str(lag_window))
+    if not m:
+        return None
+    return float(m.group(1)) * 60.0, float(m.group(2)) * 60.0
 
 
 class MetricEngine:
@@ -10,37 +35,164 @@ class MetricEngine:
     Important:
     - master_orchestrator calls: compute_fn(events, team="team")
     - So every compute_* MUST accept (events, team="team", **kwargs)
+    - events is an EventBatch (columnar, preferred) or a list of event dicts
+      (compatibility shim; converted to an EventBatch once per call).
     - We do NOT silently drop data. If missing -> return None and let PopperGate/SOT handle status.
     """
 
     # -----------------------------
     # Helpers
     # -----------------------------
-    def _team_of(self, e: Dict[str, Any]) -> Optional[str]:
-        t = e.get("team")
-        if t is None:
-            return None
-        return str(t).strip().lower()
+    def _as_batch(self, events: Events) -> EventBatch:
+        if isinstance(events, EventBatch):
+            return events
+        return EventBatch.from_events(events or [])
 
-    def _type_of(self, e: Dict[str, Any]) -> Optional[str]:
-        t = e.get("type")
-        if t is None:
-            return None
-        return str(t).strip().lower()
+    @staticmethod
+    def _roles(team: str) -> Tuple[str, str]:
+        team = str(team).strip().lower()
+        opp = "opponent" if team == "team" else "team"
+        return team, opp
+
+    @staticmethod
+    def _clock(batch: EventBatch) -> Optional[np.ndarray]:
+        """Event clock in seconds: timestamp_s, else the legacy "t" key; None when neither has values."""
+        for clock in (batch.timestamp_s, batch.t):
+            if clock is not None and np.isfinite(clock).any():
+                return clock
+        return None
+
+    def _time_range(self, batch: EventBatch) -> Tuple[Optional[float], Optional[float]]:
+        clock = self._clock(batch)
+        if clock is None:
+            return None, None
+        return float(np.nanmin(clock)), float(np.nanmax(clock))
+
+    def _role_codes(self, batch: EventBatch, team: str) -> np.ndarray:
+        """0 = team, 1 = opponent, -1 = other."""
+        team, opp = self._roles(team)
+        role = np.full(len(batch), -1, dtype=np.int64)
+        role[batch.team_mask(opp)] = 1
+        role[batch.team_mask(team)] = 0
+        return role
 
-    def _x_of(self, e: Dict[str, Any]) -> Optional[float]:
-        x = e.get("x")
-        if x is None:
+    # -----------------------------
+    # Fused kernel
+    # -----------------------------
+    # Type classes used by the counter table (index into the class axis).
+    _CLS_PASS, _CLS_DEF, _CLS_PRESS_ONLY, _CLS_OTHER = 0, 1, 2, 3
+
+    # metric_key -> finisher over the shared counter table
+    FUSED_METRICS = {
+        "ppda": "_finish_ppda",
+        "field_tilt": "_finish_field_tilt",
+        "pressing_intensity": "_finish_pressing_intensity",
+    }
+
+    def counter_table(self, events: Events, group_codes: np.ndarray, n_groups: int) -> np.ndarray:
+        """
+        Counter table of shape (n_groups + 1, 4, 2): (group, type class, final third).
+
+        group_codes assigns every event to a group (e.g. team role or raw team_id);
+        code -1 lands in the last row. One np.bincount over the packed key.
+        """
+        batch = self._as_batch(events)
+        cls, final_third = self._class_codes(batch)
+
+        group = np.where(group_codes < 0, n_groups, group_codes).astype(np.int64)
+        key = (group * 4 + cls) * 2 + final_third
+        return np.bincount(key, minlength=(n_groups + 1) * 4 * 2).reshape(n_groups + 1, 4, 2)
+
+    def _class_codes(self, batch: EventBatch) -> Tuple[np.ndarray, np.ndarray]:
+        """(type class, final third 0/1) per event: the class / zone axes of the counter table."""
+        # type class lookup over the (small) vocabulary; code -1 -> last slot (other)
+        cls_lut = np.full(len(batch.type_vocab) + 1, self._CLS_OTHER, dtype=np.int64)
+        for i, v in enumerate(batch.type_vocab):
+            if v == "pass":
+                cls_lut[i] = self._CLS_PASS
+            elif v in DEF_ACTION_TYPES:
+                cls_lut[i] = self._CLS_DEF
+            elif v in PRESS_ACTION_TYPES:
+                cls_lut[i] = self._CLS_PRESS_ONLY
+
+        # final third threshold (proxy); NaN x never passes the comparison
+        return cls_lut[batch.type_codes], (batch.x >= 70.0).astype(np.int64)
+
+    def counters_from_rows(
+        self,
+        team_row: np.ndarray,
+        opp_row: np.ndarray,
+        min_time: Optional[float] = None,
+        max_time: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Named counters from the (4, 2) counter rows of the analysed team and its opponent."""
+        return {
+            "opp_passes": int(opp_row[self._CLS_PASS].sum()),
+            "def_actions": int(team_row[self._CLS_DEF].sum()),
+            "press_actions": int(team_row[self._CLS_DEF].sum() + team_row[self._CLS_PRESS_ONLY].sum()),
+            "team_final_third_passes": int(team_row[self._CLS_PASS, 1]),
+            "opp_final_third_passes": int(opp_row[self._CLS_PASS, 1]),
+            "min_time": min_time,
+            "max_time": max_time,
+        }
+
+    def tactical_counters(self, events: Events, team: str = "team") -> Dict[str, Any]:
+        """
+        One pass over the events producing every counter the tactical metrics need:
+          opp_passes, def_actions, press_actions, team_final_third_passes,
+          opp_final_third_passes, min_time, max_time
+
+        Events are bucketed by (role, type class, final third) and counted with a
+        single np.bincount, so adding a metric adds a finisher, not a scan.
+        """
+        batch = self._as_batch(events)
+        table = self.counter_table(batch, self._role_codes(batch, team), 2)
+        min_time, max_time = self._time_range(batch)
+        return self.counters_from_rows(table[0], table[1], min_time, max_time)
+
+    def finish(self, metric_keys: List[str], counters: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply the fused finishers for metric_keys (those listed in FUSED_METRICS) to counters."""
+        return {k: getattr(self, self.FUSED_METRICS[k])(counters) for k in metric_keys if k in self.FUSED_METRICS}
+
+    def compute_fused(self, events: Events, metric_keys: List[str], team: str = "team") -> Dict[str, Any]:
+        """
+        Fused execution mode: compute every requested metric listed in FUSED_METRICS
+        from one shared counter pass. Keys without a fused finisher are not returned;
+        callers fall back to compute_<key> for those.
+        """
+        wanted = [k for k in metric_keys if k in self.FUSED_METRICS]
+        if not wanted:
+            return {}
+        return self.finish(wanted, self.tactical_counters(events, team=team))
+
+    @staticmethod
+    def _finish_ppda(c: Dict[str, Any]) -> Optional[float]:
+        if c["def_actions"] <= 0:
             return None
-        try:
-            return float(x)
-        except Exception:
+        return round(c["opp_passes"] / c["def_actions"], 2)
+
+    @staticmethod
+    def _finish_field_tilt(c: Dict[str, Any]) -> Optional[float]:
+        denom = c["team_final_third_passes"] + c["opp_final_third_passes"]
+        if denom <= 0:
             return None
+        return round(c["team_final_third_passes"] / denom, 4)
+
+    @staticmethod
+    def _finish_pressing_intensity(c: Dict[str, Any]) -> Optional[float]:
+        min_time, max_time = c["min_time"], c["max_time"]
+        # If we have time range in seconds, normalize per minute
+        if min_time is not None and max_time is not None and max_time > min_time:
+            minutes = (max_time - min_time) / 60.0
+            if minutes > 0:
+                return round(c["press_actions"] / minutes, 3)
+        # No timebase: return count as explicit proxy
+        return float(c["press_actions"])
 
     # -----------------------------
     # Metrics
     # -----------------------------
-    def compute_ppda(self, events: List[Dict[str, Any]], team: str = "team", **kwargs) -> Optional[float]:
+    def compute_ppda(self, events: Events, team: str = "team", **kwargs) -> Optional[float]:
         """
         PPDA (proxy, event-only):
         opponent_passes / team_defensive_actions
@@ -49,28 +201,15 @@ class MetricEngine:
         - This is a degraded/approx PPDA unless your provider has explicit zone + defensive third definitions.
         - We keep it consistent with current event schema: team labels: "team" and "opponent".
         """
-        team = str(team).strip().lower()
-        opp = "opponent" if team == "team" else "team"
-
-        opp_passes = 0
-        def_actions = 0
-
-        for e in events:
-            eteam = self._team_of(e)
-            etype = self._type_of(e)
+        batch = self._as_batch(events)
+        team, opp = self._roles(team)
 
-            if eteam == opp and etype == "pass":
-                opp_passes += 1
+        opp_passes = int(np.count_nonzero(batch.team_mask(opp) & batch.type_mask(("pass",))))
+        def_actions = int(np.count_nonzero(batch.team_mask(team) & batch.type_mask(DEF_ACTION_TYPES)))
 
-            if eteam == team and etype in ("tackle", "interception", "block", "challenge", "foul"):
-                def_actions += 1
-
-        if def_actions <= 0:
-            return None
+        return self._finish_ppda({"opp_passes": opp_passes, "def_actions": def_actions})
 
-        return round(opp_passes / def_actions, 2)
-
-    def compute_field_tilt(self, events: List[Dict[str, Any]], team: str = "team", **kwargs) -> Optional[float]:
+    def compute_field_tilt(self, events: Events, team: str = "team", **kwargs) -> Optional[float]:
         """
         Field Tilt (proxy, event-only):
         team_final_third_passes / (team_final_third_passes + opponent_final_third_passes)
@@ -80,75 +219,137 @@ class MetricEngine:
         - "Final third" proxy: x >= 70 (i.e., 2/3 of 105)
         - Works if x is already in meters (SOT should handle transform); if not, still a consistent proxy.
         """
-        team = str(team).strip().lower()
-        opp = "opponent" if team == "team" else "team"
+        batch = self._as_batch(events)
+        team, opp = self._roles(team)
 
-        team_p = 0
-        opp_p = 0
+        # final third threshold (proxy); NaN x never passes the comparison
+        final_third_passes = batch.type_mask(("pass",)) & (batch.x >= 70.0)
+        team_p = int(np.count_nonzero(final_third_passes & batch.team_mask(team)))
+        opp_p = int(np.count_nonzero(final_third_passes & batch.team_mask(opp)))
 
-        for e in events:
-            eteam = self._team_of(e)
-            etype = self._type_of(e)
+        return self._finish_field_tilt({"team_final_third_passes": team_p, "opp_final_third_passes": opp_p})
 
-            if etype != "pass":
-                continue
+    def compute_pressing_intensity(self, events: Events, team: str = "team", **kwargs) -> Optional[float]:
+        """
+        Pressing Intensity (proxy):
+        team_defensive_actions_per_minute
 
-            x = self._x_of(e)
-            if x is None:
-                continue
+        - Count of pressing actions normalized by the match minutes spanned by timestamp_s
+          (legacy "t" clock when no timestamps). Sliding windows: compute_timeseries.
+        - If no time info exists: return raw count (still explicit, not silent).
+        """
+        batch = self._as_batch(events)
+        team, _ = self._roles(team)
 
-            # final third threshold (proxy)
-            if x >= 70.0:
-                if eteam == team:
-                    team_p += 1
-                elif eteam == opp:
-                    opp_p += 1
+        def_actions = int(np.count_nonzero(batch.team_mask(team) & batch.type_mask(PRESS_ACTION_TYPES)))
 
-        denom = team_p + opp_p
-        if denom <= 0:
-            return None
+        # time base: timestamp_s (legacy "t" when no timestamps)
+        min_time, max_time = self._time_range(batch)
 
-        return round(team_p / denom, 4)
+        return self._finish_pressing_intensity(
+            {"press_actions": def_actions, "min_time": min_time, "max_time": max_time}
+        )
 
-    def compute_pressing_intensity(self, events: List[Dict[str, Any]], team: str = "team", **kwargs) -> Optional[float]:
+    # -----------------------------
+    # Time-series mode
+    # -----------------------------
+    def compute_timeseries(
+        self,
+        events: Events,
+        windows_s: Sequence[float] = TIMESERIES_WINDOWS_S,
+        stride_s: float = TIMESERIES_STRIDE_S,
+        start_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
         """
-        Pressing Intensity (proxy):
-        team_defensive_actions_per_minute
+        Sliding-window PPDA / pressing intensity / field tilt per team role (momentum plots,
+        metric_graph.yaml lag windows).
 
-        If you later add timestamps with match clock in seconds, we can compute per 10-min windows etc.
-        For now:
-        - Use count of defensive actions normalized by approximate match minutes if present.
-        - If no time info exists: return raw count (still explicit, not silent).
+        Events are bucketed by (role, type class, final third) like counter_table, counted
+        on the stride grid and every window is a difference of cumulative sums over
+        timestamp_s (metrics.temporal_bins.rolling_counts): one bincount + one cumsum per
+        window length, however many windows overlap.
+
+        Returns:
+          {"clock": "timestamp_s" | "t", "stride_s", "start_s",
+           "windows": {<window_s>: {"start_s": float32[n],
+                                    "team" | "opponent": {"ppda", "pressing_intensity", "field_tilt": float32[n]}}}}
+
+        Rules:
+          - windows start every stride_s from start_s (default: 0, or earlier events' minute)
+            and lie fully inside the clock range (at least one window)
+          - same definitions as the scalar finishers (unrounded); NaN where they return None
+          - pressing_intensity = pressing actions per minute of clock the window covers
+            (min(window end, last event) - max(window start, first event), as the scalar
+            finisher; a window with no span falls back to the raw count like the scalar)
+          - a lag_window "a-bmin" is lag_window_s(...) / stride_s steps along these arrays
+          - no clock -> {"status": "BLOCKED", "reason": "NO_TIMESTAMPS"} (not a silent count)
         """
-        team = str(team).strip().lower()
+        batch = self._as_batch(events)
+        clock = self._clock(batch)
+        if clock is None:
+            return {"status": "BLOCKED", "reason": "NO_TIMESTAMPS"}
+        cls, final_third = self._class_codes(batch)
+        return self.timeseries_from_codes(
+            clock,
+            self._role_codes(batch, "team"),
+            cls,
+            final_third,
+            windows_s,
+            stride_s,
+            start_s,
+            clock_name="timestamp_s" if clock is batch.timestamp_s else "t",
+        )
 
-        def_actions = 0
-        min_time = None
-        max_time = None
-
-        for e in events:
-            eteam = self._team_of(e)
-            etype = self._type_of(e)
-            if eteam == team and etype in ("tackle", "interception", "block", "challenge", "foul", "pressure"):
-                def_actions += 1
-
-            # optional time support
-            t = e.get("t")
-            if t is not None:
-                try:
-                    tv = float(t)
-                    if min_time is None or tv < min_time:
-                        min_time = tv
-                    if max_time is None or tv > max_time:
-                        max_time = tv
-                except Exception:
-                    pass
+    def timeseries_from_codes(
+        self,
+        clock: np.ndarray,
+        role: np.ndarray,
+        cls: np.ndarray,
+        final_third: np.ndarray,
+        windows_s: Sequence[float] = TIMESERIES_WINDOWS_S,
+        stride_s: float = TIMESERIES_STRIDE_S,
+        start_s: Optional[float] = None,
+        clock_name: str = "timestamp_s",
+    ) -> Dict[str, Any]:
+        """
+        compute_timeseries over per-event codes (role 0 = team / 1 = opponent, type class and
+        final third as _class_codes): LiveMatchSession keeps these per appended chunk.
+        """
+        if not np.isfinite(clock).any():
+            return {"status": "BLOCKED", "reason": "NO_TIMESTAMPS"}
+        min_time, max_time = float(np.nanmin(clock)), float(np.nanmax(clock))
+        if start_s is None:
+            start_s = min(0.0, float(np.floor(min_time / 60.0) * 60.0))
 
-        # If we have time range in seconds, normalize per minute
-        if min_time is not None and max_time is not None and max_time > min_time:
-            minutes = (max_time - min_time) / 60.0
-            if minutes > 0:
-                return round(def_actions / minutes, 3)
+        axes = [(role, 2), (cls, 4), (final_third, 2)]
 
-        # No timebase: return count as explicit proxy
-        return float(def_actions)
+        out: Dict[str, Any] = {"clock": clock_name, "stride_s": float(stride_s), "start_s": float(start_s), "windows": {}}
+        for window in windows_s:
+            starts, cube = rolling_counts(clock, axes, window, stride_s, start_s=start_s, end_s=max_time)
+            keep = starts + window <= max_time
+            keep[0] = True
+            starts, cube = starts[keep], cube[keep]
+            span = np.minimum(starts + window, max_time) - np.maximum(starts, min_time)
+
+            series: Dict[str, Any] = {"start_s": starts.astype(np.float32)}
+            for r, role_name in enumerate(("team", "opponent")):
+                series[role_name] = self._finish_series(cube[:, r], cube[:, 1 - r], span)
+            out["windows"][float(window)] = series
+        return out
+
+    def _finish_series(self, own: np.ndarray, other: np.ndarray, span_s: np.ndarray) -> Dict[str, np.ndarray]:
+        """Vectorized fused finishers over (n_windows, 4, 2) counter rows; span_s = clock covered per window."""
+        opp_passes = other[:, self._CLS_PASS].sum(axis=1)
+        def_actions = own[:, self._CLS_DEF].sum(axis=1)
+        press_actions = def_actions + own[:, self._CLS_PRESS_ONLY].sum(axis=1)
+        own_f3, opp_f3 = own[:, self._CLS_PASS, 1], other[:, self._CLS_PASS, 1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ppda = np.where(def_actions > 0, opp_passes / def_actions, np.nan)
+            tilt = np.where(own_f3 + opp_f3 > 0, own_f3 / (own_f3 + opp_f3), np.nan)
+            pressing = np.where(span_s > 0, press_actions / (span_s / 60.0), press_actions)
+        return {
+            "ppda": ppda.astype(np.float32),
+            "pressing_intensity": pressing.astype(np.float32),
+            "field_tilt": tilt.astype(np.float32),
+        }
@@ -3,9 +3,66 @@ from typing import Dict, Any, Tuple
 import pandas as pd
 import numpy as np
 
-def _minute(ts_s: float) -> float:
-    return ts_s / 60.0
+from .temporal_bins import DEFAULT_BINS_MINUTES, bin_codes, bin_labels, category_codes, count_cube, rolling_counts, rolling_spec
 
-def _bin_index(minute: float, bins):
-    for i in range(len(bins)-1):
-        if bins[i] <= minute < bins[i+
\ No newline at end of file
+def _tilt_entries(passes: np.ndarray, teams) -> Dict[Any, Dict[str, Any]]:
+    """passes: final-third passes per (team + other). Tilt = team share of all final-third passes."""
+    total = int(passes.sum())
+    out = {}
+    for i, team in enumerate(teams):
+        team_n = int(passes[i])
+        out[team] = {
+            "field_tilt": (team_n / total) if total > 0 else None,
+            "team_final_third_passes": team_n,
+            "opp_final_third_passes": total - team_n,
+        }
+    return out
+
+def calc_field_tilt_v1(events: pd.DataFrame, spec: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    bins = spec.get("temporal", {}).get("bins_minutes", DEFAULT_BINS_MINUTES)
+    zone_x = (2.0 / 3.0) * 105.0
+
+    x = pd.to_numeric(events["x"], errors="coerce").to_numpy(dtype=np.float64)
+    ts = pd.to_numeric(events["timestamp_s"], errors="coerce").to_numpy(dtype=np.float64)
+    is_pass = events["event_type"].str.contains("pass", na=False).to_numpy(dtype=bool)
+    in_zone = is_pass & (x >= zone_x)  # NaN x is never in zone
+
+    teams = sorted([t for t in events["team_id"].dropna().unique().tolist()])
+    team = category_codes(events["team_id"], teams)
+    team = np.where(team < 0, len(teams), team)  # missing team_id: counts for the opponents
+    team = np.where(in_zone, team, -1)
+
+    # bin axis: labelled bins, then one slot for missing timestamps (match totals only)
+    labels = bin_labels(bins)
+    b = bin_codes(ts / 60.0, bins)
+    b = np.where(b < 0, len(labels), b)
+    cube = count_cube([(b, len(labels) + 1), (team, len(teams) + 1)])
+    events_per_bin = np.bincount(b, minlength=len(labels) + 1)
+
+    out = {"match": _tilt_entries(cube.sum(axis=0), teams), "bins": {}}
+    for i, label in enumerate(labels):
+        if events_per_bin[i]:
+            out["bins"][label] = _tilt_entries(cube[i], teams)
+
+    rolling = rolling_spec(spec)
+    if rolling is not None:
+        window_m, stride_m = rolling
+        starts, rc = rolling_counts(ts, [(team, len(teams) + 1)], window_m * 60.0, stride_m * 60.0)
+        per_team = {t: {"field_tilt": [], "team_final_third_passes": [], "opp_final_third_passes": []} for t in teams}
+        for w in rc:
+            for t, e in _tilt_entries(w, teams).items():
+                for k, v in e.items():
+                    per_team[t][k].append(v)
+        out["rolling"] = {
+            "window_minutes": window_m,
+            "stride_minutes": stride_m,
+            "start_minutes": (starts / 60.0).tolist(),
+            "teams": per_team,
+        }
+
+    meta = {
+        "status": "FULL" if int(is_pass.sum()) > 0 else "DEGRADED",
+        "zone_definition": f"x >= {zone_x:.1f}m (final third)",
+        "notes": ["Event-only field tilt: share of final-third passes."]
+    }
+    return out, meta
@@ -3,62 +3,79 @@ from typing import Dict, Any, Tuple
 import pandas as pd
 import numpy as np
 
+from .temporal_bins import DEFAULT_BINS_MINUTES, bin_codes, bin_labels, category_codes, count_cube, rolling_counts, rolling_spec
+
 DEF_ACTION_TYPES_DEFAULT = {"tackle","interception","ball_recovery","challenge_won","foul_won","pressure","block"}
 
-def _minute(ts_s: float) -> float:
-    return ts_s / 60.0
+# type class axis of the count cube
+_PASS, _DEF = 0, 1
+
+def _type_classes(event_type: pd.Series, def_types) -> Tuple[np.ndarray, set]:
+    """Class per event (pass / defensive action / -1) from one lookup over the distinct types."""
+    codes, uniques = pd.factorize(event_type)
+    lut = np.full(len(uniques) + 1, -1, dtype=np.int64)
+    for i, u in enumerate(uniques):
+        if isinstance(u, str) and "pass" in u:
+            lut[i] = _PASS
+        elif u in def_types:
+            lut[i] = _DEF
+    return lut[codes], set(uniques.tolist())
 
-def _bin_index(minute: float, bins):
-    for i in range(len(bins)-1):
-        if bins[i] <= minute < bins[i+1]:
-            return f"{bins[i]}-{bins[i+1]}"
-    return f"{bins[-2]}-{bins[-1]}+"
+def _entry(opp_n: int, def_n: int) -> Dict[str, Any]:
+    ppda = (opp_n / def_n) if def_n > 0 else float("inf")
+    return {"ppda": ppda, "opp_passes_in_zone": int(opp_n), "def_actions_in_zone": int(def_n)}
+
+def _team_entries(cube: np.ndarray, teams) -> Dict[Any, Dict[str, Any]]:
+    """cube: (team + other, class). Opponent passes = every in-zone pass not made by the team."""
+    all_passes = int(cube[:, _PASS].sum())
+    return {team: _entry(all_passes - int(cube[i, _PASS]), int(cube[i, _DEF])) for i, team in enumerate(teams)}
 
 def calc_ppda_v1(events: pd.DataFrame, spec: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    bins = spec.get("temporal", {}).get("bins_minutes", [0,15,30,45,60,75,90,120])
+    bins = spec.get("temporal", {}).get("bins_minutes", DEFAULT_BINS_MINUTES)
     zone_x = 0.60 * 105.0
 
-    df = events.copy()
-    df["x"] = pd.to_numeric(df["x"], errors="coerce")
-    df["timestamp_s"] = pd.to_numeric(df["timestamp_s"], errors="coerce")
-
-    in_zone = df["x"] >= zone_x
-    is_pass = df["event_type"].str.contains("pass", na=False)
-    pass_in_zone = df[is_pass & in_zone]
+    x = pd.to_numeric(events["x"], errors="coerce").to_numpy(dtype=np.float64)
+    ts = pd.to_numeric(events["timestamp_s"], errors="coerce").to_numpy(dtype=np.float64)
 
     def_types = set(DEF_ACTION_TYPES_DEFAULT)
-    present_types = set(df["event_type"].dropna().unique().tolist())
+    cls, present_types = _type_classes(events["event_type"], def_types)
     coverage = len(def_types.intersection(present_types)) / max(1, len(def_types))
     status = "FULL" if coverage >= 0.40 else "DEGRADED"
 
-    is_def = df["event_type"].isin(def_types)
-    def_in_zone = df[is_def & in_zone]
+    # only in-zone passes / defensive actions are counted (NaN x is never in zone)
+    cls = np.where(x >= zone_x, cls, -1)
 
-    teams = sorted([t for t in df["team_id"].dropna().unique().tolist()])
-    out = {"match": {}, "bins": {}}
+    teams = sorted([t for t in events["team_id"].dropna().unique().tolist()])
+    team = category_codes(events["team_id"], teams)
+    team = np.where(team < 0, len(teams), team)  # missing team_id: still an opponent pass
 
-    df_min = df["timestamp_s"].apply(lambda x: _minute(x) if pd.notna(x) else np.nan)
-    df["_bin"] = df_min.apply(lambda m: _bin_index(m, bins) if pd.notna(m) else "NA")
+    # bin axis: labelled bins, then one slot for missing timestamps (match totals only)
+    labels = bin_labels(bins)
+    b = bin_codes(ts / 60.0, bins)
+    b = np.where(b < 0, len(labels), b)
+    cube = count_cube([(b, len(labels) + 1), (team, len(teams) + 1), (cls, 2)])
+    events_per_bin = np.bincount(b, minlength=len(labels) + 1)
 
-    for team in teams:
-        opp_passes = pass_in_zone[pass_in_zone["team_id"] != team]
-        team_def = def_in_zone[def_in_zone["team_id"] == team]
-        opp_n = int(len(opp_passes))
-        def_n = int(len(team_def))
-        ppda = (opp_n / def_n) if def_n > 0 else float("inf")
-        out["match"][team] = {"ppda": ppda, "opp_passes_in_zone": opp_n, "def_actions_in_zone": def_n}
+    out = {"match": _team_entries(cube.sum(axis=0), teams), "bins": {}}
+    for i, label in enumerate(labels):
+        if events_per_bin[i]:
+            out["bins"][label] = _team_entries(cube[i], teams)
 
-    for b in sorted(df["_bin"].dropna().unique().tolist()):
-        if b == "NA":
-            continue
-        out["bins"][b] = {}
-        for team in teams:
-            opp_passes_b = pass_in_zone[(pass_in_zone["_bin"]==b) & (pass_in_zone["team_id"] != team)]
-            team_def_b = def_in_zone[(def_in_zone["_bin"]==b) & (def_in_zone["team_id"] == team)]
-            opp_n = int(len(opp_passes_b))
-            def_n = int(len(team_def_b))
-            ppda = (opp_n / def_n) if def_n > 0 else float("inf")
-            out["bins"][b][team] = {"ppda": ppda, "opp_passes_in_zone": opp_n, "def_actions_in_zone": def_n}
+    rolling = rolling_spec(spec)
+    if rolling is not None:
+        window_m, stride_m = rolling
+        starts, rc = rolling_counts(ts, [(team, len(teams) + 1), (cls, 2)], window_m * 60.0, stride_m * 60.0)
+        per_team = {t: {"ppda": [], "opp_passes_in_zone": [], "def_actions_in_zone": []} for t in teams}
+        for w in rc:
+            for t, e in _team_entries(w, teams).items():
+                for k, v in e.items():
+                    per_team[t][k].append(v)
+        out["rolling"] = {
+            "window_minutes": window_m,
+            "stride_minutes": stride_m,
+            "start_minutes": (starts / 60.0).tolist(),
+            "teams": per_team,
+        }
 
     meta = {
         "status": status,
@@ -67,4 +84,4 @@ def calc_ppda_v1(events: pd.DataFrame, spec: Dict[str, Any]) -> Tuple[Dict[str,
         "def_type_coverage_ratio": float(coverage),
         "notes": ["Event-only PPDA. Tracking-based pressure models not used."]
     }
-    return out, meta
\ No newline at end of file
+    return out, meta
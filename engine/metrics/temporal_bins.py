@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BINS_MINUTES = [0, 15, 30, 45, 60, 75, 90, 120]
+
+# (codes, size): one axis of a count cube; code -1 (or >= size) drops the event
+Axis = Tuple[np.ndarray, int]
+
+
+def bin_labels(bins: Sequence[Any]) -> List[str]:
+    """"a-b" per [a, b) bin plus the overflow label "a-b+" (last bin and everything outside)."""
+    return [f"{bins[i]}-{bins[i + 1]}" for i in range(len(bins) - 1)] + [f"{bins[-2]}-{bins[-1]}+"]
+
+
+def bin_codes(minutes: np.ndarray, bins: Sequence[Any]) -> np.ndarray:
+    """
+    Bin index per minute via np.searchsorted over the edges.
+
+    Rules (as the per-row _bin_index it replaces):
+      - bins[i] <= minute < bins[i + 1] -> i
+      - anything else (>= last edge, < first edge) -> len(bins) - 1 (overflow label)
+      - NaN -> -1
+    """
+    edges = np.asarray(bins, dtype=np.float64)
+    minutes = np.asarray(minutes, dtype=np.float64)
+    overflow = len(edges) - 1
+    idx = np.searchsorted(edges, minutes, side="right") - 1
+    idx = np.where((idx < 0) | (idx >= overflow), overflow, idx)
+    return np.where(np.isnan(minutes), -1, idx)
+
+
+def category_codes(values: pd.Series, categories: Sequence[Any]) -> np.ndarray:
+    """Position of each value in categories (-1 for missing / unknown)."""
+    return np.asarray(pd.Categorical(values, categories=list(categories)).codes, dtype=np.int64)
+
+
+def count_cube(axes: Sequence[Axis]) -> np.ndarray:
+    """
+    Event counts over the product of axes (one np.bincount over the packed key).
+    Events with a code outside [0, size) on any axis are not counted.
+    """
+    sizes = tuple(int(s) for _, s in axes)
+    if not axes:
+        return np.zeros(sizes, dtype=np.int64)
+    ok = np.ones(len(axes[0][0]), dtype=bool)
+    for codes, size in axes:
+        ok &= (codes >= 0) & (codes < size)
+    key = np.ravel_multi_index(tuple(np.asarray(c)[ok] for c, _ in axes), sizes)
+    return np.bincount(key, minlength=int(np.prod(sizes))).reshape(sizes)
+
+
+def rolling_counts(
+    times_s: np.ndarray,
+    axes: Sequence[Axis],
+    window_s: float,
+    stride_s: float,
+    start_s: float = 0.0,
+    end_s: Optional[float] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Counts per sliding window [start, start + window_s), windows every stride_s from start_s.
+
+    Events are counted once on a fine grid (step = gcd(window, stride) in whole seconds),
+    then each window is a difference of cumulative sums along the time axis, so the cost
+    is one bincount + one cumsum however many windows overlap.
+
+    Returns (window_starts_s, cube) with cube shaped (n_windows, *axis sizes). The last
+    windows may extend past end_s (default: last event time) and then hold fewer events.
+    """
+    window = int(round(window_s))
+    stride = int(round(stride_s))
+    if window <= 0 or stride <= 0:
+        raise ValueError(f"window_s and stride_s must be >= 1s (got {window_s}, {stride_s})")
+    step = math.gcd(window, stride)
+
+    t = np.asarray(times_s, dtype=np.float64)
+    if end_s is None:
+        finite = t[np.isfinite(t)]
+        end_s = float(finite.max()) if len(finite) else start_s
+    n_fine = max(1, int((end_s - start_s) // step) + 1)
+
+    with np.errstate(invalid="ignore"):
+        fine = np.floor((t - start_s) / step)
+    fine = np.where(np.isfinite(fine), fine, -1).astype(np.int64)
+
+    counts = count_cube([(fine, n_fine), *axes])
+    cum = np.concatenate((np.zeros((1,) + counts.shape[1:], dtype=counts.dtype), np.cumsum(counts, axis=0)))
+    lo = np.arange(0, n_fine, stride // step)
+    hi = np.minimum(lo + window // step, n_fine)
+    return start_s + lo * float(step), cum[hi] - cum[lo]
+
+
+def rolling_spec(spec: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """(window_minutes, stride_minutes) from spec.temporal.rolling_minutes, if configured."""
+    r = (spec.get("temporal") or {}).get("rolling_minutes")
+    if not r:
+        return None
+    window = float(r["window"])
+    return window, float(r.get("stride", window))
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+NAS_WINDOW_S = 180.0
+NAS_THRESHOLD = 0.5
+
+
+def _group_codes(df: pd.DataFrame, cols: Sequence[str]) -> np.ndarray:
+    if not cols:
+        return np.zeros(len(df), dtype=np.int64)
+    return df.groupby(list(cols), sort=False, dropna=False).ngroup().to_numpy(dtype=np.int64)
+
+
+def _count_le(ev_group: np.ndarray, ev_time: np.ndarray, q_group: np.ndarray, q_time: np.ndarray) -> np.ndarray:
+    """
+    For each query: position in the (group, time)-sorted events just after the last event
+    with the same group and time <= q_time. Exact (no float offsets): events and queries
+    are merged in one lexsort, events first on ties, and a running event count is read
+    off at each query.
+    """
+    n_ev = len(ev_time)
+    group = np.concatenate((ev_group, q_group))
+    time = np.concatenate((ev_time, q_time))
+    kind = np.concatenate((np.zeros(n_ev, dtype=np.int8), np.ones(len(q_time), dtype=np.int8)))
+    order = np.lexsort((kind, time, group))
+    is_event = order < n_ev
+    seen = np.cumsum(is_event)
+    out = np.empty(len(q_time), dtype=np.int64)
+    q_pos = ~is_event
+    out[order[q_pos] - n_ev] = seen[q_pos]
+    return out
+
+
+def detect_nas(
+    events_df: pd.DataFrame,
+    window_s: float = NAS_WINDOW_S,
+    threshold: float = NAS_THRESHOLD,
+    group_cols: Optional[Sequence[str]] = None,
+    time_col: str = "time",
+    error_col: str = "is_error",
+    success_col: str = "success",
+) -> pd.DataFrame:
+    """
+    Negative Action Spiral windows for every error at once.
+
+    For an error at t, the window is the same group's events with t < time <= t + window_s;
+    the error is a NAS instance when the window has rated events and their success mean is
+    below threshold.
+
+    One sort of the events by (group, time), window bounds for all errors from a merged
+    lexsort, and success sums / counts from prefix sums: O(n log n) for the whole frame.
+
+    Rules:
+      - group_cols: e.g. ("player_id", "match_id") for a season; None = one group
+      - success: bool / 0-1; missing values are not rated (as pandas mean skips NaN)
+      - events / errors with missing time never match
+      - returns one row per error (input order): index of the error row, group columns,
+        time, window_events, rated_events, success_rate, nas
+    """
+    group_cols = list(group_cols or [])
+    n = len(events_df)
+    time = pd.to_numeric(events_df[time_col], errors="coerce").to_numpy(dtype=np.float64)
+    success = pd.to_numeric(events_df[success_col], errors="coerce").to_numpy(dtype=np.float64)
+    is_error = (events_df[error_col] == True).to_numpy(dtype=bool)  # noqa: E712 (object columns)
+    group = _group_codes(events_df, group_cols)
+
+    has_time = ~np.isnan(time)
+    ev = np.flatnonzero(has_time)
+    ev = ev[np.lexsort((time[ev], group[ev]))]
+    ev_time, ev_group = time[ev], group[ev]
+
+    rated = ~np.isnan(success[ev])
+    succ_cum = np.concatenate(([0.0], np.cumsum(np.where(rated, success[ev], 0.0))))
+    rated_cum = np.concatenate(([0], np.cumsum(rated)))
+
+    err = np.flatnonzero(is_error & has_time)
+    err_time, err_group = time[err], group[err]
+    lo = _count_le(ev_group, ev_time, err_group, err_time)
+    hi = _count_le(ev_group, ev_time, err_group, err_time + window_s)
+
+    rated_n = rated_cum[hi] - rated_cum[lo]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(rated_n > 0, (succ_cum[hi] - succ_cum[lo]) / rated_n, np.nan)
+
+    out = pd.DataFrame(index=events_df.index[err])
+    for c in group_cols:
+        out[c] = events_df[c].to_numpy()[err]
+    out[time_col] = err_time
+    out["window_events"] = hi - lo
+    out["rated_events"] = rated_n
+    out["success_rate"] = rate
+    out["nas"] = (rated_n > 0) & (rate < threshold)
+    return out
+
+
+def nas_by_player(
+    events_df: pd.DataFrame,
+    window_s: float = NAS_WINDOW_S,
+    threshold: float = NAS_THRESHOLD,
+    player_col: str = "player_id",
+    match_col: Optional[str] = "match_id",
+    time_col: str = "time",
+    **cols: Any,
+) -> Dict[Any, List[float]]:
+    """
+    Season batch: {player: [error times that started a NAS]}. Windows stay inside one
+    match when match_col is present (clock restarts every match).
+    """
+    group_cols = [player_col] + ([match_col] if match_col and match_col in events_df.columns else [])
+    res = detect_nas(events_df, window_s, threshold, group_cols=group_cols, time_col=time_col, **cols)
+    hits = res[res["nas"].to_numpy()]
+    return {p: g[time_col].tolist() for p, g in hits.groupby(player_col, sort=False)}
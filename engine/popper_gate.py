@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 
 class PopperGate:
@@ -16,7 +16,48 @@ class PopperGate:
       - Read falsifiability blocks from registry YAML (H0/H1/supports/contradicts).
     """
 
-    def verify(self, features: Dict[str, Any], registry: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Unfalsifiable (v1 strictness): a VERIFIED claim needs one of these VERIFIED too
+    SUPPORT_MAP: Dict[str, List[str]] = {
+        "ppda": ["pressing_intensity"],
+        "field_tilt": ["ppda"],
+        "pressing_intensity": ["ppda"],
+    }
+    # claim -> metrics its contradiction checks read
+    CONTRADICTION_INPUTS: Dict[str, List[str]] = {"ppda": ["pressing_intensity"]}
+
+    def dependencies(self, key: str) -> Set[str]:
+        """Metrics whose values can change the claim of `key` (transitive, includes key)."""
+        seen = {key}
+        todo = [key]
+        while todo:
+            k = todo.pop()
+            for d in self.SUPPORT_MAP.get(k, []) + self.CONTRADICTION_INPUTS.get(k, []):
+                if d not in seen:
+                    seen.add(d)
+                    todo.append(d)
+        return seen
+
+    def affected(self, changed: Iterable[str], registry: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Registry keys (in order) whose claims must be re-verified when `changed` values changed."""
+        changed = set(changed)
+        return [k for k in registry if self.dependencies(k) & changed]
+
+    def verify(
+        self,
+        features: Dict[str, Any],
+        registry: Dict[str, Dict[str, Any]],
+        keys: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Claims in registry order. keys: only these claims (same result as the full run,
+        restricted to keys; only their dependencies are evaluated).
+        """
+        wanted: Optional[Set[str]] = None
+        if keys is not None:
+            wanted = set(keys)
+            needed = set().union(*(self.dependencies(k) for k in wanted)) if wanted else set()
+            registry = {k: m for k, m in registry.items() if k in needed}
+
         claims: List[Dict[str, Any]] = []
 
         # 1) Build baseline claims
@@ -75,11 +116,7 @@ class PopperGate:
                 )
 
         # 3) Unfalsifiable (v1 strictness): require at least one supporting metric
-        support_map = {
-            "ppda": ["pressing_intensity"],
-            "field_tilt": ["ppda"],
-            "pressing_intensity": ["ppda"],
-        }
+        support_map = self.SUPPORT_MAP
 
         verified_keys = {c["metric"] for c in claims if c.get("status") == "VERIFIED"}
         for c in claims:
@@ -92,6 +129,8 @@ class PopperGate:
                 c["reason"] = "NO_SUPPORTING_METRIC"
                 c.setdefault("notes", []).append(f"Requires one of: {supports}")
 
+        if wanted is not None:
+            claims = [c for c in claims if c["metric"] in wanted]
         return claims
 
 
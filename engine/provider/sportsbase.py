@@ -1,13 +1,45 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, List, Optional
 import pandas as pd
 import numpy as np
 
+from ..map.mapping_plan import PLAN_CACHE, ColumnSpec, MappingPlan, contract_scale
+
 @dataclass
 class ProviderMapResult:
     canonical_df: pd.DataFrame
     mapping_used: Dict[str, str]
+    scaled_0_100: bool = False
+    plan: Optional[MappingPlan] = None
+
+MATCH_ID_COLUMNS = ["match_id","MatchId","match","matchId"]
+
+# Canonical target -> provider header aliases (first present wins), in output column order.
+SPORTSBASE_COLUMNS: List[ColumnSpec] = [
+    ("match_id", "match_id", tuple(MATCH_ID_COLUMNS), False),
+    ("team_id", "team_id", ("team_id","TeamId","team","teamId","team_name","Team"), False),
+    ("player_id", "player_id", ("player_id","PlayerId","player","playerId","player_name","Player"), False),
+    ("event_type", "event_type", ("event_type","type","EventType","action","Action","event","tag"), False),
+    ("timestamp_s", "timestamp_s", ("timestamp_s","timestamp","time_s","sec","seconds","start_s","StartSecond","start"), False),
+    ("period", "period", ("period","half","Period","Half"), False),
+    ("x", "x", ("x","pos_x","PosX","start_x","StartX","X","location_x"), False),
+    ("y", "y", ("y","pos_y","PosY","start_y","StartY","Y","location_y"), False),
+    ("x_end", "x_end", ("x_end","end_x","EndX","to_x","dest_x","location_x_end"), False),
+    ("y_end", "y_end", ("y_end","end_y","EndY","to_y","dest_y","location_y_end"), False),
+    ("outcome", "outcome", ("outcome","result","Outcome","success","is_success","successful"), False),
+]
+
+SPORTSBASE_TRANSFORMS = (
+    ("timestamp_s", "clock_seconds"),
+    ("outcome", "outcome_bool"),
+    ("event_type", "lower_strip"),
+)
+
+@lru_cache(maxsize=1)
+def _sportsbase_scale():
+    return contract_scale()
 
 def _pick(df: pd.DataFrame, candidates):
     for c in candidates:
@@ -15,100 +47,116 @@ def _pick(df: pd.DataFrame, candidates):
             return c
     return None
 
-def to_canonical_events(df: pd.DataFrame) -> ProviderMapResult:
+def sportsbase_plan(headers) -> MappingPlan:
+    """Memoized mapping plan for a header tuple (one compile per distinct header signature)."""
+    return PLAN_CACHE.get("sportsbase", SPORTSBASE_COLUMNS, tuple(headers), SPORTSBASE_TRANSFORMS, _sportsbase_scale())
+
+def to_canonical_events(df: pd.DataFrame, scale_0_100: Optional[bool] = None) -> ProviderMapResult:
     """Map SportsBase-like event exports to HP canonical schema.
     Permissive mapping; missing fields become NaN (no silent row drops).
+
+    scale_0_100: None -> auto-detect 0-100 coordinates from this frame;
+    True/False -> pin the decision (chunked/live feeds reuse the first chunk's answer).
     """
-    mapping_used: Dict[str, str] = {}
-
-    col_match = _pick(df, ["match_id","MatchId","match","matchId"])
-    col_team  = _pick(df, ["team_id","TeamId","team","teamId","team_name","Team"])
-    col_player= _pick(df, ["player_id","PlayerId","player","playerId","player_name","Player"])
-    col_type  = _pick(df, ["event_type","type","EventType","action","Action","event","tag"])
-    col_ts_s  = _pick(df, ["timestamp_s","timestamp","time_s","sec","seconds","start_s","StartSecond","start"])
-    col_period= _pick(df, ["period","half","Period","Half"])
-    col_x     = _pick(df, ["x","pos_x","PosX","start_x","StartX","X","location_x"])
-    col_y     = _pick(df, ["y","pos_y","PosY","start_y","StartY","Y","location_y"])
-    col_xe    = _pick(df, ["x_end","end_x","EndX","to_x","dest_x","location_x_end"])
-    col_ye    = _pick(df, ["y_end","end_y","EndY","to_y","dest_y","location_y_end"])
-    col_out   = _pick(df, ["outcome","result","Outcome","success","is_success","successful"])
-
-    def map_col(target, src):
-        if src is not None:
-            mapping_used[target] = src
-
-    map_col("match_id", col_match)
-    map_col("team_id", col_team)
-    map_col("player_id", col_player)
-    map_col("event_type", col_type)
-    map_col("timestamp_s", col_ts_s)
-    map_col("period", col_period)
-    map_col("x", col_x)
-    map_col("y", col_y)
-    map_col("x_end", col_xe)
-    map_col("y_end", col_ye)
-    map_col("outcome", col_out)
-
-    out_df = pd.DataFrame()
-    for tgt, src in mapping_used.items():
-        out_df[tgt] = df[src]
-
-    for c in ["match_id","team_id","player_id","event_type","timestamp_s","period","x","y","x_end","y_end","outcome"]:
-        if c not in out_df.columns:
-            out_df[c] = np.nan
-
-    def parse_ts(v):
-        if pd.isna(v):
-            return np.nan
-        if isinstance(v, (int,float,np.integer,np.floating)):
-            return float(v)
-        s = str(v).strip()
-        if s.isdigit():
-            return float(s)
-        parts = s.split(":")
-        try:
-            if len(parts)==2:
-                m, sec = int(parts[0]), float(parts[1])
-                return 60*m + sec
-            if len(parts)==3:
-                h, m, sec = int(parts[0]), int(parts[1]), float(parts[2])
-                return 3600*h + 60*m + sec
-        except:
-            return np.nan
-        return np.nan
+    from ..map.plan_apply import apply_plan
+
+    plan = sportsbase_plan(df.columns)
+    out_df = apply_plan(plan, df)
 
-    out_df["timestamp_s"] = out_df["timestamp_s"].apply(parse_ts)
+    for tgt, name in plan.transforms:
+        out_df[tgt] = _TRANSFORMS[name](out_df[tgt])
 
-    # If coordinates look like 0-100 scale, map to 105x68
-    try:
-        x_max = pd.to_numeric(out_df["x"], errors="coerce").dropna().max()
-        y_max = pd.to_numeric(out_df["y"], errors="coerce").dropna().max()
-    except Exception:
-        x_max, y_max = np.nan, np.nan
+    # If coordinates look like provider 0-100 scale, map to canonical meters
+    # (numeric conversion done once per column)
+    (sx_c, sx_p), (sy_c, sy_p) = plan.scale
+    x_num = pd.to_numeric(out_df["x"], errors="coerce")
+    y_num = pd.to_numeric(out_df["y"], errors="coerce")
+    x_max, y_max = x_num.max(), y_num.max()
 
-    if pd.notna(x_max) and pd.notna(y_max) and x_max <= 100.5 and y_max <= 100.5:
-        out_df["x"] = pd.to_numeric(out_df["x"], errors="coerce") * 105.0 / 100.0
-        out_df["y"] = pd.to_numeric(out_df["y"], errors="coerce") * 68.0 / 100.0
+    if scale_0_100 is None:
+        scale_0_100 = bool(pd.notna(x_max) and pd.notna(y_max) and x_max <= sx_p + 0.5 and y_max <= sy_p + 0.5)
+
+    if scale_0_100:
+        out_df["x"] = x_num * sx_c / sx_p
+        out_df["y"] = y_num * sy_c / sy_p
         if out_df["x_end"].notna().any():
-            out_df["x_end"] = pd.to_numeric(out_df["x_end"], errors="coerce") * 105.0 / 100.0
+            out_df["x_end"] = pd.to_numeric(out_df["x_end"], errors="coerce") * sx_c / sx_p
         if out_df["y_end"].notna().any():
-            out_df["y_end"] = pd.to_numeric(out_df["y_end"], errors="coerce") * 68.0 / 100.0
-
-    def norm_out(v):
-        if pd.isna(v):
-            return np.nan
-        if isinstance(v, (int,float,np.integer,np.floating)):
-            if v in (0,1):
-                return bool(int(v))
-            return np.nan
-        s = str(v).strip().lower()
-        if s in ("success","successful","true","1","yes","y","won"):
-            return True
-        if s in ("fail","failed","false","0","no","n","lost"):
-            return False
+            out_df["y_end"] = pd.to_numeric(out_df["y_end"], errors="coerce") * sy_c / sy_p
+
+    return ProviderMapResult(canonical_df=out_df, mapping_used=plan.mapping_used, scaled_0_100=scale_0_100, plan=plan)
+
+# -------------------------
+# Vectorized column transforms
+# -------------------------
+# String columns are factorized first: parsing/normalisation runs once per distinct
+# value and is broadcast back with a lookup table (np.take), never per row.
+
+_INT = r"\s*([+-]?\d+)\s*"
+_FLT = r"\s*([+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)\s*"
+_TS_RE = rf"^(?:(\d+)|{_INT}:{_FLT}|{_INT}:{_INT}:{_FLT})$"
+
+_OUT_TRUE = ("success","successful","true","1","yes","y","won")
+_OUT_FALSE = ("fail","failed","false","0","no","n","lost")
+
+def _take(lut: np.ndarray, codes: np.ndarray, na_value) -> np.ndarray:
+    lut = np.append(lut.astype(object if lut.dtype == object else lut.dtype), na_value)
+    return lut[codes]  # code -1 -> na_value slot
+
+def _parse_ts_vec(s: pd.Series) -> pd.Series:
+    """Seconds from numeric values, digit strings, 'mm:ss' and 'hh:mm:ss' (else NaN)."""
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        return s.astype(np.float64)
+    if s.empty:
+        return s.copy()
+
+    codes, uniques = pd.factorize(s)
+    u = pd.Series(uniques, dtype=object)
+    st = u.str.strip()                       # NaN for non-string uniques
+    out = pd.to_numeric(u.where(st.isna()), errors="coerce").astype(np.float64)
+
+    parts = st.str.extract(_TS_RE)
+    num = parts.apply(pd.to_numeric, errors="coerce")
+    digits = num[0]
+    mmss = 60 * num[1] + num[2]
+    hhmmss = 3600 * num[3] + 60 * num[4] + num[5]
+    parsed = digits.fillna(mmss).fillna(hhmmss)
+    out = out.where(st.isna(), parsed)
+
+    return pd.Series(_take(out.to_numpy(dtype=np.float64), codes, np.nan), index=s.index, dtype=np.float64)
+
+def _norm_out_scalar(v):
+    if pd.isna(v):
         return np.nan
+    if isinstance(v, (int,float,np.integer,np.floating)):
+        if v in (0,1):
+            return bool(int(v))
+        return np.nan
+    s = str(v).strip().lower()
+    if s in _OUT_TRUE:
+        return True
+    if s in _OUT_FALSE:
+        return False
+    return np.nan
+
+def _norm_out_vec(s: pd.Series) -> pd.Series:
+    """Outcome -> True/False/NaN via a lookup table over distinct values."""
+    if s.empty:
+        return s.copy()
+    codes, uniques = pd.factorize(s)
+    lut = np.array([_norm_out_scalar(v) for v in uniques], dtype=object)
+    return pd.Series(_take(lut, codes, np.nan), index=s.index, dtype=object).infer_objects()
 
-    out_df["outcome"] = out_df["outcome"].apply(norm_out)
-    out_df["event_type"] = out_df["event_type"].astype(str).str.strip().str.lower()
+def _norm_event_type_vec(s: pd.Series) -> pd.Series:
+    """str().strip().lower() per distinct value (NaN -> 'nan', as astype(str) does)."""
+    if s.empty:
+        return s.astype(str).str.strip().str.lower()
+    codes, uniques = pd.factorize(s)
+    lut = np.array([str(v).strip().lower() for v in uniques], dtype=object)
+    return pd.Series(_take(lut, codes, "nan"), index=s.index, dtype=object).astype(str)
 
-    return ProviderMapResult(canonical_df=out_df, mapping_used=mapping_used)
\ No newline at end of file
+_TRANSFORMS = {
+    "clock_seconds": _parse_ts_vec,
+    "outcome_bool": _norm_out_vec,
+    "lower_strip": _norm_event_type_vec,
+}
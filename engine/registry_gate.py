@@ -1,11 +1,24 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import os
+import pickle
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+from .fsutil import mkstemp
+
+# Bump when compile / validation rules change (invalidates memory and disk snapshots,
+# and every stage cache entry keyed on the registry content_hash).
+REGISTRY_SCHEMA = "hp-registry-v1"
+
+# libyaml-backed loader when PyYAML was built with it; pure-Python fallback otherwise.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 @dataclass
 class RegistryIssue:
@@ -14,6 +27,18 @@ class RegistryIssue:
     issue: str
 
 
+@dataclass
+class RegistrySnapshot:
+    """Compiled + validated registry for one directory, plus what it was built from."""
+
+    registry_dir: str
+    fingerprint: Tuple[Tuple[str, int, int], ...]  # (name, size, mtime_ns) per YAML
+    content_hash: str
+    registry: Dict[str, Dict[str, Any]]
+    report: Dict[str, Any]
+    compiled_at: float = field(default_factory=time.time)
+
+
 class RegistryGate:
     """
     Contract-first registry loader + validator.
@@ -23,6 +48,13 @@ class RegistryGate:
       - Use filename stem as the canonical metric_key (e.g. ppda.yaml -> "ppda")
         so code can map to MetricEngine.compute_ppda.
       - Attach meta fields for traceability (_file, _key).
+
+    Snapshots:
+      - A directory is compiled (parsed + validated) once and kept in memory.
+      - Re-use is checked by file fingerprint (name, size, mtime); on mismatch the
+        content hash decides whether a recompile is really needed.
+      - With snapshot_dir set, compiled snapshots also persist on disk across processes.
+      - Returned registries are shared snapshots: treat them as read-only.
     """
 
     # Minimum constitutional blocks (you can tighten this later)
@@ -38,12 +70,18 @@ class RegistryGate:
         "relationships",        # influences/influenced_by OR explicit "relationless_reason"
     ]
 
+    def __init__(self, snapshot_dir: Optional[str | Path] = None) -> None:
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self._snapshots: Dict[str, RegistrySnapshot] = {}
+
     def load_registry_dir(self, registry_dir: Path) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
         """
         Returns:
           registry: {metric_key: metric_meta}
-          report: {status, issues[], loaded_count}
+          report: {status, issues[], loaded_count, cache, load_time_ms, content_hash, yaml_loader}
         """
+        t0 = time.perf_counter()
+        registry_dir = Path(registry_dir)
         if not registry_dir.exists():
             raise FileNotFoundError(f"Registry directory not found: {registry_dir}")
 
@@ -51,13 +89,104 @@ class RegistryGate:
         if not yamls:
             raise ValueError(f"No YAML files found in registry directory: {registry_dir}")
 
+        dir_key = str(registry_dir.resolve())
+        fingerprint = self._fingerprint(yamls)
+
+        snap = self._snapshots.get(dir_key)
+        cache_state = "MEMORY"
+        if snap is None or snap.fingerprint != fingerprint:
+            blobs = [(p, p.read_bytes()) for p in yamls]
+            content_hash = self._content_hash(blobs)
+
+            if snap is not None and snap.content_hash == content_hash:
+                cache_state = "MEMORY_REVALIDATED"  # touched, not changed
+            else:
+                snap = self._load_disk_snapshot(dir_key)
+                cache_state = "DISK"
+                if snap is None or snap.content_hash != content_hash:
+                    registry, report = self._compile(blobs)
+                    snap = RegistrySnapshot(dir_key, fingerprint, content_hash, registry, report)
+                    cache_state = "COMPILED"
+                    self._save_disk_snapshot(dir_key, snap)
+
+            snap.fingerprint = fingerprint
+            self._snapshots[dir_key] = snap
+
+        report = {
+            **snap.report,
+            "cache": cache_state,
+            "load_time_ms": round((time.perf_counter() - t0) * 1000.0, 3),
+            "content_hash": snap.content_hash,
+            "yaml_loader": _YamlLoader.__name__,
+        }
+        return snap.registry, report
+
+    def invalidate(self, registry_dir: Optional[Path] = None) -> None:
+        """Drop in-memory snapshots (all, or one directory)."""
+        if registry_dir is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(str(Path(registry_dir).resolve()), None)
+
+    # -------------------------
+    # Snapshot internals
+    # -------------------------
+
+    @staticmethod
+    def _fingerprint(yamls: List[Path]) -> Tuple[Tuple[str, int, int], ...]:
+        out = []
+        for p in yamls:
+            st = p.stat()
+            out.append((p.name, int(st.st_size), int(st.st_mtime_ns)))
+        return tuple(out)
+
+    def _content_hash(self, blobs: List[Tuple[Path, bytes]]) -> str:
+        """YAML names + bytes, plus the validator version (schema and required blocks)."""
+        h = hashlib.sha256()
+        h.update(REGISTRY_SCHEMA.encode("utf-8"))
+        h.update("\0".join(self.REQUIRED_TOP_LEVEL_BLOCKS).encode("utf-8"))
+        for p, b in blobs:
+            h.update(p.name.encode("utf-8"))
+            h.update(b)
+        return h.hexdigest()
+
+    def _snapshot_path(self, dir_key: str) -> Optional[Path]:
+        if self.snapshot_dir is None:
+            return None
+        return self.snapshot_dir / f"{hashlib.sha256(dir_key.encode('utf-8')).hexdigest()[:24]}.pkl"
+
+    def _load_disk_snapshot(self, dir_key: str) -> Optional[RegistrySnapshot]:
+        p = self._snapshot_path(dir_key)
+        if p is None or not p.exists():
+            return None
+        try:
+            with p.open("rb") as f:
+                snap = pickle.load(f)
+            return snap if isinstance(snap, RegistrySnapshot) else None
+        except Exception:
+            return None
+
+    def _save_disk_snapshot(self, dir_key: str, snap: RegistrySnapshot) -> None:
+        p = self._snapshot_path(dir_key)
+        if p is None:
+            return
+        p.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = mkstemp(dir=p.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(snap, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, p)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+    def _compile(self, blobs: List[Tuple[Path, bytes]]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
         registry: Dict[str, Dict[str, Any]] = {}
         issues: List[RegistryIssue] = []
 
-        for p in yamls:
+        for p, raw in blobs:
             metric_key = p.stem.strip().lower().replace("-", "_").replace(" ", "_")
-            with p.open("r", encoding="utf-8") as f:
-                d = yaml.safe_load(f) or {}
+            d = yaml.load(raw.decode("utf-8"), Loader=_YamlLoader) or {}
 
             # Attach trace
             d["_file"] = str(p)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .fsutil import mkstemp
+
+# Bump when a cached stage's computation changes meaning (invalidates all entries).
+CACHE_SCHEMA = "hp-cache-v3"
+
+
+# -------------------------
+# Content hashing
+# -------------------------
+
+def hash_frame(df: pd.DataFrame) -> str:
+    """Content hash of a DataFrame: column names, dtypes and row values (index ignored)."""
+    h = hashlib.sha256()
+    h.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode("utf-8"))
+    if len(df):
+        h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def hash_obj(*parts: Any) -> str:
+    """Stable hash of JSON-like values (dict keys sorted)."""
+    payload = json.dumps([CACHE_SCHEMA, *parts], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk, content-addressed cache for orchestrator stages.
+
+    Layout: <root>/<stage>/<key>.pkl
+      - key is a content hash of everything the stage depends on (see MasterOrchestrator.run)
+      - writes are atomic (temp file + os.replace), so concurrent batch workers can share a root
+      - LRU by file mtime: a hit touches the entry; eviction drops the oldest entries
+        until the cache fits max_bytes / max_entries
+
+    Counters (hits/misses per stage) live on the instance and are exposed via stats().
+    Size limits, eviction and clear() cover the STAGES directories only.
+    """
+
+    STAGES = ("canonical", "sot", "features", "claims")
+
+    def __init__(
+        self,
+        root: str | Path = ".hp_cache",
+        max_bytes: int = 512 * 1024 * 1024,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.max_entries = max_entries
+        self.hits: Dict[str, int] = {s: 0 for s in self.STAGES}
+        self.misses: Dict[str, int] = {s: 0 for s in self.STAGES}
+        self.evictions = 0
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.root / stage / f"{key}.pkl"
+
+    def get(self, stage: str, key: str) -> Tuple[bool, Any]:
+        p = self._path(stage, key)
+        try:
+            with p.open("rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            self.misses[stage] = self.misses.get(stage, 0) + 1
+            return False, None
+        except Exception:
+            # Corrupt / incompatible entry: drop it and recompute.
+            p.unlink(missing_ok=True)
+            self.misses[stage] = self.misses.get(stage, 0) + 1
+            return False, None
+
+        try:
+            os.utime(p, None)  # LRU touch
+        except OSError:
+            pass
+        self.hits[stage] = self.hits.get(stage, 0) + 1
+        return True, value
+
+    def put(self, stage: str, key: str, value: Any) -> None:
+        p = self._path(stage, key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = mkstemp(dir=p.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, p)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        self.evict()
+
+    def get_or_compute(self, stage: str, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        hit, value = self.get(stage, key)
+        if hit:
+            return value, True
+        value = fn()
+        self.put(stage, key, value)
+        return value, False
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        out: List[Tuple[float, int, Path]] = []
+        if not self.root.exists():
+            return out
+        # Stage dirs only: other tools may keep their own files under the same root.
+        for p in (q for stage in self.STAGES for q in (self.root / stage).glob("*.pkl")):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def evict(self) -> int:
+        entries = sorted(self._entries())
+        total = sum(e[1] for e in entries)
+        removed = 0
+        while entries and (
+            total > self.max_bytes or (self.max_entries is not None and len(entries) > self.max_entries)
+        ):
+            _, size, p = entries.pop(0)
+            p.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self.evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        for _, _, p in self._entries():
+            p.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        return {
+            "root": str(self.root),
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(e[1] for e in entries),
+            "max_bytes": self.max_bytes,
+        }
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import yaml
 
 
 @dataclass
@@ -13,6 +19,61 @@ class ValidationIssue:
     severity: str = "WARN"  # WARN | ERROR
 
 
+@dataclass(frozen=True)
+class RowBitmap:
+    """Offending rows of one check as a packed bitmap (1 bit per row, positional)."""
+
+    packed: np.ndarray
+    n_rows: int
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "RowBitmap":
+        return cls(packed=np.packbits(mask.astype(bool, copy=False)), n_rows=int(mask.shape[0]))
+
+    def to_mask(self) -> np.ndarray:
+        return np.unpackbits(self.packed, count=self.n_rows).astype(bool)
+
+    def rows(self) -> np.ndarray:
+        """Positional row indices (use df.iloc / df.index[...] to map back)."""
+        return np.flatnonzero(self.to_mask())
+
+    def count(self) -> int:
+        return int(np.unpackbits(self.packed, count=self.n_rows).sum())
+
+
+@dataclass
+class SOTScan:
+    """One validation pass: mergeable counters + row bitmaps per check code."""
+
+    counts: Dict[str, Any]
+    bitmaps: Dict[str, RowBitmap] = field(default_factory=dict)
+
+
+@lru_cache(maxsize=16)
+def _timebase_rule(provider_contract: str) -> Tuple[Optional[str], bool]:
+    """
+    (monotonic_within, allow_equal) from canon/provider_contracts/<provider>.yaml
+    (file name matched case-insensitively). (None, True) when the contract has no rule.
+    """
+    root = Path(__file__).resolve().parents[1] / "canon" / "provider_contracts"
+    for p in sorted(root.glob("*.yaml")):
+        if p.stem.lower() != provider_contract.lower():
+            continue
+        try:
+            doc = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+        except Exception:
+            break
+        tb = doc.get("timebase") or {}
+        return tb.get("monotonic_within"), bool(tb.get("allow_equal", True))
+    return None, True
+
+
+def _as_float(s: pd.Series) -> np.ndarray:
+    if pd.api.types.is_float_dtype(s.dtype):
+        return s.to_numpy(dtype=np.float64, na_value=np.nan)
+    return pd.to_numeric(s, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
 class SOTValidator:
     """
     Contract-first gate.
@@ -21,8 +82,20 @@ class SOTValidator:
       - NO silent dropping rows.
       - 0.0 is valid.
       - Produce a Data Quality Report + (optionally) transformed dataframe.
+
+    Checks run in one vectorized pass (scan): nulls, coordinate bounds, negative
+    timestamps and the contract timebase rule (timestamp_s non-decreasing within
+    match_id, in file order). Each check also yields a RowBitmap of offending rows.
     """
 
+    # check code -> counter key
+    CHECKS = {
+        "COORD_OUT_OF_BOUNDS_X": "out_x",
+        "COORD_OUT_OF_BOUNDS_Y": "out_y",
+        "NEGATIVE_TIMESTAMP": "neg_ts",
+        "NON_MONOTONIC_TIMESTAMP": "non_monotonic",
+    }
+
     def __init__(self, provider_contract: str = "sportsbase") -> None:
         self.provider_contract = provider_contract
 
@@ -37,10 +110,293 @@ class SOTValidator:
 
         self.pitch = (105.0, 68.0)
 
+        # Contract timebase: SportsBase.yaml -> monotonic_within: match_id, allow_equal: true
+        self.monotonic_within, self.allow_equal = _timebase_rule(provider_contract)
+
     def validate(self, df: pd.DataFrame) -> Tuple[Dict, pd.DataFrame]:
+        return self.report_from_counts(self.count(df)), df
+
+    # -------------------------
+    # Sampled fast path (interactive use)
+    # -------------------------
+
+    def validate_sampled(
+        self,
+        df: pd.DataFrame,
+        sample_rows: int = 20_000,
+        min_per_match: int = 200,
+        confidence: float = 0.95,
+        seed: int = 0,
+    ) -> Tuple[Dict, pd.DataFrame]:
+        """
+        Fast approximate report from a stratified sample (per monotonic_within group,
+        i.e. match_id): each match keeps rows with probability m_g / n_g, where
+        m_g = max(min_per_match, share of sample_rows), so small matches are not drowned.
+
+        Report differences vs validate():
+          - mode: "SAMPLED", plus a "sample" block (rows, strata, seed, confidence)
+          - violation_rates: per check, weighted rate estimate + Wilson bounds + est_rows
+          - null_map holds weighted estimates; the timebase check is listed as pending
+            (it needs every row of a match in order)
+          - status: "PROVISIONAL" (estimate in provisional_status) until the full pass
+            reports; BLOCKED stays BLOCKED (sampled rows are real rows, so it cannot clear)
+        Frames no larger than sample_rows are validated in full (exact report).
+        """
+        n = int(len(df))
+        if n <= sample_rows:
+            return self.validate(df)
+
+        group_col = self.monotonic_within
+        if group_col is not None and group_col in df.columns:
+            codes, uniques = pd.factorize(df[group_col])
+            codes = np.where(codes < 0, len(uniques), codes)
+            sizes = np.bincount(codes, minlength=len(uniques) + 1).astype(np.float64)
+        else:
+            codes = np.zeros(n, dtype=np.int64)
+            sizes = np.array([float(n)])
+
+        nonempty = sizes > 0
+        alloc = np.maximum(min_per_match, np.round(sample_rows * sizes / n))
+        prob = np.where(nonempty, np.minimum(1.0, alloc / np.maximum(sizes, 1.0)), 0.0)
+
+        rng = np.random.default_rng(seed)
+        keep = np.flatnonzero(rng.random(n) < prob[codes])
+        weights = 1.0 / prob[codes[keep]]
+        sample = df.iloc[keep]
+
+        sc = self.scan(sample, bitmaps=True, timebase=False)
+        z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+        m = int(len(keep))
+
+        rates: Dict[str, Dict[str, Any]] = {}
+        est_counts: Dict[str, Any] = {}
+        for code, bm in sc.bitmaps.items():
+            hit = bm.to_mask()
+            est = float(weights[hit].sum())
+            rate = est / n
+            low, high = _wilson(rate, m, n, z)
+            rates[code] = {
+                "sampled_rows": int(hit.sum()),
+                "rate": round(rate, 6),
+                "low": round(low, 6),
+                "high": round(high, 6),
+                "est_rows": int(round(est)),
+            }
+            est_counts[self.CHECKS[code]] = int(round(est))
+
+        null_map = {}
+        for c in sample.columns:
+            null_map[c] = int(round(float(weights[sample[c].isna().to_numpy()].sum())))
+
+        counts = {
+            **sc.counts,
+            **est_counts,
+            "row_count": n,
+            "null_map": null_map,
+        }
+        report = self.report_from_counts(counts)
+        for issue in report["issues"]:
+            r = rates.get(issue["code"])
+            if r is not None:
+                issue["message"] = (
+                    f"~{issue['message']} [SAMPLED: rate {r['rate']:.4%} "
+                    f"({confidence:.0%} CI {r['low']:.4%}..{r['high']:.4%})]"
+                )
+        report["mode"] = "SAMPLED"
+        report["sample"] = {
+            "rows": m,
+            "strata": int(np.count_nonzero(nonempty)),
+            "seed": seed,
+            "confidence": confidence,
+            "pending_checks": ["NON_MONOTONIC_TIMESTAMP"] if group_col is not None else [],
+        }
+        report["violation_rates"] = rates
+        if report["status"] != "BLOCKED":
+            report["provisional_status"] = report["status"]
+            report["status"] = "PROVISIONAL"
+        return report, df
+
+    def validate_background(self, df: pd.DataFrame) -> "Future[Dict[str, Any]]":
+        """Full validate() on a background thread; the Future yields the exact report."""
+        return _background().submit(lambda: self.validate(df)[0])
+
+    def count(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Raw validation counters for one frame (or one chunk of a larger file).
+        Counters from several chunks combine with merge_counts; report_from_counts
+        turns them into the same report validate() gives for the whole frame.
+        """
+        return self.scan(df, bitmaps=False).counts
+
+    # -------------------------
+    # Single-pass scan
+    # -------------------------
+
+    def scan(self, df: pd.DataFrame, bitmaps: bool = True, timebase: bool = True) -> SOTScan:
+        n = int(len(df))
+        cols = set(df.columns)
+        counts: Dict[str, Any] = {
+            "row_count": n,
+            "columns": list(df.columns),
+            "null_map": {},
+            "out_x": None,
+            "out_y": None,
+            "neg_ts": None,
+            "non_monotonic": None,
+            # per match key: first / last non-null timestamp_s (chunk boundary checks)
+            "ts_first": {},
+            "ts_last": {},
+        }
+        masks: Dict[str, np.ndarray] = {}
+
+        # Numeric columns converted once; float columns reuse the array for the null count.
+        num: Dict[str, np.ndarray] = {c: _as_float(df[c]) for c in ("x", "y", "timestamp_s") if c in cols}
+
+        # Null map (explicit)
+        null_map: Dict[Any, int] = {}
+        for c in df.columns:
+            s = df[c]
+            if c in num and pd.api.types.is_float_dtype(s.dtype):
+                null_map[c] = int(np.count_nonzero(np.isnan(num[c])))
+            else:
+                null_map[c] = int(s.isna().sum())
+        counts["null_map"] = null_map
+
+        # Coordinate bounds check (flag only; do not drop); NaN compares False
+        with np.errstate(invalid="ignore"):
+            if "x" in num:
+                masks["COORD_OUT_OF_BOUNDS_X"] = (num["x"] < -1) | (num["x"] > self.pitch[0] + 1)
+            if "y" in num:
+                masks["COORD_OUT_OF_BOUNDS_Y"] = (num["y"] < -1) | (num["y"] > self.pitch[1] + 1)
+            if "timestamp_s" in num:
+                masks["NEGATIVE_TIMESTAMP"] = num["timestamp_s"] < 0
+
+        group_col = self.monotonic_within
+        if timebase and "timestamp_s" in num and group_col is not None:
+            mask, first, last = self._monotonic(num["timestamp_s"], df[group_col] if group_col in cols else None)
+            masks["NON_MONOTONIC_TIMESTAMP"] = mask
+            counts["ts_first"], counts["ts_last"] = first, last
+
+        for code, mask in masks.items():
+            counts[self.CHECKS[code]] = int(np.count_nonzero(mask))
+
+        return SOTScan(
+            counts=counts,
+            bitmaps={code: RowBitmap.from_mask(m) for code, m in masks.items()} if bitmaps else {},
+        )
+
+    def _monotonic(
+        self,
+        ts: np.ndarray,
+        groups: Optional[pd.Series],
+    ) -> Tuple[np.ndarray, Dict[Any, float], Dict[Any, float]]:
+        """
+        Rows whose timestamp_s is below the previous non-null timestamp_s of the same
+        group (strictly below when allow_equal). Null timestamps are never flagged.
+
+        Rows are ordered by group with a stable sort (file order kept inside a group);
+        already-grouped exports are a linear pass for the sort as well.
+        """
+        n = ts.shape[0]
+        mask = np.zeros(n, dtype=bool)
+        if n == 0:
+            return mask, {}, {}
+
+        if groups is None:
+            codes, uniques = np.zeros(n, dtype=np.int64), pd.Index([None])
+        else:
+            codes, uniques = pd.factorize(groups)
+            codes = np.where(codes < 0, len(uniques), codes)  # missing group -> own bucket
+            uniques = uniques.append(pd.Index([None])) if (codes == len(uniques)).any() else uniques
+
+        if len(uniques) < np.iinfo(np.int16).max:
+            codes = codes.astype(np.int16)  # stable argsort on int16 is a radix sort (linear)
+        grouped = bool(np.all(codes[1:] >= codes[:-1])) if n > 1 else True
+        order = None if grouped else np.argsort(codes, kind="stable")
+        g = codes if order is None else codes[order]
+        t = ts if order is None else ts[order]
+
+        valid = ~np.isnan(t)
+        bad = np.zeros(n, dtype=bool)
+        if valid.all():
+            # previous non-null timestamp is simply the previous row
+            same = g[1:] == g[:-1]
+            bad[1:] = same & ((t[1:] < t[:-1]) if self.allow_equal else (t[1:] <= t[:-1]))
+        else:
+            # index of the last non-null timestamp strictly before each position
+            last_valid = np.maximum.accumulate(np.where(valid, np.arange(n), -1))
+            prev = np.empty(n, dtype=np.int64)
+            prev[0] = -1
+            prev[1:] = last_valid[:-1]
+            prev_c = np.maximum(prev, 0)
+            same = (prev >= 0) & valid & (g[prev_c] == g)
+            with np.errstate(invalid="ignore"):
+                bad = same & ((t < t[prev_c]) if self.allow_equal else (t <= t[prev_c]))
+
+        if order is None:
+            mask = bad
+        else:
+            mask[order] = bad
+
+        # first / last non-null timestamp per group (file order)
+        vg, vt = g[valid], t[valid]
+        first: Dict[Any, float] = {}
+        last: Dict[Any, float] = {}
+        if vg.size:
+            starts = np.flatnonzero(np.r_[True, vg[1:] != vg[:-1]])
+            ends = np.r_[starts[1:] - 1, vg.size - 1]
+            for s_i, e_i in zip(starts, ends):
+                key = _group_key(uniques[vg[s_i]])
+                first[key] = float(vt[s_i])
+                last[key] = float(vt[e_i])
+        return mask, first, last
+
+    def merge_counts(self, a: Optional[Dict[str, Any]], b: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine counters of consecutive chunks (a before b, file order)."""
+        if a is None:
+            return {
+                **b,
+                "null_map": dict(b["null_map"]),
+                "columns": list(b["columns"]),
+                "ts_first": dict(b.get("ts_first", {})),
+                "ts_last": dict(b.get("ts_last", {})),
+            }
+
+        def add(u: Optional[int], v: Optional[int]) -> Optional[int]:
+            if u is None and v is None:
+                return None
+            return int(u or 0) + int(v or 0)
+
+        null_map = dict(a["null_map"])
+        for k, v in b["null_map"].items():
+            null_map[k] = null_map.get(k, 0) + int(v)
+        columns = list(a["columns"]) + [c for c in b["columns"] if c not in a["columns"]]
+
+        # Timebase across the chunk boundary: b's first timestamp per match vs a's last.
+        a_last, b_first = a.get("ts_last", {}), b.get("ts_first", {})
+        boundary = sum(
+            1 for k, t in b_first.items() if k in a_last and (t < a_last[k] if self.allow_equal else t <= a_last[k])
+        )
+        non_mono = add(a.get("non_monotonic"), b.get("non_monotonic"))
+        if boundary:
+            non_mono = (non_mono or 0) + boundary
+
+        return {
+            "row_count": a["row_count"] + b["row_count"],
+            "columns": columns,
+            "null_map": null_map,
+            "out_x": add(a["out_x"], b["out_x"]),
+            "out_y": add(a["out_y"], b["out_y"]),
+            "neg_ts": add(a["neg_ts"], b["neg_ts"]),
+            "non_monotonic": non_mono,
+            "ts_first": {**b.get("ts_first", {}), **a.get("ts_first", {})},
+            "ts_last": {**a.get("ts_last", {}), **b.get("ts_last", {})},
+        }
+
+    def report_from_counts(self, counts: Dict[str, Any]) -> Dict[str, Any]:
         issues: List[ValidationIssue] = []
 
-        missing = [c for c in self.required_columns if c not in df.columns]
+        missing = [c for c in self.required_columns if c not in counts["columns"]]
         if missing:
             issues.append(
                 ValidationIssue(
@@ -50,45 +406,45 @@ class SOTValidator:
                 )
             )
 
-        # Null map (explicit)
-        null_map = df.isnull().sum().to_dict()
-
-        # Coordinate bounds check (flag only; do not drop)
-        if "x" in df.columns:
-            x = pd.to_numeric(df["x"], errors="coerce")
-            out_x = ((x < -1) | (x > self.pitch[0] + 1)).sum()
-            if out_x > 0:
-                issues.append(
-                    ValidationIssue(
-                        code="COORD_OUT_OF_BOUNDS_X",
-                        message=f"{int(out_x)} rows have x outside expected pitch bounds (0..{self.pitch[0]}).",
-                        severity="WARN",
-                    )
+        out_x = counts.get("out_x")
+        if out_x:
+            issues.append(
+                ValidationIssue(
+                    code="COORD_OUT_OF_BOUNDS_X",
+                    message=f"{int(out_x)} rows have x outside expected pitch bounds (0..{self.pitch[0]}).",
+                    severity="WARN",
                 )
+            )
 
-        if "y" in df.columns:
-            y = pd.to_numeric(df["y"], errors="coerce")
-            out_y = ((y < -1) | (y > self.pitch[1] + 1)).sum()
-            if out_y > 0:
-                issues.append(
-                    ValidationIssue(
-                        code="COORD_OUT_OF_BOUNDS_Y",
-                        message=f"{int(out_y)} rows have y outside expected pitch bounds (0..{self.pitch[1]}).",
-                        severity="WARN",
-                    )
+        out_y = counts.get("out_y")
+        if out_y:
+            issues.append(
+                ValidationIssue(
+                    code="COORD_OUT_OF_BOUNDS_Y",
+                    message=f"{int(out_y)} rows have y outside expected pitch bounds (0..{self.pitch[1]}).",
+                    severity="WARN",
                 )
+            )
 
-        if "timestamp_s" in df.columns:
-            ts = pd.to_numeric(df["timestamp_s"], errors="coerce")
-            neg = (ts < 0).sum()
-            if neg > 0:
-                issues.append(
-                    ValidationIssue(
-                        code="NEGATIVE_TIMESTAMP",
-                        message=f"{int(neg)} rows have negative timestamp_s.",
-                        severity="WARN",
-                    )
+        neg = counts.get("neg_ts")
+        if neg:
+            issues.append(
+                ValidationIssue(
+                    code="NEGATIVE_TIMESTAMP",
+                    message=f"{int(neg)} rows have negative timestamp_s.",
+                    severity="WARN",
                 )
+            )
+
+        non_mono = counts.get("non_monotonic")
+        if non_mono:
+            issues.append(
+                ValidationIssue(
+                    code="NON_MONOTONIC_TIMESTAMP",
+                    message=f"{int(non_mono)} rows have timestamp_s decreasing within {self.monotonic_within}.",
+                    severity="WARN",
+                )
+            )
 
         status = "HEALTHY"
         if any(i.severity == "ERROR" for i in issues):
@@ -100,9 +456,38 @@ class SOTValidator:
             "status": status,
             "provider": self.provider_contract,
             "issues": [i.__dict__ for i in issues],
-            "null_map": null_map,
-            "row_count": int(len(df)),
-            "columns": list(df.columns),
+            "null_map": dict(counts["null_map"]),
+            "row_count": int(counts["row_count"]),
+            "columns": list(counts["columns"]),
         }
 
-        return report, df
\ No newline at end of file
+        return report
+
+
+def _group_key(v: Any) -> Any:
+    """Hashable, merge-stable group key (NaN/None -> None; numpy scalars -> Python)."""
+    if v is None or (isinstance(v, float) and np.isnan(v)):
+        return None
+    return v.item() if isinstance(v, np.generic) else v
+
+
+def _wilson(rate: float, m: int, n: int, z: float) -> Tuple[float, float]:
+    """Wilson score interval for a rate estimated from m of n rows (finite population corrected)."""
+    if m >= n or m == 0:
+        return rate, rate
+    m_eff = m * (n - 1) / (n - m)
+    denom = 1.0 + z * z / m_eff
+    centre = (rate + z * z / (2 * m_eff)) / denom
+    half = z * np.sqrt(rate * (1 - rate) / m_eff + z * z / (4 * m_eff * m_eff)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+_BACKGROUND: Optional[ThreadPoolExecutor] = None
+
+
+def _background() -> ThreadPoolExecutor:
+    # One shared worker: background validations queue up instead of competing for CPU.
+    global _BACKGROUND
+    if _BACKGROUND is None:
+        _BACKGROUND = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sot-full")
+    return _BACKGROUND
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import io
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from .master_orchestrator import EngineResult, MasterOrchestrator
+from .provider.sportsbase import sportsbase_plan
+
+CsvSource = Union[str, Path, io.IOBase]
+
+DEFAULT_CHUNK_ROWS = 100_000
+PREVIEW_ROWS = 25
+
+
+@dataclass
+class StreamReport:
+    chunk_rows: int
+    chunks: int
+    rows: int
+    max_chunk_bytes: int
+    scale_0_100: Optional[bool]
+    elapsed_s: float
+
+
+def _rewind(source: CsvSource) -> None:
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def read_csv_chunks(
+    source: CsvSource,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    usecols: Optional[List[Any]] = None,
+) -> Iterator[pd.DataFrame]:
+    """Bounded-memory CSV reader: at most chunk_rows rows are materialised at a time."""
+    _rewind(source)
+    with pd.read_csv(source, chunksize=chunk_rows, usecols=usecols) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def csv_headers(source: CsvSource) -> List[Any]:
+    _rewind(source)
+    return list(pd.read_csv(source, nrows=0).columns)
+
+
+def detect_scale_0_100(source: CsvSource, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> bool:
+    """
+    Whole-file version of the provider's 0-100 coordinate auto-detect.
+
+    Reads only the mapped x / y source columns (chunked), so the scale decision matches
+    to_canonical_events() on the full file instead of depending on the first chunk.
+    """
+    plan = sportsbase_plan(csv_headers(source))
+    used = plan.mapping_used
+    if "x" not in used or "y" not in used:
+        return False
+
+    (_, sx_p), (_, sy_p) = plan.scale
+    x_maxes: List[float] = []
+    y_maxes: List[float] = []
+    for chunk in read_csv_chunks(source, chunk_rows, usecols=[used["x"], used["y"]]):
+        x_maxes.append(pd.to_numeric(chunk[used["x"]], errors="coerce").max())
+        y_maxes.append(pd.to_numeric(chunk[used["y"]], errors="coerce").max())
+    x_max = pd.Series(x_maxes, dtype="float64").max()
+    y_max = pd.Series(y_maxes, dtype="float64").max()
+
+    return bool(pd.notna(x_max) and pd.notna(y_max) and x_max <= sx_p + 0.5 and y_max <= sy_p + 0.5)
+
+
+def run_csv_stream(
+    source: CsvSource,
+    orchestrator: Optional[MasterOrchestrator] = None,
+    phase: str = "tactical",
+    context: Optional[Dict[str, Any]] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> EngineResult:
+    """
+    Streaming counterpart of MasterOrchestrator.run() for exports too large to load at once.
+
+    Raw -> ProviderMap -> SOT -> accumulators, one chunk at a time (LiveMatchSession);
+    PopperGate / PlotSpec / Narrative run once at the end. Peak memory follows chunk_rows,
+    not file size.
+
+    Rules:
+      - The SOT report is aggregated from per-chunk counters and equals the in-memory report.
+      - Fused metrics equal run() on the whole file; metrics that need the full event
+        history are reported BLOCKED (NOT_INCREMENTAL), never approximated.
+      - Columns must parse to the same dtype in every chunk (pandas infers per chunk).
+    """
+    from .live_session import LiveMatchSession
+
+    t0 = time.perf_counter()
+    orch = orchestrator or MasterOrchestrator()
+
+    scale = detect_scale_0_100(source, chunk_rows)
+    session = LiveMatchSession(orch, phase=phase, context=context, scale_0_100=scale)
+
+    preview: List[pd.DataFrame] = []
+    preview_rows = chunks = rows = max_bytes = 0
+    for chunk in read_csv_chunks(source, chunk_rows):
+        chunks += 1
+        rows += len(chunk)
+        max_bytes = max(max_bytes, int(chunk.memory_usage(index=True, deep=True).sum()))
+        if preview_rows < PREVIEW_ROWS:
+            head = session.map_chunk(chunk.head(PREVIEW_ROWS - preview_rows))
+            preview.append(head)
+            preview_rows += len(head)
+        session.append(chunk, verify=False)
+
+    preview_df = pd.concat(preview, ignore_index=True) if preview else None
+    result = session.result(preview=preview_df)
+    result.stream_report = asdict(
+        StreamReport(
+            chunk_rows=chunk_rows,
+            chunks=chunks,
+            rows=rows,
+            max_chunk_bytes=max_bytes,
+            scale_0_100=scale,
+            elapsed_s=round(time.perf_counter() - t0, 4),
+        )
+    )
+    return result
@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .fsutil import mkstemp
+from .map.mapping_plan import contract_scale
+from .result_cache import hash_frame
+
+# Bump when the fit changes meaning (invalidates cached grids).
+XT_SCHEMA = "hp-xt-v1"
+
+MOVE_TYPES = ("pass", "cross", "carry", "dribble")
+CARRY_TYPES = ("carry", "dribble")  # missing outcome = kept the ball
+SHOT_TYPES = ("shot", "goal")
+GOAL_TYPES = ("goal",)
+
+FIT_COLUMNS = ("event_type", "x", "y", "x_end", "y_end", "outcome")
+
+_UNSAFE = re.compile(r"[^0-9A-Za-z._-]+")
+
+
+def canonical_pitch() -> Tuple[float, float]:
+    """Canonical pitch extent in meters (from the provider contract; 105 x 68 by default)."""
+    (sx_c, _), (sy_c, _) = contract_scale()
+    return (sx_c, sy_c)
+
+
+def _type_masks(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(move, carry, shot, goal) masks; labels normalised once per distinct value (all False without event_type)."""
+    if "event_type" not in df.columns:
+        z = np.zeros(len(df), dtype=bool)
+        return z, z, z, z
+    codes, uniques = pd.factorize(df["event_type"])
+    labels = [str(u).strip().lower() for u in uniques]
+    out = []
+    for kinds in (MOVE_TYPES, CARRY_TYPES, SHOT_TYPES, GOAL_TYPES):
+        lut = np.array([lab in kinds for lab in labels] + [False], dtype=bool)
+        out.append(lut[codes])  # code -1 (missing) -> last slot
+    return out[0], out[1], out[2], out[3]
+
+
+def _outcome_masks(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """(true, false) outcome masks; both False when outcome is missing."""
+    if "outcome" not in df.columns:
+        z = np.zeros(len(df), dtype=bool)
+        return z, z
+    o = df["outcome"]
+    return o.isin([True]).to_numpy(), o.isin([False]).to_numpy()
+
+
+def _float(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+
+
+@dataclass
+class XTModel:
+    """
+    Expected Threat grid (Singh's possession value model) on an l x w grid.
+
+    Fit (all counting is np.bincount over flat cell indices):
+      shot_prob[c]  = shots / (shots + moves) started in c
+      move_prob[c]  = moves / (shots + moves)
+      goal_prob[c]  = goals / shots
+      T[c, c']      = successful moves c -> c' / moves from c
+      xT = shot_prob * goal_prob + move_prob * (T @ xT), iterated to max change < eps
+
+    Rules:
+      - canonical coordinates, attacking left -> right (x in [0, pitch_x], y in [0, pitch_y])
+      - moves: pass / cross / carry / dribble; shots: shot / goal
+      - goal: event_type "goal", or a shot with outcome True
+      - successful move: outcome True, or outcome missing on a carry / dribble;
+        failed and unknown moves count as moves without a transition
+      - events without a start cell (NaN x / y) are ignored; locations are clipped to the pitch
+      - cell index = cy * l + cx; grid() is (w, l)
+    """
+
+    l: int = 16
+    w: int = 12
+    pitch: Tuple[float, float] = field(default_factory=canonical_pitch)
+    xt: Optional[np.ndarray] = None
+    shot_prob: Optional[np.ndarray] = None
+    move_prob: Optional[np.ndarray] = None
+    goal_prob: Optional[np.ndarray] = None
+    transition: Optional[np.ndarray] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def n_cells(self) -> int:
+        return self.l * self.w
+
+    def cells(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Flat cell index per location (-1 when x or y is missing)."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        ok = ~(np.isnan(x) | np.isnan(y))
+        with np.errstate(invalid="ignore"):
+            cx = np.clip((x / self.pitch[0] * self.l).astype(np.int64, copy=False), 0, self.l - 1)
+            cy = np.clip((y / self.pitch[1] * self.w).astype(np.int64, copy=False), 0, self.w - 1)
+        return np.where(ok, cy * self.l + cx, -1)
+
+    def grid(self) -> np.ndarray:
+        self._require_fit()
+        return self.xt.reshape(self.w, self.l)
+
+    # -------------------------
+    # Fit
+    # -------------------------
+
+    @classmethod
+    def fit(
+        cls,
+        events_df: pd.DataFrame,
+        l: int = 16,
+        w: int = 12,
+        pitch: Optional[Tuple[float, float]] = None,
+        eps: float = 1e-5,
+        max_iter: int = 500,
+    ) -> "XTModel":
+        t0 = time.perf_counter()
+        model = cls(l=l, w=w, pitch=tuple(pitch) if pitch is not None else canonical_pitch())
+        n = model.n_cells
+
+        is_move, is_carry, is_shot, is_goal_type = _type_masks(events_df)
+        out_true, out_false = _outcome_masks(events_df)
+        start = model.cells(_float(events_df, "x"), _float(events_df, "y"))
+        end = model.cells(_float(events_df, "x_end"), _float(events_df, "y_end"))
+        has_start = start >= 0
+
+        shots = is_shot & has_start
+        goals = shots & (is_goal_type | out_true)
+        moves = is_move & has_start
+        ok_moves = moves & (out_true | (is_carry & ~out_false & ~out_true)) & (end >= 0)
+
+        shot_n = np.bincount(start[shots], minlength=n).astype(np.float64)
+        goal_n = np.bincount(start[goals], minlength=n).astype(np.float64)
+        move_n = np.bincount(start[moves], minlength=n).astype(np.float64)
+        trans_n = np.bincount(start[ok_moves] * n + end[ok_moves], minlength=n * n).astype(np.float64).reshape(n, n)
+
+        total = shot_n + move_n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            model.shot_prob = np.where(total > 0, shot_n / total, 0.0)
+            model.move_prob = np.where(total > 0, move_n / total, 0.0)
+            model.goal_prob = np.where(shot_n > 0, goal_n / shot_n, 0.0)
+            model.transition = np.where(move_n[:, None] > 0, trans_n / move_n[:, None], 0.0)
+
+        # Value iteration as matrix ops: xT <- base + diag(move_prob) T xT
+        base = model.shot_prob * model.goal_prob
+        step = model.move_prob[:, None] * model.transition
+        xt = np.zeros(n)
+        iterations = 0
+        for iterations in range(1, max_iter + 1):
+            nxt = base + step @ xt
+            delta = float(np.max(np.abs(nxt - xt)))
+            xt = nxt
+            if delta < eps:
+                break
+        model.xt = xt
+
+        model.meta = {
+            "schema": XT_SCHEMA,
+            "events": int(len(events_df)),
+            "shots": int(shots.sum()),
+            "goals": int(goals.sum()),
+            "moves": int(moves.sum()),
+            "successful_moves": int(ok_moves.sum()),
+            "iterations": iterations,
+            "converged": bool(delta < eps) if iterations else True,
+            "eps": eps,
+            "fit_s": round(time.perf_counter() - t0, 6),
+        }
+        return model
+
+    # -------------------------
+    # Scoring
+    # -------------------------
+
+    def value(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """xT at each location (NaN when the location is missing)."""
+        self._require_fit()
+        c = self.cells(x, y)
+        lut = np.append(self.xt, np.nan)
+        return lut[np.where(c >= 0, c, self.n_cells)]
+
+    def score(self, events_df: pd.DataFrame) -> pd.Series:
+        """
+        xT added per event: xT(end) - xT(start) for successful moves (same rules as fit);
+        NaN for every other event. Index-aligned with events_df.
+        """
+        self._require_fit()
+        is_move, is_carry, _, _ = _type_masks(events_df)
+        out_true, out_false = _outcome_masks(events_df)
+        start = self.value(_float(events_df, "x"), _float(events_df, "y"))
+        end = self.value(_float(events_df, "x_end"), _float(events_df, "y_end"))
+        ok = is_move & (out_true | (is_carry & ~out_false & ~out_true))
+        added = np.where(ok, end - start, np.nan)
+        return pd.Series(added, index=events_df.index, name="xt_added")
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+
+    def save(self, path: str | Path) -> Path:
+        self._require_fit()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {**self.meta, "l": self.l, "w": self.w, "pitch": list(self.pitch)}
+        fd, tmp = mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            with open(tmp, "wb") as f:
+                np.savez(
+                    f,
+                    xt=self.xt,
+                    shot_prob=self.shot_prob,
+                    move_prob=self.move_prob,
+                    goal_prob=self.goal_prob,
+                    transition=self.transition,
+                    meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+                )
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "XTModel":
+        with np.load(path) as z:
+            meta = json.loads(z["meta"].tobytes().decode("utf-8"))
+            if meta.get("schema") != XT_SCHEMA:
+                raise ValueError(f"Unsupported xT grid schema: {meta.get('schema')!r} (expected {XT_SCHEMA})")
+            return cls(
+                l=int(meta.pop("l")),
+                w=int(meta.pop("w")),
+                pitch=tuple(meta.pop("pitch")),
+                xt=z["xt"],
+                shot_prob=z["shot_prob"],
+                move_prob=z["move_prob"],
+                goal_prob=z["goal_prob"],
+                transition=z["transition"],
+                meta=meta,
+            )
+
+    def _require_fit(self) -> None:
+        if self.xt is None:
+            raise RuntimeError("XTModel is not fitted (use XTModel.fit or XTCache)")
+
+
+class XTCache:
+    """
+    Fitted xT grids on disk, one per competition / season:
+      <root>/<competition>-<hash>/<season>-<hash>.npz
+    (name made filesystem-safe + short sha1 of the raw name, so "TR Süper Lig" and
+    "TR S_per Lig" never share a file; load() also checks the names stored in meta).
+
+    get_or_fit() refits only when the season's events (fit columns), grid size or pitch
+    changed since the stored grid was fitted; load() returns the stored grid for scoring
+    (never fits; with data_hash, only a grid fitted on exactly that data).
+    """
+
+    def __init__(self, root: str | Path = ".hp_cache/xt") -> None:
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, competition: Any, season: Any) -> Path:
+        def part(v: Any) -> str:
+            s = str(v).strip() if v is not None else ""
+            digest = hashlib.sha1(s.encode("utf-8")).hexdigest()[:8]
+            return f"{_UNSAFE.sub('_', s) or 'unknown'}-{digest}"
+
+        return self.root / part(competition) / f"{part(season)}.npz"
+
+    def load(self, competition: Any, season: Any, data_hash: Optional[str] = None) -> Optional[XTModel]:
+        p = self.path(competition, season)
+        try:
+            model = XTModel.load(p)
+        except (OSError, ValueError, KeyError):
+            return None
+        if (model.meta.get("competition"), model.meta.get("season")) != (str(competition), str(season)):
+            return None
+        if data_hash is not None and model.meta.get("data_hash") != data_hash:
+            return None
+        return model
+
+    def get_or_fit(
+        self,
+        events_df: pd.DataFrame,
+        competition: Any,
+        season: Any,
+        l: int = 16,
+        w: int = 12,
+        pitch: Optional[Tuple[float, float]] = None,
+        **fit_kwargs: Any,
+    ) -> XTModel:
+        pitch = tuple(pitch) if pitch is not None else canonical_pitch()
+        cols = [c for c in FIT_COLUMNS if c in events_df.columns]
+        data_hash = hash_frame(events_df[cols])
+
+        cached = self.load(competition, season, data_hash)
+        if (
+            cached is not None
+            and (cached.l, cached.w) == (l, w)
+            and tuple(cached.pitch) == tuple(pitch)
+        ):
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        model = XTModel.fit(events_df, l=l, w=w, pitch=pitch, **fit_kwargs)
+        model.meta.update(data_hash=data_hash, competition=str(competition), season=str(season))
+        model.save(self.path(competition, season))
+        return model
+
+    def stats(self) -> Dict[str, Any]:
+        return {"root": str(self.root), "hits": self.hits, "misses": self.misses}
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 
 from engine.master_orchestrator import MasterOrchestrator
+from engine.result_cache import ResultCache
 
 
 st.set_page_config(page_title="HP-Engine v3", layout="wide")
@@ -13,6 +14,9 @@ with st.sidebar:
     st.subheader("Input")
     uploaded = st.file_uploader("Upload SportsBase (or similar) CSV", type=["csv"])
     phase = st.selectbox("Registry phase", ["tactical", "technical", "physical", "psychological"], index=0)
+    streaming = st.checkbox("Streaming ingest (large files)", value=False)
+    fast_sot = st.checkbox("Fast validation (sampled first, full in background)", value=True, disabled=streaming)
+    chunk_rows = st.number_input("Chunk rows", min_value=1_000, value=100_000, step=10_000, disabled=not streaming)
 
     st.subheader("Context (optional)")
     league = st.text_input("League", value="generic")
@@ -26,7 +30,8 @@ if uploaded is None:
     st.info("Upload a CSV to start.")
     st.stop()
 
-df = pd.read_csv(uploaded)
+# Streaming mode never loads the whole file; only the preview rows are read here.
+df = pd.read_csv(uploaded, nrows=25) if streaming else pd.read_csv(uploaded)
 
 st.write("### Raw input preview")
 st.dataframe(df.head(25), use_container_width=True)
@@ -36,14 +41,18 @@ if not run_btn:
 
 ctx = {"league": league, "season": season, "opponent_tier": opponent_tier, "venue": venue}
 
-orch = MasterOrchestrator(registry_root="canon/registry", provider="sportsbase")
-result = orch.run(df, phase=phase, context=ctx)
+orch = MasterOrchestrator(registry_root="canon/registry", provider="sportsbase", cache=ResultCache(".hp_cache"))
+if streaming:
+    result = orch.run_csv_stream(uploaded, phase=phase, context=ctx, chunk_rows=int(chunk_rows))
+else:
+    result = orch.run(df, phase=phase, context=ctx, sot_mode="sampled" if fast_sot else "full")
 
 col1, col2 = st.columns([1, 1])
 
 with col1:
     st.write("## SOT Validation Report")
-    st.json(result.validation_report)
+    sot_box = st.empty()
+    sot_box.json(result.validation_report)
 
     st.write("## Narrative (v1)")
     st.code(result.narrative)
@@ -55,5 +64,17 @@ with col2:
     st.write("## PlotSpecs")
     st.json(result.plotspecs)
 
+    st.write("## Cache")
+    st.json(result.cache_report)
+
+    if result.stream_report:
+        st.write("## Streaming ingest")
+        st.json(result.stream_report)
+
 st.write("## Canonical events preview (post mapping)")
-st.dataframe(result.canonical_events_preview, use_container_width=True)
\ No newline at end of file
+st.dataframe(result.canonical_events_preview, use_container_width=True)
+
+# Sampled SOT report is shown first; swap in the exact report once the full pass ends.
+if result.validation_pending is not None:
+    with st.spinner("Full SOT validation running..."):
+        sot_box.json(result.validation_pending.result())
\ No newline at end of file